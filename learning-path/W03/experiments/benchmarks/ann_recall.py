@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Recall@k vs latency benchmark for the approximate FAISS indexes
+in JobFitmentVectorDB, measured against the exact (Flat) index.
+
+Usage:
+    python benchmarks/ann_recall.py --vectors 100000 --queries 1000 --k 10
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from src.job_fitment import EnvironmentConfig, JobFitmentVectorDB, OUTPUT_DIR
+
+
+def synthetic_embeddings(n: int, dim: int, n_clusters: int = 64, seed: int = 0) -> np.ndarray:
+    """Clustered random vectors that behave more like sentence embeddings than pure noise."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((n_clusters, dim)).astype('float32')
+    labels = rng.integers(0, n_clusters, size=n)
+    return centers[labels] + 0.35 * rng.standard_normal((n, dim)).astype('float32')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vectors", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=1_000)
+    parser.add_argument("--dim", type=int, default=JobFitmentVectorDB.EMBEDDING_DIM)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--metric", choices=JobFitmentVectorDB.METRICS, default="ip")
+    parser.add_argument("--nlist", type=int, default=None)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--ef-search", type=int, nargs="+", default=[16, 64, 256])
+    parser.add_argument("--output", default=str(OUTPUT_DIR / "ann_benchmark.json"))
+    args = parser.parse_args()
+
+    # Libraries load lazily: the ANN benchmark only pulls in FAISS and NumPy
+    env = EnvironmentConfig()
+
+    nlist = args.nlist or max(1, int(4 * np.sqrt(args.vectors)))
+    vector_db = JobFitmentVectorDB(env, metric=args.metric, nlist=nlist)
+
+    print(f"📐 Indexing {args.vectors} x {args.dim} vectors (nlist={nlist})...")
+    vector_db.index_embeddings(synthetic_embeddings(args.vectors, args.dim))
+    queries = synthetic_embeddings(args.queries, args.dim, seed=1)
+
+    rows = vector_db.benchmark(
+        queries,
+        k=args.k,
+        nprobe_values=args.nprobe,
+        ef_search_values=args.ef_search
+    )
+
+    recall_key = f"recall@{min(args.k, args.vectors)}"
+    print(f"\n{'Index':<10}{'Param':<14}{recall_key:<12}{'ms/query':<12}{'Exact ms':<12}{'Build s'}")
+    print("-" * 70)
+    for row in rows:
+        param = f"{row['param']}={row['value']}" if row['param'] else "-"
+        print(f"{row['index_type']:<10}{param:<14}{row[recall_key]:<12}"
+              f"{row['latency_ms']:<12}{row['exact_latency_ms']:<12}{row['build_s']}")
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({'config': vars(args), 'results': rows}, f, indent=2)
+    print(f"\n✅ Saved: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Stage-by-stage benchmark of the job fitment agent on synthetic data.
+
+Times KB generation, embedding, index build and skill-table setup once, then
+ingestion, scoring (through the RAG pipeline, including each job's context
+retrieval), retrieval and report rendering at each posting scale,
+recording peak RSS after every stage. Results are written as JSON; pass
+--baseline to fail (exit 1) when a stage got slower than --threshold.
+
+Usage:
+    python benchmarks/fitment_suite.py --scales 100 1000 10000 100000
+    python benchmarks/fitment_suite.py --baseline data/job_fitment/benchmarks/baseline.json
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from benchmarks.synthetic import SKILL_POOL, HashingEncoder, synthetic_postings, synthetic_profiles
+from src.job_fitment import (
+    EnvironmentConfig,
+    JobFitmentAnalyzer,
+    JobFitmentPromptEngineer,
+    JobFitmentRAGPipeline,
+    JobFitmentVectorDB,
+    JobPostingStore,
+    KnowledgeBaseGenerator,
+    OUTPUT_DIR,
+    SkillSimilarityTable,
+)
+from src.job_fitment.scorer import TopKRanker
+
+CHUNK_SIZE = 10_000         # postings materialized at a time while scoring
+MIN_COMPARABLE_S = 0.05     # stages faster than this are too noisy to gate on
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process so far (None where unsupported)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+class StageRecorder:
+    """Collects one row per (scale, stage)."""
+
+    def __init__(self):
+        self.rows: List[Dict[str, Any]] = []
+
+    @contextmanager
+    def stage(self, scale: Any, name: str, items: int = 1):
+        row = {'scale': scale, 'stage': name, 'items': items}
+        start = time.perf_counter()
+        yield row
+        row['seconds'] = round(time.perf_counter() - start, 4)
+        row['per_item_ms'] = round(1000 * row['seconds'] / max(row['items'], 1), 4)
+        row['peak_rss_mb'] = peak_rss_mb()
+        self.rows.append(row)
+        print(f"   {str(scale):<8}{name:<16}{row['seconds']:>10.3f}s{row['per_item_ms']:>12.4f} ms/item"
+              f"{row['peak_rss_mb'] or 0:>10.1f} MB")
+
+    def add(self, scale: Any, name: str, seconds: float, items: int, **extra):
+        """Record a stage whose time was accumulated across chunks."""
+        self.rows.append({
+            'scale': scale, 'stage': name, 'items': items, 'seconds': round(seconds, 4),
+            'per_item_ms': round(1000 * seconds / max(items, 1), 4), 'peak_rss_mb': peak_rss_mb(), **extra
+        })
+        print(f"   {str(scale):<8}{name:<16}{seconds:>10.3f}s{1000 * seconds / max(items, 1):>12.4f} ms/item"
+              f"{peak_rss_mb() or 0:>10.1f} MB")
+
+
+def run_suite(
+    scales: List[int],
+    profiles: int = 1,
+    queries: int = 200,
+    top_k: int = 10,
+    encoder: str = "hash",
+    output_dir: Path = OUTPUT_DIR / "benchmarks"
+) -> Dict[str, Any]:
+    """Run every stage and return {'meta': ..., 'results': rows}."""
+    env = EnvironmentConfig()
+    recorder = StageRecorder()
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    print(f"\n{'Scale':<11}{'Stage':<16}{'Time':>11}{'Per item':>20}{'Peak RSS':>10}")
+    print("-" * 70)
+
+    # Setup stages are independent of the posting scale
+    with recorder.stage("setup", "kb_generation") as row:
+        prompt_engineer = JobFitmentPromptEngineer(env)
+        kb_generator = KnowledgeBaseGenerator(env)
+        knowledge_base = kb_generator.generate_full_knowledge_base()
+        row['items'] = len(knowledge_base)
+
+    vector_db = JobFitmentVectorDB(env)
+    if encoder == "model":
+        vector_db.load_embedding_model()
+    else:
+        vector_db.embedding_model = HashingEncoder(vector_db.EMBEDDING_DIM)
+
+    texts = [doc['question'] for doc in knowledge_base]
+    with recorder.stage("setup", "embedding", len(texts)):
+        embeddings = vector_db.generate_embeddings(texts)
+
+    with recorder.stage("setup", "index_build", len(texts)):
+        vector_db.index_embeddings(embeddings, documents=knowledge_base)
+
+    with recorder.stage("setup", "skill_table") as row:
+        skill_table = SkillSimilarityTable(env, encoder=vector_db.generate_embeddings)
+        skill_table.build(kb_generator.skill_categories, extra_skills=SKILL_POOL)
+        row['items'] = len(skill_table)
+
+    analyzer = JobFitmentAnalyzer(env, vector_db, skill_table)
+    pipeline = JobFitmentRAGPipeline(env, prompt_engineer, vector_db, analyzer)
+    cohort = synthetic_profiles(profiles)
+
+    # Resolve pyarrow up front so its import time doesn't land in the first ingestion stage
+    has_pyarrow = env.pa is not None and env.pq is not None
+
+    for scale in scales:
+        if has_pyarrow:
+            store = JobPostingStore(env, output_dir / f"postings_{scale}.parquet")
+            # Generate, write and read back the postings as a columnar store
+            with recorder.stage(scale, "ingestion", scale):
+                store.write({f: getattr(job, f) for f in job.__slots__} for job in synthetic_postings(scale))
+                for _ in store.iter_batches():
+                    pass
+
+        # Score in chunks so 10^6 postings never sit in memory at once
+        rankers = []
+        seconds = 0.0
+        for profile in cohort:
+            features = analyzer.compile_profile(profile)
+            ranker = TopKRanker(top_k)
+            postings = synthetic_postings(scale)
+            while True:
+                chunk = list(islice(postings, CHUNK_SIZE))
+                if not chunk:
+                    break
+                start = time.perf_counter()
+                for job in chunk:
+                    ranker.push(pipeline.analyze_job(profile, job, features=features))
+                seconds += time.perf_counter() - start
+            rankers.append(ranker)
+        recorder.add(scale, "scoring", seconds, scale * len(cohort))
+
+        gaps = [gap for gap, _ in rankers[0].summary.common_gaps(50)] or ["python"]
+        n_queries = min(queries, scale)
+        latencies = []
+        with recorder.stage(scale, "retrieval", n_queries) as row:
+            for i in range(n_queries):
+                start = time.perf_counter()
+                pipeline.retrieve_context(f"How to learn {gaps[i % len(gaps)]}")
+                latencies.append(1000 * (time.perf_counter() - start))
+        row['p50_ms'] = round(float(np.percentile(latencies, 50)), 4) if latencies else None
+        row['p95_ms'] = round(float(np.percentile(latencies, 95)), 4) if latencies else None
+
+        with recorder.stage(scale, "report", len(cohort)):
+            for i, (profile, ranker) in enumerate(zip(cohort, rankers)):
+                pipeline.report_renderer.write(
+                    output_dir / f"report_{scale}_{i}.md", profile, ranker.results(), ranker.summary
+                )
+
+    return {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'encoder': encoder,
+            'profiles': profiles,
+            'queries': queries,
+            'top_k': top_k,
+        },
+        'results': recorder.rows,
+    }
+
+
+def check_regressions(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float = 0.2
+) -> List[str]:
+    """Stages more than threshold (fractional) slower than the baseline."""
+    previous = {(str(r['scale']), r['stage']): r for r in baseline.get('results', [])}
+    regressions = []
+    for row in current['results']:
+        before = previous.get((str(row['scale']), row['stage']))
+        if before is None or before['seconds'] < MIN_COMPARABLE_S:
+            continue
+        ratio = row['seconds'] / before['seconds']
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"{row['stage']} @ {row['scale']}: {before['seconds']:.3f}s -> {row['seconds']:.3f}s (+{ratio - 1:.0%})"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[100, 1_000, 10_000])
+    parser.add_argument("--profiles", type=int, default=1)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--encoder", choices=["hash", "model"], default="hash",
+                        help="hash: model-free bag-of-words encoder; model: the real sentence transformer")
+    parser.add_argument("--output", default=str(OUTPUT_DIR / "benchmarks" / "fitment_suite.json"))
+    parser.add_argument("--baseline", default=None, help="previous results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown, e.g. 0.2 = 20%%")
+    args = parser.parse_args()
+
+    output = Path(args.output)
+    report = run_suite(args.scales, args.profiles, args.queries, args.top_k, args.encoder, output.parent)
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Saved: {output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = check_regressions(report, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} stage(s) regressed beyond {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"   - {line}")
+            sys.exit(1)
+        print(f"\n✅ No regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
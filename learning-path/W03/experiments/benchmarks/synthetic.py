@@ -0,0 +1,88 @@
+"""
+Synthetic data generators for the job_fitment benchmarks.
+Everything is seeded, so runs at the same scale see identical inputs.
+"""
+
+import random
+import zlib
+from typing import Iterator, List
+
+from src.job_fitment import JobPosting, StudentProfile, TARGET_COMPANIES
+
+SKILL_POOL = [
+    "Python", "Java", "JavaScript", "TypeScript", "Go", "C++", "Rust", "SQL",
+    "React", "Node.js", "Django", "Flask", "Spring Boot", "GraphQL", "REST APIs",
+    "AWS", "Azure", "Google Cloud", "Docker", "Kubernetes", "Terraform", "CI/CD",
+    "PostgreSQL", "MongoDB", "Redis", "Kafka", "Spark", "Airflow",
+    "Machine Learning", "Deep Learning", "NLP", "Computer Vision", "PyTorch",
+    "TensorFlow", "LLMs", "Data Analysis", "Statistics", "Linux", "Git",
+    # Aliases and near-duplicates, as scraped postings would contain
+    "k8s", "postgres", "golang", "ML", "ReactJS", "node", "GCP",
+]
+TITLES = ["Software Engineer", "Data Scientist", "ML Engineer", "Backend Engineer",
+          "Frontend Engineer", "DevOps Engineer", "Data Engineer", "Cloud Engineer"]
+LOCATIONS = ["San Jose, CA", "Remote", "Seattle, WA", "Austin, USA", "Bangalore, India",
+             "Munich, Germany", "London, UK", "New York, NY"]
+LEVELS = ["Entry", "Entry", "Mid", "Senior"]
+DEGREES = ["Bachelor of Science", "Master of Science", "MBA", "Diploma"]
+FIELDS = ["Computer Science", "Data Science", "Electrical Engineering", "Economics"]
+
+
+def synthetic_postings(n: int, seed: int = 0) -> Iterator[JobPosting]:
+    """Yield n postings without materializing them all."""
+    rng = random.Random(seed)
+    for i in range(n):
+        company = rng.choice(TARGET_COMPANIES)
+        yield JobPosting(
+            job_id=f"SYN-{i:07d}",
+            title=rng.choice(TITLES),
+            company=company.name,
+            company_priority=company.priority,
+            location=rng.choice(LOCATIONS),
+            requirements=rng.sample(SKILL_POOL, rng.randint(3, 8)),
+            preferred_skills=rng.sample(SKILL_POOL, rng.randint(0, 4)),
+            experience_level=rng.choice(LEVELS),
+            education_requirements=["Bachelor's degree in a technical field"] if rng.random() < 0.7 else [],
+        )
+
+
+def synthetic_profiles(n: int, seed: int = 0) -> List[StudentProfile]:
+    rng = random.Random(seed + 1)
+    return [
+        StudentProfile(
+            name=f"Student {i}",
+            location=rng.choice(LOCATIONS),
+            education=[{"degree": rng.choice(DEGREES), "field": rng.choice(FIELDS)}],
+            skills=rng.sample(SKILL_POOL, rng.randint(4, 12)),
+            experience=[{"title": "Intern", "duration": f"{rng.randint(1, 12)} months"}
+                        for _ in range(rng.randint(0, 2))],
+            certifications=["AWS Certified Cloud Practitioner"] if rng.random() < 0.3 else [],
+            preferences={"location": rng.choice(LOCATIONS + ["Bay Area or Remote"])},
+        )
+        for i in range(n)
+    ]
+
+
+class HashingEncoder:
+    """
+    Bag-of-words stand-in for SentenceTransformer.encode(), so the pipeline
+    can be measured (and tested) without downloading a model.
+    Shared with the test suite's fixtures.
+    """
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+        self.encoded = 0
+
+    def encode(self, texts, convert_to_numpy=True, show_progress_bar=False):
+        import numpy as np
+
+        self.encoded += len(texts)
+        vectors = np.zeros((len(texts), self.dim), dtype='float32')
+        for row, text in enumerate(texts):
+            for token in text.lower().split():
+                vectors[row, zlib.crc32(token.encode()) % self.dim] += 1.0
+        return vectors
+
+    def get_sentence_embedding_dimension(self):
+        return self.dim
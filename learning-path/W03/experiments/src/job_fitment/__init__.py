@@ -15,12 +15,19 @@ from .vector_db import JobFitmentVectorDB
 from .analyzer import JobFitmentAnalyzer
 from .pipeline import JobFitmentRAGPipeline
 from .scorer import FitmentScorer
+from .reports import FitmentReportRenderer
+from .explanations import FitmentExplainer
+from .metrics import Metrics, JSONExporter, PrometheusTextfileExporter, OTLPSpanExporter
+from .skills import SkillSimilarityTable
+from .features import ProfileFeatures
+from .ingestion import JobPostingIngestor, JobPostingStore
 
 # Data Models
 from .models import (
     StudentProfile,
     JobPosting,
     FitmentResult,
+    FitmentResultBatch,
     CompanyConfig
 )
 
@@ -40,11 +47,22 @@ __all__ = [
     'JobFitmentAnalyzer',
     'JobFitmentRAGPipeline',
     'FitmentScorer',
+    'FitmentReportRenderer',
+    'FitmentExplainer',
+    'Metrics',
+    'JSONExporter',
+    'PrometheusTextfileExporter',
+    'OTLPSpanExporter',
+    'SkillSimilarityTable',
+    'ProfileFeatures',
+    'JobPostingIngestor',
+    'JobPostingStore',
     
     # Data Models
     'StudentProfile',
     'JobPosting',
     'FitmentResult',
+    'FitmentResultBatch',
     'CompanyConfig',
     
     # Sample Data
@@ -1,94 +1,160 @@
-from typing import List
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterator, Tuple
 from .environment import EnvironmentConfig
 from .prompts import JobFitmentPromptEngineer
 from .knowledge_base import KnowledgeBaseGenerator
 from .vector_db import JobFitmentVectorDB
 from .analyzer import JobFitmentAnalyzer
+from .skills import SkillSimilarityTable
 from .pipeline import JobFitmentRAGPipeline
 from .scorer import FitmentScorer
+from .reports import FitmentReportRenderer
+from .explanations import FitmentExplainer
+from .metrics import Metrics, JSONExporter, PrometheusTextfileExporter, OTLPSpanExporter
 from .models import StudentProfile, JobPosting, FitmentResult
 from .config import OUTPUT_DIR
 
+# Agent and postings inherited by forked worker processes (set in the parent before forking)
+_WORKER_AGENT: Optional["JobFitmentAgent"] = None
+_WORKER_JOBS: List[JobPosting] = []
+
+
+def _init_worker():
+    """Keep each forked worker single-threaded so workers don't oversubscribe cores."""
+    agent = _WORKER_AGENT
+    if agent is not None and agent.env is not None:
+        if agent.env.is_imported("faiss") and agent.env.faiss is not None:
+            agent.env.faiss.omp_set_num_threads(1)
+        if agent.env.is_imported("torch") and agent.env.torch is not None:
+            agent.env.torch.set_num_threads(1)
+
+
+def _analyze_profile_worker(
+    position: int,
+    profile: StudentProfile,
+    report_filename: Optional[str],
+    top_k: Optional[int]
+) -> Tuple[int, List[FitmentResult], Dict[str, Any]]:
+    """
+    Score and rank one profile against the inherited postings inside a worker process.
+    Also returns the metrics this task recorded, for the parent to merge.
+    """
+    if _WORKER_AGENT is None:
+        raise RuntimeError("Worker agent not initialized. Use JobFitmentAgent.analyze_many().")
+    metrics = _WORKER_AGENT.metrics
+    # The forked copy still holds the parent's timings and spans; keep only this task's
+    since = metrics.counter_values()
+    metrics.reset(counters=False)
+    with metrics.span("analyze", profile=profile.name, jobs=len(_WORKER_JOBS)):
+        results = _WORKER_AGENT._analyze_profile(profile, _WORKER_JOBS, report_filename, verbose=False, top_k=top_k)
+    return position, results, metrics.snapshot(since=since)
+
+
 class JobFitmentAgent:
     """
     Main application class that orchestrates all components.
     Provides a unified interface for job fitment analysis.
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        vector_db_options: Optional[Dict[str, Any]] = None,
+        metrics: Optional[Metrics] = None
+    ):
+        self.vector_db_options = vector_db_options or {}
+        self.metrics = metrics if metrics is not None else Metrics()
         self.env = None
         self.prompt_engineer = None
         self.knowledge_base_gen = None
         self.vector_db = None
+        self.skill_table = None
         self.analyzer = None
         self.pipeline = None
         self.scorer = None
+        self.explainer = None
         self.initialized = False
     
     def setup(self, skip_packages: bool = False):
-        """Initialize all components."""
+        """Initialize all components (each objective is timed as a metrics span)."""
         print("=" * 80)
         print("🚀 JOB FITMENT ANALYSIS AGENT - SETUP")
         print("=" * 80)
+        span = self.metrics.span
         
-        # Step 0: Environment
-        print("\n📋 Objective 0: Environment Setup")
-        print("-" * 40)
-        self.env = EnvironmentConfig()
-        
-        if not skip_packages:
-            self.env.install_packages()
-        
-        if not self.env.import_libraries():
-            raise RuntimeError("Failed to import required libraries")
-        
-        self.env.get_token("HUGGINGFACE_HUB_TOKEN")
-        self.env.get_token("OPENAI_API_KEY")
-        
-        if self.env.hf_token:
-            self.env.authenticate_hf()
-        
-        self.env.print_summary()
-        
-        # Step 1: System Prompts
-        print("\n📋 Objective 1: System Prompt Engineering")
-        print("-" * 40)
-        self.prompt_engineer = JobFitmentPromptEngineer(self.env)
-        system_prompt = self.prompt_engineer.create_system_prompt()
-        print(f"   ✅ System prompt created ({len(system_prompt)} chars)")
-        
-        # Step 2: Knowledge Base
-        print("\n📋 Objective 2: Knowledge Base Generation")
-        print("-" * 40)
-        self.knowledge_base_gen = KnowledgeBaseGenerator(self.env)
-        knowledge_base = self.knowledge_base_gen.generate_full_knowledge_base()
-        
-        # Step 3: Vector Database
-        print("\n📋 Objective 3: Vector Database")
-        print("-" * 40)
-        self.vector_db = JobFitmentVectorDB(self.env)
-        self.vector_db.load_embedding_model()
-        self.vector_db.build_index(knowledge_base)
-        
-        # Step 4: Analyzer
-        print("\n📋 Objective 4: Job Fitment Analyzer")
-        print("-" * 40)
-        self.analyzer = JobFitmentAnalyzer(self.env, self.vector_db)
-        print("   ✅ Analyzer initialized")
-        
-        # Step 5: RAG Pipeline
-        print("\n📋 Objective 5: RAG Pipeline")
-        print("-" * 40)
-        self.pipeline = JobFitmentRAGPipeline(
-            self.env, self.prompt_engineer, self.vector_db, self.analyzer
-        )
-        print("   ✅ RAG Pipeline ready")
-        
-        # Step 6: Scorer
-        print("\n📋 Objective 6: Scoring System")
-        print("-" * 40)
-        self.scorer = FitmentScorer(self.env)
-        print("   ✅ Scoring system ready")
+        with span("setup"):
+            # Step 0: Environment
+            print("\n📋 Objective 0: Environment Setup")
+            print("-" * 40)
+            with span("setup.environment"):
+                self.env = EnvironmentConfig()
+                
+                if not skip_packages:
+                    self.env.install_packages()
+                
+                if not self.env.import_libraries():
+                    raise RuntimeError("Failed to import required libraries")
+                
+                self.env.get_token("HUGGINGFACE_HUB_TOKEN")
+                self.env.get_token("OPENAI_API_KEY")
+                
+                if self.env.hf_token:
+                    self.env.authenticate_hf()
+                
+                self.env.print_summary()
+            
+            # Step 1: System Prompts
+            print("\n📋 Objective 1: System Prompt Engineering")
+            print("-" * 40)
+            with span("setup.system_prompt"):
+                self.prompt_engineer = JobFitmentPromptEngineer(self.env)
+                system_prompt = self.prompt_engineer.create_system_prompt()
+            print(f"   ✅ System prompt created ({len(system_prompt)} chars)")
+            
+            # Step 2: Knowledge Base
+            print("\n📋 Objective 2: Knowledge Base Generation")
+            print("-" * 40)
+            with span("setup.knowledge_base"):
+                self.knowledge_base_gen = KnowledgeBaseGenerator(self.env)
+                knowledge_base = self.knowledge_base_gen.load_or_generate()
+            self.metrics.register("knowledge_base", self.knowledge_base_gen.stats)
+            
+            # Step 3: Vector Database
+            print("\n📋 Objective 3: Vector Database")
+            print("-" * 40)
+            with span("setup.vector_db", documents=len(knowledge_base)):
+                self.vector_db = JobFitmentVectorDB(self.env, **self.vector_db_options)
+                self.vector_db.load_embedding_model()
+                self.vector_db.build_index_cached(knowledge_base, self.knowledge_base_gen.content_key)
+            self.metrics.register("vector_db", self.vector_db.stats)
+            
+            # Step 4: Analyzer
+            print("\n📋 Objective 4: Job Fitment Analyzer")
+            print("-" * 40)
+            with span("setup.analyzer"):
+                self.skill_table = SkillSimilarityTable(self.env, encoder=self.vector_db.generate_embeddings)
+                self.skill_table.build(self.knowledge_base_gen.skill_categories)
+                self.analyzer = JobFitmentAnalyzer(self.env, self.vector_db, self.skill_table, self.metrics)
+            print("   ✅ Analyzer initialized")
+            
+            # Step 5: RAG Pipeline
+            print("\n📋 Objective 5: RAG Pipeline")
+            print("-" * 40)
+            with span("setup.pipeline"):
+                self.pipeline = JobFitmentRAGPipeline(
+                    self.env, self.prompt_engineer, self.vector_db, self.analyzer, metrics=self.metrics
+                )
+            print("   ✅ RAG Pipeline ready")
+            
+            # Step 6: Scorer
+            print("\n📋 Objective 6: Scoring System")
+            print("-" * 40)
+            with span("setup.scorer"):
+                self.scorer = FitmentScorer(self.env)
+            print("   ✅ Scoring system ready")
         
         self.initialized = True
         
@@ -101,9 +167,14 @@ class JobFitmentAgent:
         profile: StudentProfile,
         jobs: List[JobPosting],
         generate_report: bool = True,
-        verbose: bool = True
+        verbose: bool = True,
+        top_k: Optional[int] = None,
+        explain: bool = False
     ) -> List[FitmentResult]:
-        """Run complete job fitment analysis."""
+        """
+        Run complete job fitment analysis, returning the top_k ranked results (all by default).
+        With explain=True the detailed results in the report get LLM-written explanations.
+        """
         if not self.initialized:
             raise RuntimeError("Agent not initialized. Call setup() first.")
         
@@ -114,11 +185,12 @@ class JobFitmentAgent:
         print("🔍 RUNNING JOB FITMENT ANALYSIS")
         print("=" * 80)
         
-        # Analyze all jobs
-        results = self.pipeline.batch_analyze(profile, jobs, verbose=verbose)
-        
-        # Rank results
-        ranked_results = self.scorer.rank_results(results)
+        # Analyze and rank all jobs
+        with self.metrics.span("analyze", profile=profile.name, jobs=len(jobs)):
+            ranked_results = self._analyze_profile(
+                profile, jobs, "fitment_report.md" if generate_report else None,
+                verbose=verbose, top_k=top_k, explain=explain
+            )
         
         # Print summary
         print("\n" + "-" * 80)
@@ -131,12 +203,145 @@ class JobFitmentAgent:
             print(f"{i:<6}{result.job.company:<15}{result.job.title[:33]:<35}"
                   f"{result.fitment_score}%{'':<5}P{result.priority_level}")
         
-        # Generate report
-        if generate_report and self.pipeline is not None:
-            self.pipeline.generate_report(profile, ranked_results)
+        return ranked_results
+    
+    def _analyze_profile(
+        self,
+        profile: StudentProfile,
+        jobs: List[JobPosting],
+        report_filename: Optional[str],
+        verbose: bool,
+        top_k: Optional[int] = None,
+        explain: bool = False
+    ) -> List[FitmentResult]:
+        """Analyze and rank jobs for one profile in a single bounded pass, optionally writing its report."""
+        ranker = self.scorer.ranker(top_k or len(jobs))
+        self.pipeline.rank_jobs(profile, jobs, ranker, verbose=verbose)
+        ranked_results = ranker.results()
+        
+        if explain:
+            # Only the results shown in detail are worth an LLM call
+            with self.metrics.span("explain"):
+                self.enable_explanations().explain_results(
+                    profile, ranked_results[:FitmentReportRenderer.DETAIL_COUNT]
+                )
+        
+        if report_filename:
+            self.pipeline.write_report(
+                profile, ranked_results, filename=report_filename, summary=ranker.summary
+            )
         
         return ranked_results
     
+    def analyze_many(
+        self,
+        profiles: List[StudentProfile],
+        jobs: List[JobPosting],
+        workers: Optional[int] = None,
+        generate_reports: bool = True,
+        top_k: Optional[int] = None
+    ) -> Iterator[Tuple[StudentProfile, List[FitmentResult]]]:
+        """
+        Analyze a cohort of profiles in parallel, yielding (profile, ranked results) as each
+        profile finishes (not in input order). Workers are forked so the loaded model, FAISS
+        index and skill table are shared copy-on-write; each writes its own report, keeps the
+        top_k results per profile, and has its metrics merged into self.metrics. Falls back to
+        in-process execution when fork is unavailable (Windows, or workers=1). Arguments are
+        validated when called, not on the first iteration.
+        """
+        if not self.initialized:
+            raise RuntimeError("Agent not initialized. Call setup() first.")
+        
+        if self.pipeline is None or self.scorer is None or self.analyzer is None:
+            raise RuntimeError("Pipeline or scorer not initialized. Call setup() first.")
+        
+        if workers is not None and workers < 1:
+            raise ValueError(f"workers must be at least 1, got {workers}")
+        
+        workers = min(workers or os.cpu_count() or 1, len(profiles)) or 1
+        report_names = [
+            self.report_filename(profile, i) if generate_reports else None
+            for i, profile in enumerate(profiles)
+        ]
+        
+        print(f"\n👥 Analyzing {len(profiles)} profiles x {len(jobs)} jobs with {workers} worker(s)...")
+        
+        # Embed new posting skills once, before workers inherit the skill table
+        self.analyzer.register_job_skills(jobs)
+        return self._iter_many(profiles, jobs, workers, report_names, top_k)
+    
+    def _iter_many(
+        self,
+        profiles: List[StudentProfile],
+        jobs: List[JobPosting],
+        workers: int,
+        report_names: List[Optional[str]],
+        top_k: Optional[int]
+    ) -> Iterator[Tuple[StudentProfile, List[FitmentResult]]]:
+        """Generator behind analyze_many()."""
+        global _WORKER_AGENT, _WORKER_JOBS
+        
+        if workers == 1 or "fork" not in multiprocessing.get_all_start_methods():
+            for profile, report_name in zip(profiles, report_names):
+                with self.metrics.span("analyze", profile=profile.name, jobs=len(jobs)):
+                    results = self._analyze_profile(profile, jobs, report_name, verbose=False, top_k=top_k)
+                yield profile, results
+            return
+        
+        # Tokenizers in forked children must not spawn their own thread pools
+        os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+        # Workers inherit the postings, so each task only pickles its profile
+        _WORKER_AGENT, _WORKER_JOBS = self, jobs
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=_init_worker
+            ) as executor:
+                futures = [
+                    executor.submit(_analyze_profile_worker, i, profile, report_name, top_k)
+                    for i, (profile, report_name) in enumerate(zip(profiles, report_names))
+                ]
+                for future in as_completed(futures):
+                    position, ranked_results, snapshot = future.result()
+                    self.metrics.merge(snapshot)
+                    yield profiles[position], ranked_results
+        finally:
+            _WORKER_AGENT, _WORKER_JOBS = None, []
+    
+    def enable_explanations(self, **options) -> FitmentExplainer:
+        """
+        Create (or return) the LLM explainer. Options are passed to FitmentExplainer,
+        e.g. base_url="http://localhost:8000/v1" for a local OpenAI-compatible server.
+        """
+        if self.explainer is None or options:
+            options.setdefault('cache_dir', OUTPUT_DIR)
+            self.explainer = FitmentExplainer(self.env, self.prompt_engineer, **options)
+            self.metrics.register("explanations", self.explainer.stats)
+        return self.explainer
+    
+    def export_metrics(self, directory: Optional[str] = None, otlp_endpoint: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Run the configured exporters, plus JSON and Prometheus textfile exports
+        into directory and OTLP spans to otlp_endpoint when given.
+        Returns the metrics snapshot.
+        """
+        exporters = list(self.metrics.exporters)
+        if directory:
+            exporters.append(JSONExporter(Path(directory) / "metrics.json"))
+            exporters.append(PrometheusTextfileExporter(Path(directory) / "job_fitment.prom"))
+        if otlp_endpoint:
+            exporters.append(OTLPSpanExporter(otlp_endpoint))
+        for exporter in exporters:
+            exporter.export(self.metrics)
+        return self.metrics.snapshot()
+    
+    @staticmethod
+    def report_filename(profile: StudentProfile, position: int) -> str:
+        """Per-profile report filename used by analyze_many()."""
+        slug = re.sub(r'[^a-z0-9]+', '_', profile.name.lower()).strip('_') or "profile"
+        return f"fitment_report_{position:04d}_{slug}.md"
+    
     def quick_analyze(self, profile: StudentProfile, job: JobPosting) -> FitmentResult:
         """Quick analysis for a single job."""
         if not self.initialized:
@@ -159,5 +364,7 @@ class JobFitmentAgent:
             self.knowledge_base_gen.save_knowledge_base()
         if self.vector_db is not None:
             self.vector_db.save_index()
+        if self.skill_table is not None:
+            self.skill_table.save()
         print("✅ All artifacts saved to:", OUTPUT_DIR)
 
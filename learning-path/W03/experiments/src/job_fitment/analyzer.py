@@ -1,8 +1,11 @@
-import re
-from typing import Tuple, List
+import sys
+from typing import Iterable, Tuple, List, Optional
 from .environment import EnvironmentConfig
 from .models import StudentProfile, JobPosting, FitmentResult
 from .vector_db import JobFitmentVectorDB
+from .skills import SkillSimilarityTable
+from .features import ProfileFeatures, COUNTRIES, keyword_mask
+from .metrics import Metrics
 
 class JobFitmentAnalyzer:
     """
@@ -18,23 +21,73 @@ class JobFitmentAnalyzer:
         'culture': 0.05
     }
     
-    def __init__(self, env: EnvironmentConfig, vector_db: JobFitmentVectorDB):
+    # Map experience level to expected years
+    LEVEL_REQUIREMENTS = {
+        "Entry": (0, 2),
+        "Mid": (2, 5),
+        "Senior": (5, 10),
+        "Executive": (10, 20)
+    }
+    
+    def __init__(
+        self,
+        env: EnvironmentConfig,
+        vector_db: JobFitmentVectorDB,
+        skill_table: Optional[SkillSimilarityTable] = None,
+        metrics: Optional[Metrics] = None
+    ):
         self.env = env
         self.vector_db = vector_db
+        self.skill_table = skill_table
+        self.metrics = metrics if metrics is not None else Metrics(enabled=False)
+    
+    def register_job_skills(self, jobs: List[JobPosting]) -> int:
+        """Add skills seen in postings to the similarity table in one batch."""
+        return self.register_skills(s for job in jobs for s in job.requirements + job.preferred_skills)
+    
+    def register_skills(self, skills: Iterable[str]) -> int:
+        """Add skill names to the similarity table in one batch."""
+        if self.skill_table is None or self.skill_table.encoder is None:
+            return 0
+        return self.skill_table.add_skills(skills)
     
-    def calculate_skill_match(self, profile: StudentProfile, job: JobPosting) -> Tuple[float, List[str], List[str]]:
+    def compile_profile(self, profile: StudentProfile) -> ProfileFeatures:
+        """Precompute a profile's features once for a batch of jobs."""
+        return ProfileFeatures.compile(profile, self.skill_table)
+    
+    def _features(self, profile: StudentProfile, features: Optional[ProfileFeatures]) -> ProfileFeatures:
+        return features if features is not None else self.compile_profile(profile)
+    
+    def calculate_skill_match(
+        self,
+        profile: StudentProfile,
+        job: JobPosting,
+        features: Optional[ProfileFeatures] = None
+    ) -> Tuple[float, List[str], List[str]]:
         """Calculate skill match percentage."""
-        profile_skills = set(s.lower() for s in profile.skills)
+        features = self._features(profile, features)
+        profile_skills = features.skills
         
         # Combine required and preferred skills
-        job_skills = set(s.lower() for s in job.requirements + job.preferred_skills)
+        job_skills = set(sys.intern(s.lower()) for s in job.requirements + job.preferred_skills)
         
         if not job_skills:
             return 100.0, [], []
         
-        # Find matches and gaps
-        matches = profile_skills & job_skills
-        gaps = job_skills - profile_skills
+        # Find matches and gaps (aliases and similar skills count as matches)
+        if self.skill_table is not None:
+            # New posting skills may have grown the table since the profile was compiled
+            if features.vocab_size != len(self.skill_table):
+                features.refresh_skill_ids(self.skill_table)
+            matches = {
+                s for s in job_skills
+                if self.skill_table.matches(
+                    s, profile_skills, candidate_ids=features.skill_ids, candidate_keys=features.skill_keys
+                )
+            }
+        else:
+            matches = profile_skills & job_skills
+        gaps = job_skills - matches
         
         # Calculate percentage (required skills weighted more)
         required_skills = set(s.lower() for s in job.requirements)
@@ -52,26 +105,15 @@ class JobFitmentAnalyzer:
         
         return min(score, 100.0), list(matches), list(gaps)
     
-    def calculate_experience_match(self, profile: StudentProfile, job: JobPosting) -> float:
+    def calculate_experience_match(
+        self,
+        profile: StudentProfile,
+        job: JobPosting,
+        features: Optional[ProfileFeatures] = None
+    ) -> float:
         """Calculate experience level match."""
-        # Get total years of experience from profile
-        total_years = 0
-        for exp in profile.experience:
-            duration = exp.get('duration', '')
-            # Simple parsing: look for numbers
-            numbers = re.findall(r'\d+', duration)
-            if numbers:
-                total_years += int(numbers[0])
-        
-        # Map experience level to expected years
-        level_requirements = {
-            "Entry": (0, 2),
-            "Mid": (2, 5),
-            "Senior": (5, 10),
-            "Executive": (10, 20)
-        }
-        
-        min_years, max_years = level_requirements.get(job.experience_level, (0, 2))
+        total_years = self._features(profile, features).total_years
+        min_years, max_years = self.LEVEL_REQUIREMENTS.get(job.experience_level, (0, 2))
         
         if min_years <= total_years <= max_years:
             return 100.0
@@ -83,67 +125,75 @@ class JobFitmentAnalyzer:
             # Over-experienced: slight penalty
             return max(70, 100 - ((total_years - max_years) * 5))
     
-    def calculate_education_match(self, profile: StudentProfile, job: JobPosting) -> float:
+    def calculate_education_match(
+        self,
+        profile: StudentProfile,
+        job: JobPosting,
+        features: Optional[ProfileFeatures] = None
+    ) -> float:
         """Calculate education match."""
         if not job.education_requirements:
             return 100.0
         
-        profile_degrees = []
-        profile_fields = []
-        
-        for edu in profile.education:
-            profile_degrees.append(edu.get('degree', '').lower())
-            profile_fields.append(edu.get('field', '').lower())
-        
-        score = 0
-        for req in job.education_requirements:
-            req_lower = req.lower()
-            
-            # Check degree match
-            for degree in profile_degrees:
-                if any(d in degree for d in ['bachelor', 'master', 'phd', 'bs', 'ms', 'mba']):
-                    score += 30
-                    break
-            
-            # Check field match
-            for field in profile_fields:
-                if any(f in field for f in ['computer', 'software', 'engineering', 'science', 'data']):
-                    score += 40
-                    break
+        features = self._features(profile, features)
+        
+        # Each requirement scores a recognized degree and a relevant field
+        per_requirement = (30 if features.degree_mask else 0) + (40 if features.field_mask else 0)
+        score = len(job.education_requirements) * per_requirement
         
         # Add points for certifications
-        if profile.certifications:
-            score += min(len(profile.certifications) * 10, 30)
+        score += min(features.certification_count * 10, 30)
         
         return min(score, 100.0)
     
-    def calculate_location_match(self, profile: StudentProfile, job: JobPosting) -> float:
-        """Calculate location match."""
-        pref_location = profile.preferences.get('location', '').lower()
-        job_location = job.location.lower()
-        
+    def calculate_location_match(
+        self,
+        profile: StudentProfile,
+        job: JobPosting,
+        features: Optional[ProfileFeatures] = None
+    ) -> float:
+        """Calculate location match (memoized per job location for a compiled profile)."""
+        features = self._features(profile, features)
+        score = features.location_scores.get(job.location)
+        if score is None:
+            score = features.location_scores[job.location] = self._location_score(features, job.location.lower())
+        return score
+    
+    @staticmethod
+    def _location_score(features: ProfileFeatures, job_location: str) -> float:
         # Check for remote
-        if 'remote' in job_location or 'remote' in pref_location:
+        if features.remote or 'remote' in job_location:
             return 100.0
         
         # Check for city/region match
-        if pref_location and pref_location in job_location:
+        if features.location and features.location in job_location:
             return 100.0
         
         # Check for same country
-        if any(country in pref_location and country in job_location 
-               for country in ['us', 'usa', 'united states', 'india', 'uk', 'germany']):
+        if features.country_mask & keyword_mask(job_location, COUNTRIES):
             return 70.0
         
         return 50.0  # Default for relocation possible
     
-    def analyze_fitment(self, profile: StudentProfile, job: JobPosting) -> FitmentResult:
-        """Perform complete fitment analysis."""
-        # Calculate individual scores
-        skill_score, skill_matches, skill_gaps = self.calculate_skill_match(profile, job)
-        exp_score = self.calculate_experience_match(profile, job)
-        edu_score = self.calculate_education_match(profile, job)
-        loc_score = self.calculate_location_match(profile, job)
+    def analyze_fitment(
+        self,
+        profile: StudentProfile,
+        job: JobPosting,
+        features: Optional[ProfileFeatures] = None
+    ) -> FitmentResult:
+        """Perform complete fitment analysis (pass compiled features when scoring many jobs)."""
+        features = self._features(profile, features)
+        span = self.metrics.span
+        
+        # Calculate individual scores (per-job spans are aggregated, not traced)
+        with span("score.skills", trace=False):
+            skill_score, skill_matches, skill_gaps = self.calculate_skill_match(profile, job, features)
+        with span("score.experience", trace=False):
+            exp_score = self.calculate_experience_match(profile, job, features)
+        with span("score.education", trace=False):
+            edu_score = self.calculate_education_match(profile, job, features)
+        with span("score.location", trace=False):
+            loc_score = self.calculate_location_match(profile, job, features)
         
         # Calculate weighted fitment score
         fitment_score = (
@@ -154,15 +204,10 @@ class JobFitmentAnalyzer:
         )
         
         # Generate recommendations
-        recommendations = self._generate_recommendations(
-            skill_gaps, skill_score, exp_score, edu_score, job
-        )
-        
-        # Generate detailed analysis
-        detailed_analysis = self._generate_detailed_analysis(
-            profile, job, skill_score, exp_score, edu_score, loc_score,
-            skill_matches, skill_gaps
-        )
+        with span("score.recommendations", trace=False):
+            recommendations = self._generate_recommendations(
+                skill_gaps, skill_score, exp_score, edu_score, job
+            )
         
         return FitmentResult(
             job=job,
@@ -172,9 +217,11 @@ class JobFitmentAnalyzer:
             experience_match=round(exp_score, 1),
             education_match=round(edu_score, 1),
             location_match=loc_score >= 70,
-            detailed_analysis=detailed_analysis,
             recommendations=recommendations,
-            priority_level=job.company_priority
+            priority_level=job.company_priority,
+            skill_score=skill_score,
+            location_score=loc_score,
+            profile_name=profile.name
         )
     
     def _generate_recommendations(
@@ -216,40 +263,3 @@ class JobFitmentAnalyzer:
         )
         
         return recommendations[:5]  # Return top 5 recommendations
-    
-    def _generate_detailed_analysis(
-        self,
-        profile: StudentProfile,
-        job: JobPosting,
-        skill_score: float,
-        exp_score: float,
-        edu_score: float,
-        loc_score: float,
-        skill_matches: List[str],
-        skill_gaps: List[str]
-    ) -> str:
-        """Generate detailed analysis text."""
-        analysis_parts = [
-            f"## Fitment Analysis: {profile.name} → {job.title} at {job.company}",
-            f"\n### Score Breakdown:",
-            f"- Skills Match: {skill_score:.1f}% (Weight: 40%)",
-            f"- Experience Match: {exp_score:.1f}% (Weight: 25%)",
-            f"- Education Match: {edu_score:.1f}% (Weight: 20%)",
-            f"- Location Match: {loc_score:.1f}% (Weight: 10%)",
-            f"\n### Matched Skills ({len(skill_matches)}):",
-            f"{', '.join(skill_matches) if skill_matches else 'None identified'}",
-            f"\n### Skill Gaps ({len(skill_gaps)}):",
-            f"{', '.join(skill_gaps) if skill_gaps else 'No critical gaps'}",
-        ]
-        
-        # Add priority-specific details
-        if job.company_priority == 1:
-            analysis_parts.extend([
-                f"\n### Priority 1 Company - Detailed Insights:",
-                f"- {job.company} is in your highest priority list",
-                f"- Recommend dedicating extra preparation time",
-                f"- Consider reaching out to employees for referrals"
-            ])
-        
-        return "\n".join(analysis_parts)
-
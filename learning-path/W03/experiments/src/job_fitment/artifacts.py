@@ -0,0 +1,61 @@
+"""
+Content-addressed artifact helpers for Job Fitment Agent.
+Setup outputs are keyed on a hash of their inputs and reused while it is unchanged.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+from .config import OUTPUT_DIR
+
+ARTIFACT_DIR = OUTPUT_DIR / "artifacts"
+
+
+def content_hash(*parts: Any) -> str:
+    """Stable short hash of JSON-serializable parts (dict key order does not matter)."""
+    payload = json.dumps(parts, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def atomic_write(path: Union[str, Path], write: Callable[[Path], None]) -> Path:
+    """Write via a temporary file and rename, so readers never see a partial artifact."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    write(tmp_path)
+    os.replace(tmp_path, path)
+    return path
+
+
+class ArtifactManifest:
+    """
+    Records which content key each exported file was last written from,
+    so unchanged exports are skipped on the next save.
+    """
+
+    FILENAME = "manifest.json"
+
+    def __init__(self, directory: Optional[Union[str, Path]] = None):
+        self.path = Path(directory or OUTPUT_DIR) / self.FILENAME
+        self.entries: Dict[str, str] = {}
+        if self.path.exists():
+            with open(self.path) as f:
+                self.entries = json.load(f)
+
+    def is_current(self, target: Union[str, Path], key: Optional[str]) -> bool:
+        """Whether target exists and was written from key."""
+        return key is not None and Path(target).exists() and self.entries.get(Path(target).name) == key
+
+    def record(self, target: Union[str, Path], key: Optional[str]):
+        if key is None:
+            self.entries.pop(Path(target).name, None)
+        else:
+            self.entries[Path(target).name] = key
+
+        def write(p: Path):
+            with open(p, 'w') as f:
+                json.dump(self.entries, f, indent=2, sort_keys=True)
+
+        atomic_write(self.path, write)
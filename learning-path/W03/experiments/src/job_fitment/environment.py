@@ -1,11 +1,52 @@
 """
 Environment configuration for Job Fitment Agent.
 Handles Colab vs local environment differences automatically.
+Heavy libraries are imported lazily, on first attribute access.
 """
 
+import importlib
+import importlib.util
 import os
+import subprocess
 import sys
-from typing import Optional
+from typing import Callable, List, Optional
+
+
+def _quiet_transformers(transformers):
+    transformers.logging.set_verbosity_error()
+
+
+class _LazyImport:
+    """
+    Class attribute that imports a module (or one of its attributes) on first access.
+    Resolves to None when the library is not installed; instances may overwrite it.
+    """
+    
+    def __init__(self, module: str, attr: Optional[str] = None, on_import: Optional[Callable] = None):
+        self.module = module
+        self.attr = attr
+        self.on_import = on_import
+        self.name = attr or module
+    
+    def __set_name__(self, owner, name):
+        self.name = name
+    
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        value = self.resolve()
+        # Cache on the instance so later lookups bypass the descriptor
+        instance.__dict__[self.name] = value
+        return value
+    
+    def resolve(self):
+        try:
+            module = importlib.import_module(self.module)
+        except ImportError:
+            return None
+        if self.on_import is not None:
+            self.on_import(module)
+        return getattr(module, self.attr) if self.attr else module
 
 
 class EnvironmentConfig:
@@ -14,25 +55,50 @@ class EnvironmentConfig:
     Handles Colab vs local environment differences automatically.
     """
     
+    # Lazily imported modules: nothing heavy loads until it is actually used
+    torch = _LazyImport("torch")
+    np = _LazyImport("numpy")
+    pd = _LazyImport("pandas")
+    faiss = _LazyImport("faiss")
+    pa = _LazyImport("pyarrow")
+    pq = _LazyImport("pyarrow.parquet")
+    openai = _LazyImport("openai")
+    SentenceTransformer = _LazyImport("sentence_transformers", "SentenceTransformer")
+    pipeline = _LazyImport("transformers", "pipeline", _quiet_transformers)
+    AutoModelForCausalLM = _LazyImport("transformers", "AutoModelForCausalLM", _quiet_transformers)
+    AutoTokenizer = _LazyImport("transformers", "AutoTokenizer", _quiet_transformers)
+    
+    # Modules the RAG setup cannot run without
+    REQUIRED_MODULES = ["numpy", "faiss", "sentence_transformers"]
+    OPTIONAL_MODULES = ["torch", "transformers", "pandas", "pyarrow", "openai"]
+    
+    # pip package name -> import name
+    PACKAGES = {
+        "transformers": "transformers",
+        "torch": "torch",
+        "sentence-transformers": "sentence_transformers",
+        "python-dotenv": "dotenv",
+        "faiss-cpu": "faiss",
+        "huggingface_hub": "huggingface_hub",
+        "numpy": "numpy",
+        "pandas": "pandas",
+        "pyarrow": "pyarrow",
+        "bert-score": "bert_score",
+        "openai": "openai",
+        "requests": "requests",
+        "beautifulsoup4": "bs4",
+        "aiohttp": "aiohttp"
+    }
+    
     def __init__(self):
         """Initialize and detect environment."""
         self._is_colab = self._detect_colab()
-        self._has_gpu = False
+        self._has_gpu = None  # resolved on first access
         self._python_version = sys.version.split()[0]
         self._hf_token = None
         self._libraries_imported = False
         self._openai_api_key = None
         
-        # Storage for imported modules
-        self.torch = None
-        self.np = None
-        self.pd = None
-        self.faiss = None
-        self.SentenceTransformer = None
-        self.pipeline = None
-        self.AutoModelForCausalLM = None
-        self.AutoTokenizer = None
-        
         self._print_environment_info()
     
     def _detect_colab(self) -> bool:
@@ -45,12 +111,22 @@ class EnvironmentConfig:
     
     def _detect_gpu(self) -> bool:
         """Detect GPU availability."""
+        if self.torch is None:
+            return False
+        return self.torch.cuda.is_available()
+    
+    @staticmethod
+    def is_available(module: str) -> bool:
+        """Check whether a module is installed without importing it."""
         try:
-            import torch
-            return torch.cuda.is_available()
-        except ImportError:
+            return importlib.util.find_spec(module) is not None
+        except (ImportError, ValueError):
             return False
     
+    def is_imported(self, name: str) -> bool:
+        """Whether a lazy module attribute (e.g. 'torch') has already been resolved."""
+        return name in self.__dict__
+    
     def _print_environment_info(self):
         """Print environment detection results."""
         print("🔍 Checking environment...")
@@ -71,15 +147,21 @@ class EnvironmentConfig:
     
     @property
     def has_gpu(self) -> bool:
+        if self._has_gpu is None:
+            self._has_gpu = self._detect_gpu()
+            if self._has_gpu:
+                print(f"   ✅ GPU Available: {self.torch.cuda.get_device_name(0)}")
+            else:
+                print("   ⚠️  GPU NOT detected (using CPU)")
         return self._has_gpu
     
     @property
     def device(self) -> str:
-        return "cuda" if self._has_gpu else "cpu"
+        return "cuda" if self.has_gpu else "cpu"
     
     @property
     def device_id(self) -> int:
-        return 0 if self._has_gpu else -1
+        return 0 if self.has_gpu else -1
     
     @property
     def hf_token(self) -> Optional[str]:
@@ -89,74 +171,52 @@ class EnvironmentConfig:
     def openai_api_key(self) -> Optional[str]:
         return self._openai_api_key
     
-    def install_packages(self):
-        """Install required packages."""
-        packages = [
-            "transformers",
-            "torch",
-            "sentence-transformers",
-            "python-dotenv",
-            "faiss-cpu",
-            "huggingface_hub",
-            "numpy",
-            "pandas",
-            "bert-score",
-            "openai",
-            "requests",
-            "beautifulsoup4",
-            "aiohttp"
-        ]
-        
-        print("📦 Installing required packages...")
-        for package in packages:
-            try:
-                __import__(package.replace("-", "_"))
+    def install_packages(self) -> List[str]:
+        """
+        Install required packages that are missing (one pip call, no imports).
+        Returns the packages that are still unavailable afterwards.
+        """
+        print("📦 Checking required packages...")
+        missing = []
+        for package, module in self.PACKAGES.items():
+            if self.is_available(module):
                 print(f"   ✅ {package} already installed")
-            except ImportError:
-                print(f"   ⏳ Installing {package}...")
-                os.system(f"pip install -q {package}")
-                print(f"   ✅ {package} installed")
+            else:
+                missing.append(package)
+        
+        if not missing:
+            return []
+        
+        print(f"   ⏳ Installing {', '.join(missing)}...")
+        result = subprocess.run([sys.executable, "-m", "pip", "install", "-q", *missing], check=False)
+        importlib.invalidate_caches()
+        
+        # pip fails the whole call if any package fails, so check each one
+        failed = [package for package in missing if not self.is_available(self.PACKAGES[package])]
+        installed = len(missing) - len(failed)
+        if installed:
+            print(f"   ✅ {installed} package(s) installed")
+        if failed:
+            print(f"   ❌ pip exited with status {result.returncode}; not installed: {', '.join(failed)}")
+        return failed
     
     def import_libraries(self) -> bool:
-        """Import all required libraries."""
-        try:
-            from transformers import (
-                pipeline, 
-                AutoModelForCausalLM, 
-                AutoTokenizer, 
-                logging as transformers_logging
-            )
-            from sentence_transformers import SentenceTransformer
-            import torch
-            import numpy as np
-            import pandas as pd
-            import faiss
-            
-            transformers_logging.set_verbosity_error()
-            
-            self.pipeline = pipeline
-            self.AutoModelForCausalLM = AutoModelForCausalLM
-            self.AutoTokenizer = AutoTokenizer
-            self.SentenceTransformer = SentenceTransformer
-            self.torch = torch
-            self.np = np
-            self.pd = pd
-            self.faiss = faiss
-            
-            self._has_gpu = torch.cuda.is_available()
-            self._libraries_imported = True
-            
-            if self._has_gpu:
-                print(f"   ✅ GPU Available: {torch.cuda.get_device_name(0)}")
-            else:
-                print("   ⚠️  GPU NOT detected (using CPU)")
-            
-            print("✅ All required libraries imported successfully!")
-            return True
-            
-        except ImportError as e:
-            print(f"❌ Import error: {e}")
+        """
+        Check that required libraries are installed.
+        Modules are imported lazily on first access, so this only locates them.
+        """
+        missing = [m for m in self.REQUIRED_MODULES if not self.is_available(m)]
+        for module in self.OPTIONAL_MODULES:
+            if not self.is_available(module):
+                print(f"   ⚠️  Optional library not installed: {module}")
+        
+        if missing:
+            print(f"❌ Import error: missing required libraries: {', '.join(missing)}")
             return False
+        
+        self._libraries_imported = True
+        print("✅ All required libraries available (imported on first use)")
+        return True
     
     def get_token(self, token_name: str = "HUGGINGFACE_HUB_TOKEN") -> Optional[str]:
         """Get API token from environment."""
@@ -210,7 +270,10 @@ class EnvironmentConfig:
         print("=" * 80)
         print(f"   - Environment: {'Google Colab' if self._is_colab else 'Local'}")
         print(f"   - Python: {self._python_version}")
-        print(f"   - Device: {self.device.upper()}")
+        if self._has_gpu is None:
+            print("   - Device: resolved on first model load")
+        else:
+            print(f"   - Device: {self.device.upper()}")
         print(f"   - HF Token: {'✅ Set' if self._hf_token else '❌ Not set'}")
         print(f"   - OpenAI Key: {'✅ Set' if self._openai_api_key else '❌ Not set'}")
         print("=" * 80)
@@ -0,0 +1,203 @@
+"""
+LLM-written fitment explanations for Job Fitment Agent.
+Async, bounded-concurrency calls to any OpenAI-compatible chat endpoint,
+with request coalescing, a prompt-hash response cache and template fallback.
+"""
+
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+from .environment import EnvironmentConfig
+from .models import StudentProfile, FitmentResult
+from .prompts import JobFitmentPromptEngineer
+from .artifacts import content_hash
+
+
+class FitmentExplainer:
+    """
+    Replaces a result's template analysis with an LLM explanation.
+    Identical prompts share one request and one cache entry; a timeout or
+    API error leaves the template text in place.
+    """
+    
+    MODEL = "gpt-4o-mini"
+    MAX_CONCURRENCY = 8
+    TIMEOUT_S = 20.0
+    MAX_TOKENS = 400
+    TEMPERATURE = 0.2
+    CACHE_FILE = "explanation_cache.jsonl"
+    DEFAULT_ENDPOINT = "https://api.openai.com/v1"
+    
+    def __init__(
+        self,
+        env: EnvironmentConfig,
+        prompt_engineer: JobFitmentPromptEngineer,
+        client: Any = None,
+        model: Optional[str] = None,
+        base_url: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        cache_dir: Optional[Union[str, Path]] = None
+    ):
+        self.env = env
+        self.prompt_engineer = prompt_engineer
+        self.client = client
+        self.model = model or self.MODEL
+        self.base_url = base_url
+        self.max_concurrency = max_concurrency or self.MAX_CONCURRENCY
+        self.timeout = timeout if timeout is not None else self.TIMEOUT_S
+        self.cache_path = Path(cache_dir) / self.CACHE_FILE if cache_dir else None
+        
+        self.cache: Dict[str, str] = {}
+        self.stats = {'requests': 0, 'cache_hits': 0, 'coalesced': 0, 'fallbacks': 0}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._run_client: Any = None   # client this explainer created for the current run
+        self._load_cache()
+    
+    def _load_cache(self):
+        if self.cache_path is None or not self.cache_path.exists():
+            return
+        with open(self.cache_path) as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self.cache[entry['key']] = entry['text']
+    
+    def _store(self, key: str, text: str):
+        self.cache[key] = text
+        if self.cache_path is not None:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_path, 'a') as f:
+                f.write(json.dumps({'key': key, 'text': text}) + "\n")
+    
+    def _get_client(self):
+        """
+        The client passed in, else an OpenAI-compatible async client created on
+        first use in this run. Its connection pool belongs to the running event
+        loop, so aclose() (called by explain_all()) discards it.
+        """
+        if self.client is not None:
+            return self.client
+        if self._run_client is None:
+            if self.env.openai is None:
+                raise RuntimeError("openai not available. Install with: pip install openai")
+            # Local OpenAI-compatible servers usually ignore the key
+            api_key = self.env.openai_api_key or ("local" if self.base_url else None)
+            self._run_client = self.env.openai.AsyncOpenAI(api_key=api_key, base_url=self.base_url)
+        return self._run_client
+    
+    async def aclose(self):
+        """Close the client created for this run (a client passed in is left open)."""
+        client, self._run_client = self._run_client, None
+        if client is not None:
+            await client.close()
+    
+    def build_messages(self, profile: StudentProfile, result: FitmentResult) -> List[Dict[str, str]]:
+        system_prompt = self.prompt_engineer.system_prompt or self.prompt_engineer.create_system_prompt()
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": self.prompt_engineer.format_explanation_prompt(profile, result)},
+        ]
+    
+    def endpoint(self) -> str:
+        """Endpoint the responses come from: base_url, the client's, OPENAI_BASE_URL or OpenAI."""
+        url = (self.base_url or getattr(self.client, 'base_url', None)
+               or os.environ.get('OPENAI_BASE_URL') or self.DEFAULT_ENDPOINT)
+        return str(url).rstrip('/')
+    
+    def prompt_key(self, messages: List[Dict[str, str]]) -> str:
+        """
+        Cache key: hash of everything that determines the response, including a
+        non-default endpoint so stub or proxy responses never answer real API calls.
+        """
+        parts = [self.model, self.TEMPERATURE, self.MAX_TOKENS, messages]
+        endpoint = self.endpoint()
+        if endpoint != self.DEFAULT_ENDPOINT:
+            parts.append(endpoint)
+        return content_hash(*parts)
+    
+    async def explain(self, profile: StudentProfile, result: FitmentResult) -> str:
+        """
+        Explain one result and store it as the result's analysis text
+        (under the template heading). Falls back to the template analysis.
+        """
+        template = result.detailed_analysis
+        messages = self.build_messages(profile, result)
+        key = self.prompt_key(messages)
+        
+        if key in self.cache:
+            self.stats['cache_hits'] += 1
+            text = self.cache[key]
+        elif key in self._inflight:
+            # Coalesce: identical prompts in flight await the same request
+            self.stats['coalesced'] += 1
+            text = await asyncio.shield(self._inflight[key])
+        else:
+            pending = self._inflight[key] = asyncio.ensure_future(self._complete(key, messages))
+            try:
+                text = await pending
+            finally:
+                self._inflight.pop(key, None)
+        
+        if text is None:
+            return template
+        result.analysis_text = f"{template.splitlines()[0]}\n\n{text}"
+        return result.analysis_text
+    
+    async def _complete(self, key: str, messages: List[Dict[str, str]]) -> Optional[str]:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            self.stats['requests'] += 1
+            try:
+                response = await asyncio.wait_for(
+                    self._get_client().chat.completions.create(
+                        model=self.model,
+                        messages=messages,
+                        temperature=self.TEMPERATURE,
+                        max_tokens=self.MAX_TOKENS,
+                    ),
+                    timeout=self.timeout
+                )
+                text = (response.choices[0].message.content or "").strip()
+            except asyncio.TimeoutError:
+                print(f"   ⚠️  Explanation timed out after {self.timeout}s, using template")
+                text = ""
+            except Exception as e:
+                print(f"   ⚠️  Explanation failed ({type(e).__name__}: {e}), using template")
+                text = ""
+        
+        if not text:
+            self.stats['fallbacks'] += 1
+            return None
+        self._store(key, text)
+        return text
+    
+    async def explain_all(self, profile: StudentProfile, results: List[FitmentResult]) -> List[str]:
+        """Explain results concurrently (at most max_concurrency requests in flight), in order."""
+        # Created per run: a semaphore and an HTTP pool are bound to the event loop that first uses them
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        try:
+            return list(await asyncio.gather(*(self.explain(profile, r) for r in results)))
+        finally:
+            await self.aclose()
+    
+    def explain_results(self, profile: StudentProfile, results: List[FitmentResult]) -> List[str]:
+        """Blocking wrapper around explain_all(); also works from notebooks with a running loop."""
+        print(f"🤖 Explaining {len(results)} results with {self.model} "
+              f"(max {self.max_concurrency} concurrent)...")
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            explanations = asyncio.run(self.explain_all(profile, results))
+        else:
+            # Jupyter/Colab already run a loop in this thread; use a fresh one in a worker
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                explanations = executor.submit(asyncio.run, self.explain_all(profile, results)).result()
+        print(f"   ✅ {self.stats['requests']} requests, {self.stats['cache_hits']} cached, "
+              f"{self.stats['coalesced']} coalesced, {self.stats['fallbacks']} template fallbacks")
+        return explanations
@@ -0,0 +1,84 @@
+"""
+Precompiled profile features for Job Fitment Agent.
+A profile is parsed once per batch so per-job scoring is lookups and integer ops.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Optional, Tuple
+from .models import StudentProfile
+from .skills import SkillSimilarityTable
+
+
+# Keyword order defines the bit positions in the masks
+DEGREE_LEVELS = ('bachelor', 'master', 'phd', 'bs', 'ms', 'mba')
+FIELD_KEYWORDS = ('computer', 'software', 'engineering', 'science', 'data')
+COUNTRIES = ('us', 'usa', 'united states', 'india', 'uk', 'germany')
+
+
+def keyword_mask(text: str, keywords) -> int:
+    """Bitmask of the keywords that occur in text."""
+    mask = 0
+    for bit, keyword in enumerate(keywords):
+        if keyword in text:
+            mask |= 1 << bit
+    return mask
+
+
+@dataclass(slots=True)
+class ProfileFeatures:
+    """Everything the analyzer needs from a StudentProfile, compiled once."""
+    total_years: int = 0
+    degree_mask: int = 0
+    field_mask: int = 0
+    certification_count: int = 0
+    skill_names: Tuple[str, ...] = ()
+    skills: FrozenSet[str] = frozenset()        # lowercase profile skills
+    skill_keys: FrozenSet[str] = frozenset()    # normalized canonical names
+    skill_ids: Optional['np.ndarray'] = None    # IDs in the similarity table
+    vocab_size: int = 0                         # table size when skill_ids were taken
+    location: str = ""                          # normalized preferred location
+    remote: bool = False
+    country_mask: int = 0
+    location_scores: Dict[str, float] = field(default_factory=dict)  # job location -> score
+    
+    @classmethod
+    def compile(
+        cls,
+        profile: StudentProfile,
+        skill_table: Optional[SkillSimilarityTable] = None
+    ) -> 'ProfileFeatures':
+        """Parse durations, degrees, skills and location preferences once."""
+        total_years = 0
+        for exp in profile.experience:
+            # Simple parsing: look for numbers
+            numbers = re.findall(r'\d+', exp.get('duration', ''))
+            if numbers:
+                total_years += int(numbers[0])
+        
+        degree_mask = field_mask = 0
+        for edu in profile.education:
+            degree_mask |= keyword_mask(edu.get('degree', '').lower(), DEGREE_LEVELS)
+            field_mask |= keyword_mask(edu.get('field', '').lower(), FIELD_KEYWORDS)
+        
+        location = " ".join(profile.preferences.get('location', '').lower().split())
+        features = cls(
+            total_years=total_years,
+            degree_mask=degree_mask,
+            field_mask=field_mask,
+            certification_count=len(profile.certifications),
+            skill_names=tuple(profile.skills),
+            skills=frozenset(s.lower() for s in profile.skills),
+            location=location,
+            remote='remote' in location,
+            country_mask=keyword_mask(location, COUNTRIES),
+        )
+        if skill_table is not None:
+            features.skill_keys = frozenset(skill_table.normalize(skill_table.canonical(s)) for s in profile.skills)
+            features.refresh_skill_ids(skill_table)
+        return features
+    
+    def refresh_skill_ids(self, skill_table: SkillSimilarityTable):
+        """Re-resolve skill IDs after the table has grown."""
+        self.skill_ids = skill_table.ids(self.skill_names)
+        self.vocab_size = len(skill_table)
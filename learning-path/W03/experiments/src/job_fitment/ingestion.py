@@ -0,0 +1,260 @@
+"""
+Streaming job-posting ingestion for Job Fitment Agent.
+Reads postings from JSONL/CSV, normalizes skills and writes a columnar Parquet store.
+"""
+
+import csv
+import hashlib
+import json
+from dataclasses import fields
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+from .environment import EnvironmentConfig
+from .models import JobPosting
+from .skills import SkillSimilarityTable
+from .config import OUTPUT_DIR, TARGET_COMPANIES
+
+
+LIST_FIELDS = ("requirements", "preferred_skills", "education_requirements", "benefits")
+SKILL_FIELDS = ("requirements", "preferred_skills")
+
+
+def _split_list(value: Any) -> List[str]:
+    """Parse a list cell: JSON array, or a ';' / ',' separated string."""
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return [str(v).strip() for v in value if str(v).strip()]
+    
+    text = str(value).strip()
+    if not text:
+        return []
+    if text.startswith("["):
+        try:
+            return _split_list(json.loads(text))
+        except json.JSONDecodeError:
+            pass
+    separator = ";" if ";" in text else ","
+    return [part.strip() for part in text.split(separator) if part.strip()]
+
+
+class JobPostingIngestor:
+    """
+    Streams raw postings from JSONL or CSV files and normalizes them.
+    Skills are trimmed, de-duplicated and mapped to canonical names, so one
+    skill has one spelling across every posting an ingestor reads.
+    """
+    
+    def __init__(self, env: EnvironmentConfig, skill_table: Optional[SkillSimilarityTable] = None):
+        self.env = env
+        # An empty table still resolves aliases such as k8s -> Kubernetes
+        self.skill_table = skill_table if skill_table is not None else SkillSimilarityTable(env)
+        self.company_priorities = {c.name.lower(): c.priority for c in TARGET_COMPANIES}
+        self.skipped = 0
+        # Normalized skill -> spelling used for it (alias targets, else the first one seen)
+        self.spellings: Dict[str, str] = {
+            self.skill_table.normalize(name): name for name in self.skill_table.aliases.values()
+        }
+    
+    def read(self, path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+        """Yield raw records one at a time from a .jsonl/.json-lines or .csv file."""
+        path = Path(path)
+        if path.suffix.lower() == ".csv":
+            with open(path, newline='', encoding='utf-8') as f:
+                yield from csv.DictReader(f)
+        else:
+            with open(path, encoding='utf-8') as f:
+                for line_no, line in enumerate(f, 1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        print(f"   ⚠️  Skipping malformed JSON on line {line_no} of {path.name}")
+                        self.skipped += 1
+    
+    def canonical_skill(self, skill: str) -> str:
+        """
+        Single spelling for a skill: the skill table's vocabulary name, else an
+        alias target, else the first spelling this ingestor saw (python/Python -> one value).
+        """
+        name = self.skill_table.canonical(skill)
+        skill_id = self.skill_table.skill_id(name)
+        if skill_id is not None:
+            return self.skill_table.skills[skill_id]
+        return self.spellings.setdefault(self.skill_table.normalize(name), name)
+    
+    def normalize_skills(self, skills: Iterable[str]) -> List[str]:
+        """Canonicalize and de-duplicate skills, preserving order."""
+        normalized, seen = [], set()
+        for skill in skills:
+            name = self.canonical_skill(skill)
+            if name and name not in seen:
+                seen.add(name)
+                normalized.append(name)
+        return normalized
+    
+    def normalize(self, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Map a raw record onto JobPosting fields, or None if it is unusable."""
+        title = str(record.get("title") or "").strip()
+        company = str(record.get("company") or "").strip()
+        if not title or not company:
+            self.skipped += 1
+            return None
+        
+        posting = {}
+        for f in fields(JobPosting):
+            value = record.get(f.name)
+            if f.name in LIST_FIELDS:
+                posting[f.name] = _split_list(value)
+            elif value is not None:
+                posting[f.name] = str(value).strip()
+        
+        posting["title"], posting["company"] = title, company
+        for name in SKILL_FIELDS:
+            posting[name] = self.normalize_skills(posting[name])
+        
+        if not posting.get("job_id"):
+            key = f"{company}|{title}|{posting.get('location', '')}|{posting.get('url', '')}"
+            posting["job_id"] = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+        
+        try:
+            priority = int(record.get("company_priority") or 0)
+        except (TypeError, ValueError):
+            priority = 0
+        posting["company_priority"] = priority or self.company_priorities.get(company.lower(), 3)
+        posting.setdefault("experience_level", "Entry")
+        posting.setdefault("job_type", "Full-time")
+        return posting
+    
+    def stream(self, paths: Union[str, Path, Iterable[Union[str, Path]]]) -> Iterator[Dict[str, Any]]:
+        """Yield normalized posting dicts from one or more files."""
+        if isinstance(paths, (str, Path)):
+            paths = [paths]
+        for path in paths:
+            for record in self.read(path):
+                posting = self.normalize(record)
+                if posting is not None:
+                    yield posting
+
+
+class JobPostingStore:
+    """
+    Columnar on-disk store of job postings (Parquet, one row group per batch).
+    Companies, locations and skills are dictionary-encoded; reads are lazy batches.
+    """
+    
+    BATCH_SIZE = 10_000
+    DEFAULT_FILENAME = "postings.parquet"
+    
+    def __init__(self, env: EnvironmentConfig, path: Optional[Union[str, Path]] = None):
+        self.env = env
+        self.path = Path(path) if path else OUTPUT_DIR / self.DEFAULT_FILENAME
+    
+    def _require_pyarrow(self):
+        if self.env.pa is None or self.env.pq is None:
+            raise RuntimeError("pyarrow not available. Install with: pip install pyarrow")
+    
+    @property
+    def schema(self):
+        """Arrow schema mirroring JobPosting, with dictionary-encoded categorical columns."""
+        self._require_pyarrow()
+        pa = self.env.pa
+        category = pa.dictionary(pa.int32(), pa.string())
+        return pa.schema([
+            ("job_id", pa.string()),
+            ("title", pa.string()),
+            ("company", category),
+            ("company_priority", pa.int8()),
+            ("location", category),
+            ("job_type", category),
+            ("description", pa.string()),
+            ("requirements", pa.list_(category)),
+            ("preferred_skills", pa.list_(category)),
+            ("experience_level", category),
+            ("education_requirements", pa.list_(pa.string())),
+            ("salary_range", pa.string()),
+            ("benefits", pa.list_(pa.string())),
+            ("posted_date", pa.string()),
+            ("url", pa.string()),
+        ])
+    
+    def write(self, postings: Iterable[Dict[str, Any]], batch_size: Optional[int] = None) -> int:
+        """Write postings in row groups of batch_size; only one batch is held in memory."""
+        self._require_pyarrow()
+        batch_size = batch_size or self.BATCH_SIZE
+        schema = self.schema
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        
+        def to_batch(rows: List[Dict[str, Any]]):
+            columns = {}
+            for field in schema:
+                default = [] if field.name in LIST_FIELDS else ("" if field.name != "company_priority" else 3)
+                columns[field.name] = [row.get(field.name, default) for row in rows]
+            return self.env.pa.RecordBatch.from_pydict(columns, schema=schema)
+        
+        total = 0
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with self.env.pq.ParquetWriter(str(tmp_path), schema, compression="zstd") as writer:
+            rows = []
+            for posting in postings:
+                rows.append(posting)
+                if len(rows) >= batch_size:
+                    writer.write_batch(to_batch(rows))
+                    total += len(rows)
+                    rows = []
+            if rows:
+                writer.write_batch(to_batch(rows))
+                total += len(rows)
+        tmp_path.replace(self.path)
+        
+        print(f"✅ Saved: {self.path} ({total} postings)")
+        return total
+    
+    def ingest(
+        self,
+        paths: Union[str, Path, Iterable[Union[str, Path]]],
+        skill_table: Optional[SkillSimilarityTable] = None,
+        batch_size: Optional[int] = None
+    ) -> int:
+        """Stream raw JSONL/CSV files straight into the store."""
+        print("📥 Ingesting job postings...")
+        ingestor = JobPostingIngestor(self.env, skill_table)
+        total = self.write(ingestor.stream(paths), batch_size)
+        if ingestor.skipped:
+            print(f"   ⚠️  Skipped {ingestor.skipped} invalid records")
+        return total
+    
+    @property
+    def num_rows(self) -> int:
+        self._require_pyarrow()
+        return self.env.pq.ParquetFile(str(self.path)).metadata.num_rows
+    
+    def iter_batches(self, batch_size: Optional[int] = None, columns: Optional[List[str]] = None):
+        """Yield Arrow RecordBatches, reading one row group at a time."""
+        self._require_pyarrow()
+        batch_size = batch_size or self.BATCH_SIZE
+        parquet_file = self.env.pq.ParquetFile(str(self.path))
+        for i in range(parquet_file.num_row_groups):
+            table = parquet_file.read_row_group(i, columns=columns)
+            yield from table.to_batches(max_chunksize=batch_size)
+    
+    @staticmethod
+    def batch_skills(batch) -> List[str]:
+        """Distinct skills of a batch, read from the dictionaries rather than every row."""
+        skills = set()
+        for name in SKILL_FIELDS:
+            if name in batch.schema.names:
+                skills.update(s for s in batch.column(name).values.dictionary.to_pylist() if s)
+        return sorted(skills)
+    
+    @staticmethod
+    def to_postings(batch) -> List[JobPosting]:
+        """Materialize one RecordBatch as JobPosting objects."""
+        return [JobPosting(**row) for row in batch.to_pylist()]
+    
+    def iter_postings(self, batch_size: Optional[int] = None) -> Iterator[List[JobPosting]]:
+        """Yield lists of JobPosting objects, one list per batch."""
+        for batch in self.iter_batches(batch_size):
+            yield self.to_postings(batch)
@@ -1,7 +1,9 @@
 import json
-from typing import List, Dict, Any
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Union
 from .environment import EnvironmentConfig
 from .config import OUTPUT_DIR
+from .artifacts import ARTIFACT_DIR, ArtifactManifest, atomic_write, content_hash
 
 class KnowledgeBaseGenerator:
     """
@@ -9,9 +11,14 @@ class KnowledgeBaseGenerator:
     Creates Q&A pairs, skill mappings, and company information.
     """
     
+    # Bump whenever a Q&A template changes so cached knowledge bases are regenerated
+    TEMPLATE_VERSION = 1
+    
     def __init__(self, env: EnvironmentConfig):
         self.env = env
         self.knowledge_base = []
+        self.content_key: Optional[str] = None
+        self.stats = {'cache_hits': 0, 'cache_misses': 0}
         
         # Skill categories
         self.skill_categories = {
@@ -48,6 +55,22 @@ class KnowledgeBaseGenerator:
             "Senior": {"years": (5, 10), "keywords": ["senior", "lead", "staff", "principal"]},
             "Executive": {"years": (10, 20), "keywords": ["director", "vp", "head", "chief"]}
         }
+        
+        # Company focus areas and culture
+        self.company_info = {
+            "Google": {"focus": "Search, AI, Cloud", "culture": "Innovation-driven, data-focused"},
+            "Amazon": {"focus": "E-commerce, AWS, AI", "culture": "Customer obsession, bias for action"},
+            "Apple": {"focus": "Consumer electronics, Software", "culture": "Design excellence, privacy-focused"},
+            "Microsoft": {"focus": "Cloud, Enterprise, Gaming", "culture": "Growth mindset, inclusive"},
+            "Meta": {"focus": "Social media, VR/AR, AI", "culture": "Move fast, be bold"},
+            "Tesla": {"focus": "EVs, Clean energy, AI", "culture": "Mission-driven, intense"},
+            "Cisco": {"focus": "Networking, Security, Collaboration", "culture": "Inclusive, tech-forward"},
+            "SAP": {"focus": "Enterprise software, Cloud", "culture": "Customer success, innovation"},
+            "NVIDIA": {"focus": "GPUs, AI hardware, Gaming", "culture": "Engineering excellence"},
+            "Intel": {"focus": "Semiconductors, Computing", "culture": "Technology leadership"},
+            "Netflix": {"focus": "Streaming, Content", "culture": "Freedom and responsibility"},
+            "IBM": {"focus": "Enterprise AI, Cloud, Consulting", "culture": "Trust, transformation"}
+        }
     
     def generate_skill_qa_pairs(self) -> List[Dict[str, Any]]:
         """Generate Q&A pairs for skill-related queries."""
@@ -80,22 +103,7 @@ class KnowledgeBaseGenerator:
         """Generate Q&A pairs for company-related queries."""
         qa_pairs = []
         
-        company_info = {
-            "Google": {"focus": "Search, AI, Cloud", "culture": "Innovation-driven, data-focused"},
-            "Amazon": {"focus": "E-commerce, AWS, AI", "culture": "Customer obsession, bias for action"},
-            "Apple": {"focus": "Consumer electronics, Software", "culture": "Design excellence, privacy-focused"},
-            "Microsoft": {"focus": "Cloud, Enterprise, Gaming", "culture": "Growth mindset, inclusive"},
-            "Meta": {"focus": "Social media, VR/AR, AI", "culture": "Move fast, be bold"},
-            "Tesla": {"focus": "EVs, Clean energy, AI", "culture": "Mission-driven, intense"},
-            "Cisco": {"focus": "Networking, Security, Collaboration", "culture": "Inclusive, tech-forward"},
-            "SAP": {"focus": "Enterprise software, Cloud", "culture": "Customer success, innovation"},
-            "NVIDIA": {"focus": "GPUs, AI hardware, Gaming", "culture": "Engineering excellence"},
-            "Intel": {"focus": "Semiconductors, Computing", "culture": "Technology leadership"},
-            "Netflix": {"focus": "Streaming, Content", "culture": "Freedom and responsibility"},
-            "IBM": {"focus": "Enterprise AI, Cloud, Consulting", "culture": "Trust, transformation"}
-        }
-        
-        for company, info in company_info.items():
+        for company, info in self.company_info.items():
             qa_pairs.append({
                 "question": f"What does {company} focus on?",
                 "answer": f"{company} focuses on {info['focus']}. Their culture is characterized by {info['culture']}.",
@@ -166,28 +174,64 @@ class KnowledgeBaseGenerator:
             }
         ]
     
+    def content_hash(self) -> str:
+        """Hash of everything the knowledge base is generated from."""
+        return content_hash(self.TEMPLATE_VERSION, self.skill_categories, self.company_info)
+    
     def generate_full_knowledge_base(self) -> List[Dict[str, Any]]:
         """Generate complete knowledge base."""
         print("📚 Generating Knowledge Base...")
         
-        self.knowledge_base = []
-        self.knowledge_base.extend(self.generate_skill_qa_pairs())
-        self.knowledge_base.extend(self.generate_company_qa_pairs())
-        self.knowledge_base.extend(self.generate_fitment_qa_pairs())
-        self.knowledge_base.extend(self.generate_unanswerable_qa_pairs())
+        skill_pairs = self.generate_skill_qa_pairs()
+        company_pairs = self.generate_company_qa_pairs()
+        fitment_pairs = self.generate_fitment_qa_pairs()
+        
+        self.knowledge_base = skill_pairs + company_pairs + fitment_pairs + self.generate_unanswerable_qa_pairs()
+        self.content_key = self.content_hash()
         
         print(f"   ✅ Generated {len(self.knowledge_base)} Q&A pairs")
-        print(f"   • Skill Q&A: {len(self.generate_skill_qa_pairs())} pairs")
-        print(f"   • Company Q&A: {len(self.generate_company_qa_pairs())} pairs")
-        print(f"   • Fitment Q&A: {len(self.generate_fitment_qa_pairs())} pairs")
+        print(f"   • Skill Q&A: {len(skill_pairs)} pairs")
+        print(f"   • Company Q&A: {len(company_pairs)} pairs")
+        print(f"   • Fitment Q&A: {len(fitment_pairs)} pairs")
+        
+        return self.knowledge_base
+    
+    def load_or_generate(self, cache_dir: Optional[Union[str, Path]] = None) -> List[Dict[str, Any]]:
+        """
+        Reuse the cached knowledge base for the current content hash,
+        generating and caching it only when the inputs changed.
+        """
+        key = self.content_hash()
+        path = Path(cache_dir or ARTIFACT_DIR) / f"knowledge_base-{key}.json"
         
+        if path.exists():
+            with open(path) as f:
+                self.knowledge_base = json.load(f)
+            self.content_key = key
+            self.stats['cache_hits'] += 1
+            print(f"📚 Loaded cached knowledge base: {len(self.knowledge_base)} Q&A pairs ({key})")
+            return self.knowledge_base
+        
+        self.stats['cache_misses'] += 1
+        self.generate_full_knowledge_base()
+        
+        def write(p: Path):
+            with open(p, 'w') as f:
+                json.dump(self.knowledge_base, f)
+        
+        atomic_write(path, write)
         return self.knowledge_base
     
     def save_knowledge_base(self, filename: str = "knowledge_base.json") -> str:
-        """Save knowledge base to JSON file."""
+        """Save knowledge base to JSON file (skipped when it is already current)."""
         filepath = OUTPUT_DIR / filename
+        manifest = ArtifactManifest(OUTPUT_DIR)
+        if manifest.is_current(filepath, self.content_key):
+            print(f"✅ Up to date: {filepath}")
+            return str(filepath)
+        
         with open(filepath, 'w') as f:
             json.dump(self.knowledge_base, f, indent=2)
+        manifest.record(filepath, self.content_key)
         print(f"✅ Saved: {filepath}")
         return str(filepath)
-
@@ -0,0 +1,104 @@
+"""
+Sparse BM25 retrieval for Job Fitment Agent.
+Keeps exact skill tokens ("C#", ".NET", "node.js") that dense embeddings blur,
+and fuses sparse and dense rankings with reciprocal-rank fusion.
+"""
+
+import heapq
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+
+# Tokens keep the symbols that distinguish skills: c, c#, c++, .net, node.js
+TOKEN_PATTERN = re.compile(r"\.?[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "best", "by", "can", "do", "for",
+    "from", "how", "i", "if", "in", "is", "it", "learn", "me", "my", "of", "on",
+    "or", "should", "the", "to", "what", "when", "which", "with", "you", "your",
+})
+RRF_K = 60      # rank offset from the original RRF paper
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase BM25 terms of a text, stopwords removed."""
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOPWORDS]
+
+
+def reciprocal_rank_fusion(rankings: Iterable[Sequence[int]], k: int = RRF_K) -> List[Tuple[int, float]]:
+    """Fuse ranked ID lists into (id, score) pairs, best first; score = sum of 1/(k + rank)."""
+    scores: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, 1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+
+class BM25Index:
+    """
+    Inverted index with Okapi BM25 scoring, keyed by the vector store's document IDs.
+    Documents can be added and removed incrementally alongside the FAISS index.
+    """
+    
+    K1 = 1.5
+    B = 0.75
+    
+    def __init__(self, k1: float = K1, b: float = B):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[int, int]] = {}   # term -> {doc ID: term frequency}
+        self.doc_terms: Dict[int, Counter] = {}
+        self.doc_lengths: Dict[int, int] = {}
+        self.total_length = 0
+    
+    def __len__(self) -> int:
+        return len(self.doc_terms)
+    
+    def __contains__(self, term: str) -> bool:
+        return term in self.postings
+    
+    def add(self, doc_id: int, text: str):
+        """Index a document, replacing any previous text under the same ID."""
+        if doc_id in self.doc_terms:
+            self.remove(doc_id)
+        terms = Counter(tokenize(text))
+        self.doc_terms[doc_id] = terms
+        self.doc_lengths[doc_id] = sum(terms.values())
+        self.total_length += self.doc_lengths[doc_id]
+        for term, tf in terms.items():
+            self.postings.setdefault(term, {})[doc_id] = tf
+    
+    def add_many(self, items: Iterable[Tuple[int, str]]):
+        for doc_id, text in items:
+            self.add(doc_id, text)
+    
+    def remove(self, doc_id: int):
+        terms = self.doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        self.total_length -= self.doc_lengths.pop(doc_id)
+        for term in terms:
+            docs = self.postings[term]
+            del docs[doc_id]
+            if not docs:
+                del self.postings[term]
+    
+    def search(self, terms: Sequence[str], top_k: int) -> List[Tuple[int, float]]:
+        """(doc ID, BM25 score) of the top_k documents containing any of the terms."""
+        n_docs = len(self.doc_terms)
+        if not n_docs or not terms:
+            return []
+        
+        avg_length = self.total_length / n_docs
+        scores: Dict[int, float] = {}
+        for term in set(terms):
+            docs = self.postings.get(term)
+            if not docs:
+                continue
+            idf = math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            for doc_id, tf in docs.items():
+                norm = tf + self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_id] / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / norm
+        
+        return heapq.nsmallest(top_k, scores.items(), key=lambda item: (-item[1], item[0]))
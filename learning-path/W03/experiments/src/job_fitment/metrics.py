@@ -0,0 +1,328 @@
+"""
+Timing spans, counters and exporters for Job Fitment Agent.
+Spans nest like a trace; exporters write JSON, a Prometheus textfile,
+or OTLP/HTTP JSON spans to a local OpenTelemetry collector.
+"""
+
+import json
+import os
+import re
+import time
+import urllib.request
+from collections import deque
+from contextvars import ContextVar
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Union
+from .artifacts import atomic_write
+
+_CURRENT_SPAN: ContextVar[Optional['_Span']] = ContextVar("job_fitment_span", default=None)
+_NULL_SPAN = nullcontext()
+
+
+class _Span:
+    """One timed block; traced spans are kept as records, the rest only aggregated."""
+    
+    __slots__ = ("metrics", "name", "trace", "attributes", "trace_id", "span_id",
+                 "parent_id", "start_ns", "start", "token")
+    
+    def __init__(self, metrics: 'Metrics', name: str, trace: bool, attributes: Dict[str, Any]):
+        self.metrics = metrics
+        self.name = name
+        self.trace = trace
+        self.attributes = attributes
+    
+    def __enter__(self) -> '_Span':
+        if self.trace:
+            parent = _CURRENT_SPAN.get()
+            self.parent_id = parent.span_id if parent is not None else None
+            self.trace_id = parent.trace_id if parent is not None else os.urandom(16).hex()
+            self.span_id = os.urandom(8).hex()
+            self.start_ns = time.time_ns()
+            self.token = _CURRENT_SPAN.set(self)
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.start
+        self.metrics.observe(self.name, seconds)
+        if self.trace:
+            _CURRENT_SPAN.reset(self.token)
+            if exc_type is not None:
+                self.attributes['error'] = exc_type.__name__
+            self.metrics.record_span({
+                'name': self.name,
+                'trace_id': self.trace_id,
+                'span_id': self.span_id,
+                'parent_id': self.parent_id,
+                'start_ns': self.start_ns,
+                'end_ns': self.start_ns + int(seconds * 1e9),
+                'attributes': self.attributes,
+            })
+        return False
+
+
+class Metrics:
+    """
+    Pluggable metrics surface: span() times a block, increment() bumps a counter
+    and register() exposes a component's own stats dict as counters.
+    A disabled instance costs one attribute check per span.
+    """
+    
+    MAX_SPANS = 10_000      # most recent traced span records kept for export (timings are always aggregated)
+    
+    def __init__(
+        self,
+        enabled: bool = True,
+        service_name: str = "job_fitment",
+        exporters: Optional[List[Any]] = None
+    ):
+        self.enabled = enabled
+        self.service_name = service_name
+        self.exporters = list(exporters or [])
+        self.timings: Dict[str, List[float]] = {}   # span name -> [count, total seconds, max seconds]
+        self.counters: Dict[str, float] = {}
+        self.sources: Dict[str, Dict[str, float]] = {}
+        self.spans: Deque[Dict[str, Any]] = deque(maxlen=self.MAX_SPANS)
+        self.spans_recorded = 0     # including spans evicted or cleared by reset()
+        self.dropped_spans = 0      # evicted before reset() by newer spans
+    
+    def span(self, name: str, trace: bool = True, **attributes):
+        """
+        Context manager timing a block. Use trace=False for hot per-item blocks:
+        they are aggregated into timings but not kept as individual spans.
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, trace, attributes)
+    
+    def observe(self, name: str, seconds: float):
+        timing = self.timings.get(name)
+        if timing is None:
+            self.timings[name] = [1, seconds, seconds]
+        else:
+            timing[0] += 1
+            timing[1] += seconds
+            if seconds > timing[2]:
+                timing[2] = seconds
+    
+    def record_span(self, record: Dict[str, Any]):
+        # A full ring buffer evicts its oldest span
+        if len(self.spans) == self.spans.maxlen:
+            self.dropped_spans += 1
+        self.spans.append(record)
+        self.spans_recorded += 1
+    
+    def increment(self, name: str, value: float = 1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + value
+    
+    def register(self, prefix: str, stats: Dict[str, float]):
+        """Export a component's live stats dict as counters named prefix.key."""
+        self.sources[prefix] = stats
+    
+    def counter_values(self) -> Dict[str, float]:
+        values = dict(self.counters)
+        for prefix, stats in self.sources.items():
+            for key, value in stats.items():
+                # Counters merged from workers add to the live component stats
+                name = f"{prefix}.{key}"
+                values[name] = values.get(name, 0) + value
+        return values
+    
+    def snapshot(self, since: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """
+        Timings, counters and traced spans as plain JSON-serializable data.
+        With since (an earlier counter_values()), counters are the change since then.
+        """
+        counters = self.counter_values()
+        if since is not None:
+            counters = {name: value - since.get(name, 0) for name, value in counters.items()
+                        if value != since.get(name, 0)}
+        return {
+            'service': self.service_name,
+            'timings': {
+                name: {'count': count, 'total_s': round(total, 6), 'mean_ms': round(1000 * total / count, 4),
+                       'max_ms': round(1000 * peak, 4)}
+                for name, (count, total, peak) in self.timings.items()
+            },
+            'counters': counters,
+            'spans': list(self.spans),
+            'dropped_spans': self.dropped_spans,
+        }
+    
+    def merge(self, snapshot: Dict[str, Any]):
+        """Add a snapshot from another process (e.g. a forked analyze_many() worker) into this one."""
+        for name, timing in snapshot['timings'].items():
+            count, total, peak = timing['count'], timing['total_s'], timing['max_ms'] / 1000
+            current = self.timings.get(name)
+            if current is None:
+                self.timings[name] = [count, total, peak]
+            else:
+                current[0] += count
+                current[1] += total
+                current[2] = max(current[2], peak)
+        for name, value in snapshot['counters'].items():
+            self.counters[name] = self.counters.get(name, 0) + value
+        for record in snapshot['spans']:
+            self.record_span(record)
+        self.dropped_spans += snapshot.get('dropped_spans', 0)
+    
+    def reset(self, counters: bool = True):
+        """Clear timings, spans and (unless counters=False) counters."""
+        self.timings.clear()
+        if counters:
+            self.counters.clear()
+        self.spans.clear()
+        self.dropped_spans = 0
+    
+    def export(self):
+        """Run every configured exporter."""
+        for exporter in self.exporters:
+            exporter.export(self)
+    
+    def print_summary(self, limit: int = 15):
+        """Print the slowest spans by total time."""
+        print("\n⏱️  Timings (by total time)")
+        print("-" * 72)
+        print(f"{'Span':<40}{'Count':>8}{'Total':>12}{'Mean':>12}")
+        ranked = sorted(self.timings.items(), key=lambda item: -item[1][1])
+        for name, (count, total, _) in ranked[:limit]:
+            print(f"{name[:39]:<40}{count:>8}{total:>11.3f}s{1000 * total / count:>10.3f}ms")
+        counters = self.counter_values()
+        if counters:
+            print("\n🔢 Counters")
+            for name, value in sorted(counters.items()):
+                print(f"   {name}: {value:g}")
+
+
+class JSONExporter:
+    """Writes Metrics.snapshot() to a JSON file."""
+    
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+    
+    def export(self, metrics: Metrics):
+        def write(p: Path):
+            with open(p, 'w') as f:
+                json.dump(metrics.snapshot(), f, indent=2)
+        
+        atomic_write(self.path, write)
+        print(f"✅ Saved metrics: {self.path}")
+
+
+class PrometheusTextfileExporter:
+    """
+    Writes counters and span timings in the Prometheus text format, for the
+    node_exporter textfile collector (written atomically, as it requires).
+    """
+    
+    def __init__(self, path: Union[str, Path], prefix: str = "job_fitment"):
+        self.path = Path(path)
+        self.prefix = prefix
+    
+    @staticmethod
+    def _name(name: str) -> str:
+        return re.sub(r'[^a-zA-Z0-9_]', '_', name)
+    
+    @staticmethod
+    def _label(value: str) -> str:
+        return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    
+    def render(self, metrics: Metrics) -> str:
+        lines = []
+        for name, value in sorted(metrics.counter_values().items()):
+            metric = f"{self.prefix}_{self._name(name)}_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value:g}"]
+        
+        span_metrics = (
+            ("span_seconds_total", "counter", 1), ("span_count_total", "counter", 0),
+            ("span_seconds_max", "gauge", 2),
+        )
+        for suffix, kind, column in span_metrics:
+            metric = f"{self.prefix}_{suffix}"
+            lines.append(f"# TYPE {metric} {kind}")
+            for name, timing in sorted(metrics.timings.items()):
+                lines.append(f'{metric}{{span="{self._label(name)}"}} {timing[column]:g}')
+        return "\n".join(lines) + "\n"
+    
+    def export(self, metrics: Metrics):
+        text = self.render(metrics)
+        
+        def write(p: Path):
+            with open(p, 'w') as f:
+                f.write(text)
+        
+        atomic_write(self.path, write)
+        print(f"✅ Saved metrics: {self.path}")
+
+
+class OTLPSpanExporter:
+    """
+    Posts traced spans as OTLP/HTTP JSON to an OpenTelemetry collector
+    (default: a local collector on port 4318). Stdlib only; spans already
+    sent are not sent again. A collector that is down only logs a warning.
+    """
+    
+    ENDPOINT = "http://localhost:4318/v1/traces"
+    TIMEOUT_S = 5.0
+    
+    def __init__(self, endpoint: Optional[str] = None, timeout: Optional[float] = None):
+        self.endpoint = endpoint or self.ENDPOINT
+        self.timeout = timeout if timeout is not None else self.TIMEOUT_S
+        self.sent = 0
+    
+    @staticmethod
+    def _attribute(key: str, value: Any) -> Dict[str, Any]:
+        if isinstance(value, bool):
+            return {'key': key, 'value': {'boolValue': value}}
+        if isinstance(value, int):
+            return {'key': key, 'value': {'intValue': str(value)}}
+        if isinstance(value, float):
+            return {'key': key, 'value': {'doubleValue': value}}
+        return {'key': key, 'value': {'stringValue': str(value)}}
+    
+    def payload(self, metrics: Metrics, spans: List[Dict[str, Any]]) -> Dict[str, Any]:
+        otlp_spans = []
+        for span in spans:
+            otlp_span = {
+                'traceId': span['trace_id'],
+                'spanId': span['span_id'],
+                'name': span['name'],
+                'kind': 1,  # SPAN_KIND_INTERNAL
+                'startTimeUnixNano': str(span['start_ns']),
+                'endTimeUnixNano': str(span['end_ns']),
+                'attributes': [self._attribute(k, v) for k, v in span['attributes'].items()],
+            }
+            if span['parent_id']:
+                otlp_span['parentSpanId'] = span['parent_id']
+            if 'error' in span['attributes']:
+                otlp_span['status'] = {'code': 2}  # STATUS_CODE_ERROR
+            otlp_spans.append(otlp_span)
+        
+        return {'resourceSpans': [{
+            'resource': {'attributes': [self._attribute('service.name', metrics.service_name)]},
+            'scopeSpans': [{'scope': {'name': 'job_fitment'}, 'spans': otlp_spans}],
+        }]}
+    
+    def export(self, metrics: Metrics):
+        # metrics.spans holds the most recent records; skip those already sent
+        first = metrics.spans_recorded - len(metrics.spans)
+        spans = list(metrics.spans)[max(self.sent - first, 0):]
+        if not spans:
+            return
+        
+        request = urllib.request.Request(
+            self.endpoint,
+            data=json.dumps(self.payload(metrics, spans)).encode('utf-8'),
+            headers={'Content-Type': 'application/json'},
+            method='POST'
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+        except OSError as e:
+            print(f"⚠️  OTLP export to {self.endpoint} failed: {e}")
+            return
+        self.sent = metrics.spans_recorded
+        print(f"✅ Exported {len(spans)} spans to {self.endpoint}")
@@ -2,11 +2,13 @@
 Data models for Job Fitment Agent.
 """
 
-from dataclasses import dataclass, field
-from typing import List, Dict, Any
+import sys
+from array import array
+from dataclasses import KW_ONLY, dataclass, field
+from typing import Iterable, Iterator, List, Dict, Any, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class StudentProfile:
     """Student profile for job fitment analysis."""
     name: str
@@ -47,7 +49,7 @@ class StudentProfile:
         return " | ".join(parts)
 
 
-@dataclass
+@dataclass(slots=True)
 class JobPosting:
     """Job posting data model."""
     job_id: str
@@ -66,6 +68,13 @@ class JobPosting:
     posted_date: str = ""
     url: str = ""
     
+    def __post_init__(self):
+        # Postings repeat the same companies and skills; share one string object each
+        self.company = sys.intern(self.company)
+        self.location = sys.intern(self.location)
+        self.requirements = [sys.intern(s) for s in self.requirements]
+        self.preferred_skills = [sys.intern(s) for s in self.preferred_skills]
+    
     def to_text(self) -> str:
         """Convert job posting to searchable text."""
         parts = [
@@ -88,9 +97,16 @@ class JobPosting:
         return " | ".join(parts)
 
 
-@dataclass
+@dataclass(slots=True)
 class FitmentResult:
-    """Job fitment analysis result."""
+    """
+    Job fitment analysis result.
+    
+    Fields after location_match are keyword-only. The markdown analysis is read
+    through detailed_analysis, which renders it with render_detailed_analysis()
+    on first access and keeps it in analysis_text (pass analysis_text= to
+    supply a precomputed one).
+    """
     job: JobPosting
     fitment_score: float  # 0-100
     skill_matches: List[str]
@@ -98,12 +114,180 @@ class FitmentResult:
     experience_match: float  # 0-100
     education_match: float  # 0-100
     location_match: bool
-    detailed_analysis: str
+    _: KW_ONLY
     recommendations: List[str]
     priority_level: int
+    skill_score: float = 0.0  # 0-100
+    location_score: float = 0.0  # 0-100
+    profile_name: str = ""
+    analysis_text: Optional[str] = field(default=None, repr=False, compare=False)
+    
+    @property
+    def detailed_analysis(self) -> str:
+        """Markdown analysis, rendered on first access only."""
+        if self.analysis_text is None:
+            self.analysis_text = self.render_detailed_analysis()
+        return self.analysis_text
+    
+    @detailed_analysis.setter
+    def detailed_analysis(self, value: str):
+        self.analysis_text = value
+    
+    def render_detailed_analysis(self) -> str:
+        """Generate detailed analysis text."""
+        job = self.job
+        analysis_parts = [
+            f"## Fitment Analysis: {self.profile_name} → {job.title} at {job.company}",
+            f"\n### Score Breakdown:",
+            f"- Skills Match: {self.skill_score:.1f}% (Weight: 40%)",
+            f"- Experience Match: {self.experience_match:.1f}% (Weight: 25%)",
+            f"- Education Match: {self.education_match:.1f}% (Weight: 20%)",
+            f"- Location Match: {self.location_score:.1f}% (Weight: 10%)",
+            f"\n### Matched Skills ({len(self.skill_matches)}):",
+            f"{', '.join(self.skill_matches) if self.skill_matches else 'None identified'}",
+            f"\n### Skill Gaps ({len(self.skill_gaps)}):",
+            f"{', '.join(self.skill_gaps) if self.skill_gaps else 'No critical gaps'}",
+        ]
+        
+        # Add priority-specific details
+        if job.company_priority == 1:
+            analysis_parts.extend([
+                f"\n### Priority 1 Company - Detailed Insights:",
+                f"- {job.company} is in your highest priority list",
+                f"- Recommend dedicating extra preparation time",
+                f"- Consider reaching out to employees for referrals"
+            ])
+        
+        return "\n".join(analysis_parts)
+
+
+class StringPool:
+    """Interns strings to dense int IDs so a batch stores each distinct string once."""
+    
+    __slots__ = ("strings", "ids")
+    
+    def __init__(self):
+        self.strings: List[str] = []
+        self.ids: Dict[str, int] = {}
+    
+    def intern(self, value: str) -> int:
+        """ID for a string, adding it on first sight."""
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = self.ids[value] = len(self.strings)
+            self.strings.append(value)
+        return string_id
+    
+    def decode(self, ids: Iterable[int]) -> List[str]:
+        return [self.strings[i] for i in ids]
+    
+    def __len__(self) -> int:
+        return len(self.strings)
+
+
+class FitmentResultBatch:
+    """
+    Struct-of-arrays container for bulk fitment results.
+    Scores live in typed arrays; skills and recommendations are pooled string IDs
+    with CSR offsets. Indexing materializes a FitmentResult on demand.
+    """
+    
+    __slots__ = (
+        "profile_name", "jobs",
+        "fitment_score", "skill_score", "experience_match", "education_match",
+        "location_score", "location_match", "priority_level",
+        "skills", "texts",
+        "match_ids", "match_offsets", "gap_ids", "gap_offsets", "rec_ids", "rec_offsets",
+    )
+    
+    def __init__(self, profile_name: str = ""):
+        self.profile_name = profile_name
+        self.jobs: List[JobPosting] = []
+        self.fitment_score = array('d')
+        self.skill_score = array('d')
+        self.experience_match = array('d')
+        self.education_match = array('d')
+        self.location_score = array('d')
+        self.location_match = array('b')
+        self.priority_level = array('b')
+        self.skills = StringPool()
+        self.texts = StringPool()
+        self.match_ids, self.match_offsets = array('i'), array('q', [0])
+        self.gap_ids, self.gap_offsets = array('i'), array('q', [0])
+        self.rec_ids, self.rec_offsets = array('i'), array('q', [0])
+    
+    @classmethod
+    def from_results(cls, results: Iterable[FitmentResult], profile_name: str = "") -> 'FitmentResultBatch':
+        """Build a batch, consuming results one at a time (generators stay lazy)."""
+        batch = cls(profile_name)
+        batch.extend(results)
+        return batch
+    
+    def append(self, result: FitmentResult):
+        """Add one result; its detailed analysis text is not kept."""
+        if not self.profile_name:
+            self.profile_name = result.profile_name
+        self.jobs.append(result.job)
+        self.fitment_score.append(result.fitment_score)
+        self.skill_score.append(result.skill_score)
+        self.experience_match.append(result.experience_match)
+        self.education_match.append(result.education_match)
+        self.location_score.append(result.location_score)
+        self.location_match.append(bool(result.location_match))
+        self.priority_level.append(result.priority_level)
+        
+        self.match_ids.extend(self.skills.intern(s) for s in result.skill_matches)
+        self.match_offsets.append(len(self.match_ids))
+        self.gap_ids.extend(self.skills.intern(s) for s in result.skill_gaps)
+        self.gap_offsets.append(len(self.gap_ids))
+        self.rec_ids.extend(self.texts.intern(r) for r in result.recommendations)
+        self.rec_offsets.append(len(self.rec_ids))
+    
+    def extend(self, results: Iterable[FitmentResult]):
+        for result in results:
+            self.append(result)
+    
+    def __len__(self) -> int:
+        return len(self.jobs)
+    
+    def __getitem__(self, index: int) -> FitmentResult:
+        """Materialize the result at an index."""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("FitmentResultBatch index out of range")
+        
+        def row(ids: array, offsets: array, pool: StringPool) -> List[str]:
+            return pool.decode(ids[offsets[index]:offsets[index + 1]])
+        
+        return FitmentResult(
+            job=self.jobs[index],
+            fitment_score=self.fitment_score[index],
+            skill_matches=row(self.match_ids, self.match_offsets, self.skills),
+            skill_gaps=row(self.gap_ids, self.gap_offsets, self.skills),
+            experience_match=self.experience_match[index],
+            education_match=self.education_match[index],
+            location_match=bool(self.location_match[index]),
+            recommendations=row(self.rec_ids, self.rec_offsets, self.texts),
+            priority_level=self.priority_level[index],
+            skill_score=self.skill_score[index],
+            location_score=self.location_score[index],
+            profile_name=self.profile_name,
+        )
+    
+    def __iter__(self) -> Iterator[FitmentResult]:
+        for index in range(len(self)):
+            yield self[index]
+    
+    def gap_counts(self) -> Dict[str, int]:
+        """How many results list each skill gap."""
+        counts = array('q', bytes(8 * len(self.skills)))
+        for skill_id in self.gap_ids:
+            counts[skill_id] += 1
+        return {self.skills.strings[i]: c for i, c in enumerate(counts) if c}
 
 
-@dataclass
+@dataclass(slots=True)
 class CompanyConfig:
     """Company configuration for job searching."""
     name: str
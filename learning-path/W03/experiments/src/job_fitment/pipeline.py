@@ -1,10 +1,17 @@
-from datetime import datetime
-from typing import List, Dict, Any
+from collections.abc import Sequence
+from itertools import chain
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 from .environment import EnvironmentConfig
 from .models import StudentProfile, JobPosting, FitmentResult
 from .prompts import JobFitmentPromptEngineer
 from .vector_db import JobFitmentVectorDB
 from .analyzer import JobFitmentAnalyzer
+from .features import ProfileFeatures
+from .ingestion import JobPostingStore
+from .scorer import RankingSummary, TopKRanker
+from .reports import FitmentReportRenderer
+from .lexical import tokenize
+from .metrics import Metrics
 from .config import OUTPUT_DIR
 
 class JobFitmentRAGPipeline:
@@ -13,21 +20,53 @@ class JobFitmentRAGPipeline:
     Combines retrieval, augmentation, and generation.
     """
     
+    RETRIEVAL_MODES = ("hybrid", "dense", "lexical")
+    
     def __init__(
         self,
         env: EnvironmentConfig,
         prompt_engineer: JobFitmentPromptEngineer,
         vector_db: JobFitmentVectorDB,
-        analyzer: JobFitmentAnalyzer
+        analyzer: JobFitmentAnalyzer,
+        retrieval: str = "hybrid",
+        metrics: Optional[Metrics] = None
     ):
+        if retrieval not in self.RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode '{retrieval}'. Choose from {self.RETRIEVAL_MODES}")
         self.env = env
         self.prompt_engineer = prompt_engineer
         self.vector_db = vector_db
         self.analyzer = analyzer
+        self.retrieval = retrieval
+        self.metrics = metrics if metrics is not None else analyzer.metrics
+        self.report_renderer = FitmentReportRenderer(env)
+        self._skill_terms = frozenset()
+        self._skill_terms_size = None
+    
+    def skill_terms(self) -> frozenset:
+        """BM25 terms of every known skill and alias (rebuilt when the skill table grows)."""
+        table = self.analyzer.skill_table if self.analyzer is not None else None
+        if table is None:
+            return frozenset()
+        size = (len(table), len(table.aliases))
+        if size != self._skill_terms_size:
+            self._skill_terms = frozenset(
+                term for name in chain(table.skills, table.aliases) for term in tokenize(name)
+            )
+            self._skill_terms_size = size
+        return self._skill_terms
     
     def retrieve_context(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
-        """Retrieve relevant context from knowledge base."""
-        return self.vector_db.search(query, top_k)
+        """
+        Retrieve relevant context from knowledge base.
+        Hybrid mode fuses BM25 and dense results; queries made only of skill
+        names are answered by BM25 alone, without running the encoder.
+        """
+        if self.retrieval == "dense":
+            return self.vector_db.search(query, top_k)
+        if self.retrieval == "lexical":
+            return self.vector_db.lexical_search(query, top_k)
+        return self.vector_db.hybrid_search(query, top_k, lexical_vocabulary=self.skill_terms())
     
     def format_context(self, retrieved_docs: List[Dict[str, Any]]) -> str:
         """Format retrieved documents as context string."""
@@ -38,8 +77,13 @@ class JobFitmentRAGPipeline:
         for i, doc in enumerate(retrieved_docs, 1):
             q = doc.get('question', 'N/A')
             a = doc.get('answer', 'N/A')
-            score = doc.get('similarity_score', 0)
-            context_parts.append(f"[{i}] (Score: {score:.2f})\nQ: {q}\nA: {a}")
+            score = doc.get('similarity_score')
+            if score is None:
+                # Retrieved by BM25 only (hybrid search), so there is no dense similarity
+                label = f"BM25: {doc.get('bm25_score') or 0:.2f}"
+            else:
+                label = f"Score: {score:.2f}"
+            context_parts.append(f"[{i}] ({label})\nQ: {q}\nA: {a}")
         
         return "\n\n".join(context_parts)
     
@@ -47,20 +91,22 @@ class JobFitmentRAGPipeline:
         self, 
         profile: StudentProfile, 
         job: JobPosting,
-        verbose: bool = False
+        verbose: bool = False,
+        features: Optional[ProfileFeatures] = None
     ) -> FitmentResult:
         """Run complete job fitment analysis."""
         if verbose:
             print(f"\n📊 Analyzing: {job.title} at {job.company}")
         
         # Get fitment result from analyzer
-        result = self.analyzer.analyze_fitment(profile, job)
+        result = self.analyzer.analyze_fitment(profile, job, features)
         
         # Retrieve relevant context for skill gaps
         if result.skill_gaps:
-            context_docs = self.retrieve_context(
-                f"How to learn {' '.join(result.skill_gaps[:3])}"
-            )
+            with self.metrics.span("retrieve_context", trace=False):
+                context_docs = self.retrieve_context(
+                    f"How to learn {' '.join(result.skill_gaps[:3])}"
+                )
             if context_docs:
                 result.recommendations.extend([
                     doc.get('answer', '')[:200] for doc in context_docs[:2]
@@ -77,93 +123,84 @@ class JobFitmentRAGPipeline:
         self,
         profile: StudentProfile,
         jobs: List[JobPosting],
-        verbose: bool = True
+        verbose: bool = True,
+        top_k: Optional[int] = None
     ) -> List[FitmentResult]:
-        """Analyze multiple jobs and rank by fitment."""
-        results = []
-        
-        print(f"\n🔍 Analyzing {len(jobs)} job postings...")
-        
-        for job in jobs:
-            result = self.analyze_job(profile, job, verbose=verbose)
-            results.append(result)
-        
+        """Analyze multiple jobs and rank by fitment, keeping the best top_k."""
         # Sort by fitment score (descending) and priority (ascending)
-        results.sort(key=lambda r: (-r.fitment_score, r.priority_level))
-        
-        return results
+        ranker = TopKRanker(top_k or len(jobs), key='fitment')
+        return self.rank_jobs(profile, jobs, ranker, verbose=verbose).results()
+    
+    def rank_jobs(
+        self,
+        profile: StudentProfile,
+        jobs: Iterable[JobPosting],
+        ranker: TopKRanker,
+        verbose: bool = False
+    ) -> TopKRanker:
+        """Stream jobs through the analyzer into a bounded top-k ranker."""
+        if isinstance(jobs, list):
+            print(f"\n🔍 Analyzing {len(jobs)} job postings...")
+            # Embed any new posting skills once, before the per-job loop
+            with self.metrics.span("register_job_skills", jobs=len(jobs)):
+                self.analyzer.register_job_skills(jobs)
+        
+        # The profile is fixed for the whole batch: parse it once
+        with self.metrics.span("rank_jobs", profile=profile.name):
+            features = self.analyzer.compile_profile(profile)
+            for job in jobs:
+                ranker.push(self.analyze_job(profile, job, verbose=verbose, features=features))
+        
+        return ranker
+    
+    def analyze_store(
+        self,
+        profile: StudentProfile,
+        store: JobPostingStore,
+        batch_size: Optional[int] = None,
+        verbose: bool = False
+    ) -> Iterator[FitmentResult]:
+        """Stream results over a posting store, one record batch in memory at a time."""
+        print(f"\n🔍 Analyzing {store.num_rows} stored job postings...")
+        
+        features = self.analyzer.compile_profile(profile)
+        for batch in store.iter_batches(batch_size):
+            # The dictionary-encoded skill columns give each batch's vocabulary directly
+            self.analyzer.register_skills(store.batch_skills(batch))
+            for job in store.to_postings(batch):
+                yield self.analyze_job(profile, job, verbose=verbose, features=features)
     
     def generate_report(
         self,
         profile: StudentProfile,
-        results: List[FitmentResult],
-        filename: str = "fitment_report.md"
+        results: Iterable[FitmentResult],
+        filename: str = "fitment_report.md",
+        summary: Optional[RankingSummary] = None
+    ) -> Optional[str]:
+        """
+        Generate comprehensive fitment report, saved to OUTPUT_DIR/filename.
+        Returns the report content, or None when results is a one-pass iterator
+        that was streamed to disk (see write_report() for the path).
+        """
+        streamed = not isinstance(results, Sequence)
+        filepath = self.write_report(profile, results, filename, summary)
+        if streamed:
+            return None
+        with open(filepath, encoding='utf-8') as f:
+            return f.read()
+    
+    def write_report(
+        self,
+        profile: StudentProfile,
+        results: Iterable[FitmentResult],
+        filename: str = "fitment_report.md",
+        summary: Optional[RankingSummary] = None
     ) -> str:
-        """Generate comprehensive fitment report."""
-        report_parts = [
-            "# Job Fitment Analysis Report",
-            f"\n**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-            f"**Candidate:** {profile.name}",
-            f"**Jobs Analyzed:** {len(results)}",
-            "\n---\n",
-            "## Executive Summary",
-            f"\nTop match: **{results[0].job.title}** at **{results[0].job.company}** "
-            f"with **{results[0].fitment_score}%** fitment" if results else "No jobs analyzed",
-            "\n---\n",
-            "## Rankings by Fitment Score\n"
-        ]
-        
-        # Add rankings table
-        report_parts.append("| Rank | Company | Position | Fitment | Priority |")
-        report_parts.append("|------|---------|----------|---------|----------|")
-        
-        for i, result in enumerate(results, 1):
-            report_parts.append(
-                f"| {i} | {result.job.company} | {result.job.title} | "
-                f"{result.fitment_score}% | P{result.priority_level} |"
-            )
-        
-        # Add detailed analysis for top jobs
-        report_parts.extend(["\n---\n", "## Detailed Analysis\n"])
-        
-        for result in results[:5]:  # Top 5
-            report_parts.append(result.detailed_analysis)
-            report_parts.append("\n---\n")
-        
-        # Add skill gap summary
-        all_gaps = set()
-        for result in results:
-            all_gaps.update(result.skill_gaps)
-        
-        report_parts.extend([
-            "## Common Skill Gaps\n",
-            f"The following skills appear frequently in job requirements but are missing from your profile:\n"
-        ])
-        
-        for gap in list(all_gaps)[:10]:
-            report_parts.append(f"- {gap}")
-        
-        # Add recommendations
-        report_parts.extend([
-            "\n---\n",
-            "## Top Recommendations\n"
-        ])
-        
-        all_recommendations = []
-        for result in results[:3]:
-            all_recommendations.extend(result.recommendations)
-        
-        unique_recommendations = list(dict.fromkeys(all_recommendations))[:10]
-        for rec in unique_recommendations:
-            report_parts.append(f"1. {rec}")
-        
-        # Write report
-        report_content = "\n".join(report_parts)
-        filepath = OUTPUT_DIR / filename
-        
-        with open(filepath, 'w') as f:
-            f.write(report_content)
-        
+        """
+        Stream a fitment report to OUTPUT_DIR/filename and return its path.
+        The format (md, html, json) follows the extension; summary covers results beyond the top-k.
+        """
+        with self.metrics.span("report", filename=filename):
+            filepath = self.report_renderer.write(OUTPUT_DIR / filename, profile, results, summary)
         print(f"✅ Report saved: {filepath}")
-        return report_content
-
+        return filepath
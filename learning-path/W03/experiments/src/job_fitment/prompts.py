@@ -4,7 +4,7 @@ System prompt engineering for job fitment analysis.
 
 from typing import List
 from .environment import EnvironmentConfig
-from .models import StudentProfile, JobPosting
+from .models import StudentProfile, JobPosting, FitmentResult
 from .config import OUTPUT_DIR
 
 
@@ -103,6 +103,25 @@ TASK: For each skill gap, provide:
 
 Format as a learning roadmap. [/INST]"""
     
+    def format_explanation_prompt(self, profile: StudentProfile, result: FitmentResult) -> str:
+        """Format chat prompt asking for a short fitment explanation (scores already computed)."""
+        job = result.job
+        return f"""STUDENT PROFILE:
+{profile.to_text()}
+
+JOB POSTING (Priority {job.company_priority}):
+{job.to_text()}
+
+COMPUTED FITMENT:
+- Overall: {result.fitment_score:.0f}%
+- Skills: {result.skill_score:.0f}% | Experience: {result.experience_match:.0f}% | Education: {result.education_match:.0f}% | Location: {result.location_score:.0f}%
+- Matched skills: {', '.join(result.skill_matches) or 'None'}
+- Skill gaps: {', '.join(result.skill_gaps) or 'None'}
+
+TASK: In under 200 words, explain this fitment to the student: why the score is what it is,
+their strongest selling points for this role, and the two or three gaps to close first.
+Do not recompute or contradict the scores above."""
+    
     def save_system_prompt(self, filename: str = "system_prompt.txt") -> str:
         """Save system prompt to file."""
         filepath = OUTPUT_DIR / filename
@@ -0,0 +1,215 @@
+"""
+Report rendering for Job Fitment Agent.
+Compiled string templates stream Markdown, HTML or JSON reports straight to disk.
+"""
+
+import html
+import json
+from datetime import datetime
+from itertools import chain
+from pathlib import Path
+from string import Template
+from typing import IO, Iterable, Iterator, List, Optional, Sequence, Union
+from .environment import EnvironmentConfig
+from .models import StudentProfile, FitmentResult
+from .scorer import RankingSummary
+
+
+MARKDOWN_TEMPLATES = {
+    'header': Template(
+        "# Job Fitment Analysis Report\n"
+        "\n**Generated:** $generated\n"
+        "**Candidate:** $candidate\n"
+        "**Jobs Analyzed:** $total\n"
+        "\n---\n\n"
+        "## Executive Summary\n"
+        "\n$top_match\n"
+        "\n---\n\n"
+        "## Rankings by Fitment Score\n\n"
+        "| Rank | Company | Position | Fitment | Priority |\n"
+        "|------|---------|----------|---------|----------|\n"
+    ),
+    'top_match': Template("Top match: **$title** at **$company** with **$score%** fitment"),
+    'row': Template("| $rank | $company | $title | $score% | P$priority |\n"),
+    'details': Template("\n---\n\n## Detailed Analysis\n\n"),
+    'detail': Template("$analysis\n\n---\n\n"),
+    'gaps': Template(
+        "## Common Skill Gaps\n\n"
+        "The following skills appear frequently in job requirements but are missing from your profile:\n\n"
+    ),
+    'gap': Template("- $gap ($count of $total jobs)\n"),
+    'recommendations': Template("\n---\n\n## Top Recommendations\n\n"),
+    'recommendation': Template("1. $recommendation\n"),
+    'footer': Template(""),
+}
+
+HTML_TEMPLATES = {
+    'header': Template(
+        "<!DOCTYPE html>\n<html lang=\"en\">\n<head>\n<meta charset=\"utf-8\">\n"
+        "<title>Job Fitment Analysis Report - $candidate</title>\n</head>\n<body>\n"
+        "<h1>Job Fitment Analysis Report</h1>\n"
+        "<p><strong>Generated:</strong> $generated<br>\n"
+        "<strong>Candidate:</strong> $candidate<br>\n"
+        "<strong>Jobs Analyzed:</strong> $total</p>\n"
+        "<h2>Executive Summary</h2>\n<p>$top_match</p>\n"
+        "<h2>Rankings by Fitment Score</h2>\n<table>\n"
+        "<tr><th>Rank</th><th>Company</th><th>Position</th><th>Fitment</th><th>Priority</th></tr>\n"
+    ),
+    'top_match': Template("Top match: <strong>$title</strong> at <strong>$company</strong> "
+                          "with <strong>$score%</strong> fitment"),
+    'row': Template("<tr><td>$rank</td><td>$company</td><td>$title</td><td>$score%</td><td>P$priority</td></tr>\n"),
+    'details': Template("</table>\n<h2>Detailed Analysis</h2>\n"),
+    'detail': Template("<pre>$analysis</pre>\n"),
+    'gaps': Template(
+        "<h2>Common Skill Gaps</h2>\n"
+        "<p>The following skills appear frequently in job requirements but are missing from your profile:</p>\n<ul>\n"
+    ),
+    'gap': Template("<li>$gap ($count of $total jobs)</li>\n"),
+    'recommendations': Template("</ul>\n<h2>Top Recommendations</h2>\n<ol>\n"),
+    'recommendation': Template("<li>$recommendation</li>\n"),
+    'footer': Template("</ol>\n</body>\n</html>\n"),
+}
+
+
+class FitmentReportRenderer:
+    """
+    Streams fitment reports section by section to an open file.
+    Only the displayed top results are held in memory or get detailed analysis.
+    """
+    
+    FORMATS = {'.md': 'md', '.markdown': 'md', '.html': 'html', '.htm': 'html', '.json': 'json'}
+    TEMPLATES = {'md': MARKDOWN_TEMPLATES, 'html': HTML_TEMPLATES}
+    DETAIL_COUNT = 5            # results with a detailed analysis section
+    RECOMMENDATION_SOURCES = 3  # results whose recommendations are summarized
+    MAX_GAPS = 10
+    MAX_RECOMMENDATIONS = 10
+    
+    def __init__(self, env: EnvironmentConfig):
+        self.env = env
+    
+    def format_for(self, path: Union[str, Path]) -> str:
+        """Report format implied by a filename (Markdown by default)."""
+        return self.FORMATS.get(Path(path).suffix.lower(), 'md')
+    
+    def write(
+        self,
+        path: Union[str, Path],
+        profile: StudentProfile,
+        results: Union[Sequence[FitmentResult], Iterable[FitmentResult]],
+        summary: Optional[RankingSummary] = None,
+        fmt: Optional[str] = None
+    ) -> str:
+        """
+        Render a report for ranked results to path.
+        Without a summary, results must be a sequence (it is computed first);
+        with one, any iterator is streamed in a single pass.
+        """
+        fmt = fmt or self.format_for(path)
+        if fmt not in self.FORMATS.values():
+            raise ValueError(f"Unknown report format '{fmt}'. Expected md, html or json.")
+        
+        if summary is None:
+            results = results if isinstance(results, Sequence) else list(results)
+            summary = RankingSummary()
+            for result in results:
+                summary.add(result)
+        
+        with open(path, 'w', encoding='utf-8') as f:
+            if fmt == 'json':
+                self._write_json(f, profile, iter(results), summary)
+            else:
+                self._write_templated(f, self.TEMPLATES[fmt], fmt, profile, iter(results), summary)
+        return str(path)
+    
+    @staticmethod
+    def _top_recommendations(shown: List[FitmentResult], limit: int) -> List[str]:
+        recommendations = chain.from_iterable(r.recommendations for r in shown)
+        return list(dict.fromkeys(recommendations))[:limit]
+    
+    def _write_templated(
+        self,
+        f: IO[str],
+        templates: dict,
+        fmt: str,
+        profile: StudentProfile,
+        results: Iterator[FitmentResult],
+        summary: RankingSummary
+    ):
+        escape = html.escape if fmt == 'html' else str
+        first = next(results, None)
+        
+        top_match = "No jobs analyzed"
+        if first is not None:
+            top_match = templates['top_match'].substitute(
+                title=escape(first.job.title), company=escape(first.job.company), score=first.fitment_score
+            )
+        f.write(templates['header'].substitute(
+            generated=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            candidate=escape(profile.name),
+            total=summary.total,
+            top_match=top_match
+        ))
+        
+        # Rankings stream straight through; only the displayed head is kept
+        shown: List[FitmentResult] = []
+        row = templates['row']
+        keep = max(self.DETAIL_COUNT, self.RECOMMENDATION_SOURCES)
+        for rank, result in enumerate(chain([first] if first is not None else [], results), 1):
+            f.write(row.substitute(
+                rank=rank, company=escape(result.job.company), title=escape(result.job.title),
+                score=result.fitment_score, priority=result.priority_level
+            ))
+            if rank <= keep:
+                shown.append(result)
+        
+        f.write(templates['details'].substitute())
+        for result in shown[:self.DETAIL_COUNT]:
+            f.write(templates['detail'].substitute(analysis=escape(result.detailed_analysis)))
+        
+        f.write(templates['gaps'].substitute())
+        for gap, count in summary.common_gaps(self.MAX_GAPS):
+            f.write(templates['gap'].substitute(gap=escape(gap), count=count, total=summary.total))
+        
+        f.write(templates['recommendations'].substitute())
+        for recommendation in self._top_recommendations(shown[:self.RECOMMENDATION_SOURCES], self.MAX_RECOMMENDATIONS):
+            f.write(templates['recommendation'].substitute(recommendation=escape(recommendation)))
+        f.write(templates['footer'].substitute())
+    
+    def _write_json(
+        self,
+        f: IO[str],
+        profile: StudentProfile,
+        results: Iterator[FitmentResult],
+        summary: RankingSummary
+    ):
+        header = {
+            'generated': datetime.now().isoformat(timespec='seconds'),
+            'candidate': profile.name,
+            'jobs_analyzed': summary.total,
+            'mean_score': summary.mean_score,
+        }
+        f.write(json.dumps(header)[:-1] + ', "rankings": [\n')
+        
+        shown: List[FitmentResult] = []
+        for rank, result in enumerate(results, 1):
+            row = {
+                'rank': rank,
+                'job_id': result.job.job_id,
+                'company': result.job.company,
+                'title': result.job.title,
+                'fitment_score': result.fitment_score,
+                'priority': result.priority_level,
+                'skill_matches': result.skill_matches,
+                'skill_gaps': result.skill_gaps,
+            }
+            if rank <= self.DETAIL_COUNT:
+                row['detailed_analysis'] = result.detailed_analysis
+            if rank <= self.RECOMMENDATION_SOURCES:
+                shown.append(result)
+            f.write(("" if rank == 1 else ",\n") + json.dumps(row))
+        
+        f.write('\n], "common_gaps": ')
+        f.write(json.dumps([{'skill': gap, 'count': count} for gap, count in summary.common_gaps(self.MAX_GAPS)]))
+        f.write(', "recommendations": ')
+        f.write(json.dumps(self._top_recommendations(shown, self.MAX_RECOMMENDATIONS)))
+        f.write('}\n')
@@ -2,11 +2,87 @@
 Scoring system for model evaluation and ranking.
 """
 
-from typing import List, Dict, Tuple
+import heapq
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, List, Dict, Optional, Tuple
 from .environment import EnvironmentConfig
 from .models import FitmentResult
 
 
+# Ranking keys: smaller sorts first. Every component is numeric so it can be negated.
+RANKING_KEYS: Dict[str, Callable[[FitmentResult], Tuple[float, ...]]] = {
+    'priority': lambda r: (r.priority_level, -r.fitment_score),
+    'fitment': lambda r: (-r.fitment_score, r.priority_level),
+}
+
+
+@dataclass(slots=True)
+class RankingSummary:
+    """Aggregate statistics over every ranked result, including those not kept."""
+    total: int = 0
+    score_sum: float = 0.0
+    best_score: float = 0.0
+    worst_score: float = 100.0
+    priority_counts: Counter = field(default_factory=Counter)
+    gap_counts: Counter = field(default_factory=Counter)
+    
+    def add(self, result: FitmentResult):
+        self.total += 1
+        self.score_sum += result.fitment_score
+        self.best_score = max(self.best_score, result.fitment_score)
+        self.worst_score = min(self.worst_score, result.fitment_score)
+        self.priority_counts[result.priority_level] += 1
+        self.gap_counts.update(result.skill_gaps)
+    
+    @property
+    def mean_score(self) -> float:
+        return round(self.score_sum / self.total, 1) if self.total else 0.0
+    
+    def common_gaps(self, n: int = 10) -> List[Tuple[str, int]]:
+        """Most frequent skill gaps with their counts."""
+        return self.gap_counts.most_common(n)
+
+
+class TopKRanker:
+    """
+    Bounded heap of the k best results under a ranking key.
+    Pushing costs O(log k); results that fall out only feed the summary.
+    """
+    
+    def __init__(self, k: int, key: str = 'priority'):
+        if key not in RANKING_KEYS:
+            raise ValueError(f"Unknown ranking key '{key}'. Expected one of: {', '.join(RANKING_KEYS)}")
+        self.k = max(k, 0)
+        self.key = RANKING_KEYS[key]
+        self.summary = RankingSummary()
+        # Min-heap on the negated key, so the root is the worst result kept;
+        # among equal keys the later arrival is evicted first (stable like sorted()).
+        self._heap: List[Tuple[Tuple[float, ...], int, FitmentResult]] = []
+        self._seen = 0
+    
+    def push(self, result: FitmentResult):
+        self.summary.add(result)
+        entry = (tuple(-v for v in self.key(result)), -self._seen, result)
+        self._seen += 1
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif self.k:
+            heapq.heappushpop(self._heap, entry)
+    
+    def extend(self, results: Iterable[FitmentResult]) -> 'TopKRanker':
+        for result in results:
+            self.push(result)
+        return self
+    
+    def __len__(self) -> int:
+        return len(self._heap)
+    
+    def results(self) -> List[FitmentResult]:
+        """Kept results, best first."""
+        return [entry[2] for entry in sorted(self._heap, reverse=True)]
+
+
 class FitmentScorer:
     """
     Scoring system for model evaluation and ranking.
@@ -21,8 +97,9 @@ class FitmentScorer:
         'speed': 0.15
     }
     
-    def __init__(self, env: EnvironmentConfig):
+    def __init__(self, env: EnvironmentConfig, ranking: str = 'priority'):
         self.env = env
+        self.ranking = ranking
         self.embeddings_cache = {}
     
     def score_skill_match(self, matched: int, total: int) -> float:
@@ -52,8 +129,15 @@ class FitmentScorer:
             score += metrics.get(metric, 0) * weight
         return round(score * 100, 1)
     
-    def rank_results(self, results: List[FitmentResult]) -> List[FitmentResult]:
-        """Rank results by multiple criteria."""
-        # Sort by: priority (asc), fitment_score (desc)
-        return sorted(results, key=lambda r: (r.priority_level, -r.fitment_score))
+    def rank_results(self, results: Iterable[FitmentResult], top_k: Optional[int] = None) -> List[FitmentResult]:
+        """Rank results by multiple criteria, keeping only the best top_k if given."""
+        # Default: priority (asc), fitment_score (desc)
+        key = RANKING_KEYS[self.ranking]
+        if top_k is None:
+            return sorted(results, key=key)
+        return heapq.nsmallest(top_k, results, key=key)
+    
+    def ranker(self, k: int) -> TopKRanker:
+        """Streaming top-k ranker under this scorer's ranking key."""
+        return TopKRanker(k, self.ranking)
 
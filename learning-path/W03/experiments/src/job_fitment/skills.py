@@ -0,0 +1,269 @@
+"""
+Semantic skill matching for Job Fitment Agent.
+Precomputes a skill x skill cosine similarity table so fuzzy matching is a lookup.
+"""
+
+import json
+from pathlib import Path
+from typing import AbstractSet, Callable, Dict, Iterable, List, Optional, Union
+from .environment import EnvironmentConfig
+from .config import OUTPUT_DIR
+
+
+class SkillSimilarityTable:
+    """
+    Precomputed skill x skill similarity matrix over a canonical vocabulary.
+    Aliases resolve to canonical skills; similarities are stored as float16.
+    """
+    
+    SIMILARITY_THRESHOLD = 0.82
+    MATRIX_FILE = "skill_similarity.npy"
+    EMBEDDINGS_FILE = "skill_embeddings.npy"
+    VOCAB_FILE = "skill_vocab.json"
+    
+    # Common abbreviations and spellings -> canonical skill name
+    DEFAULT_ALIASES = {
+        "postgres": "PostgreSQL",
+        "postgre": "PostgreSQL",
+        "psql": "PostgreSQL",
+        "k8s": "Kubernetes",
+        "kube": "Kubernetes",
+        "js": "JavaScript",
+        "ecmascript": "JavaScript",
+        "ts": "TypeScript",
+        "golang": "Go",
+        "py": "Python",
+        "python3": "Python",
+        "cpp": "C++",
+        "c plus plus": "C++",
+        "csharp": "C#",
+        "c sharp": "C#",
+        "dotnet": ".NET",
+        ".net core": ".NET",
+        "node": "Node.js",
+        "nodejs": "Node.js",
+        "reactjs": "React",
+        "react.js": "React",
+        "vue": "Vue.js",
+        "vuejs": "Vue.js",
+        "nextjs": "Next.js",
+        "express": "Express.js",
+        "amazon web services": "AWS",
+        "gcp": "Google Cloud",
+        "google cloud platform": "Google Cloud",
+        "microsoft azure": "Azure",
+        "ml": "Machine Learning",
+        "dl": "Deep Learning",
+        "nlp": "NLP",
+        "natural language processing": "NLP",
+        "cv": "Computer Vision",
+        "llm": "LLMs",
+        "large language models": "LLMs",
+        "tf": "TensorFlow",
+        "mongo": "MongoDB",
+        "ci cd": "CI/CD",
+        "cicd": "CI/CD",
+        "continuous integration": "CI/CD",
+    }
+    
+    def __init__(
+        self,
+        env: EnvironmentConfig,
+        encoder: Optional[Callable[[List[str]], 'np.ndarray']] = None,
+        aliases: Optional[Dict[str, str]] = None,
+        threshold: Optional[float] = None
+    ):
+        self.env = env
+        self.encoder = encoder
+        self.threshold = threshold if threshold is not None else self.SIMILARITY_THRESHOLD
+        
+        self.skills: List[str] = []             # canonical display names, by skill ID
+        self.skill_ids: Dict[str, int] = {}     # normalized name -> skill ID
+        self.aliases: Dict[str, str] = {}
+        self.similarity = None                  # float16 (capacity x capacity)
+        self.embeddings = None                  # float16 (capacity x dim), L2-normalized
+        
+        for alias, canonical in {**self.DEFAULT_ALIASES, **(aliases or {})}.items():
+            self.add_alias(alias, canonical)
+    
+    @staticmethod
+    def normalize(skill: str) -> str:
+        """Case- and whitespace-insensitive lookup key."""
+        return " ".join(skill.lower().replace("-", " ").replace("_", " ").split())
+    
+    def add_alias(self, alias: str, canonical: str):
+        """Map an alternate spelling onto a canonical skill."""
+        self.aliases[self.normalize(alias)] = canonical
+    
+    def canonical(self, skill: str) -> str:
+        """Canonical name for a skill (resolving aliases)."""
+        return self.aliases.get(self.normalize(skill), skill.strip())
+    
+    def skill_id(self, skill: str) -> Optional[int]:
+        """Skill ID for a skill or alias, or None if it is not in the vocabulary."""
+        return self.skill_ids.get(self.normalize(self.canonical(skill)))
+    
+    def ids(self, skills: Iterable[str]) -> 'np.ndarray':
+        """Skill IDs of the known skills in an iterable (unknown ones are dropped)."""
+        found = [self.skill_id(s) for s in skills]
+        return self.env.np.array(sorted({i for i in found if i is not None}), dtype='int32')
+    
+    def __len__(self) -> int:
+        return len(self.skills)
+    
+    def __contains__(self, skill: str) -> bool:
+        return self.skill_id(skill) is not None
+    
+    def build(
+        self,
+        skill_categories: Dict[str, List[str]],
+        extra_skills: Optional[Iterable[str]] = None
+    ) -> 'SkillSimilarityTable':
+        """Build the table from the canonical categories plus any extra skills."""
+        print("🧩 Building skill similarity table...")
+        skills = [skill for category in skill_categories.values() for skill in category]
+        skills.extend(self.aliases.values())
+        if extra_skills:
+            skills.extend(extra_skills)
+        
+        added = self.add_skills(skills)
+        print(f"   ✅ {len(self)} canonical skills ({added} embedded), "
+              f"{len(self.aliases)} aliases, threshold {self.threshold}")
+        return self
+    
+    def add_skills(self, skills: Iterable[str]) -> int:
+        """
+        Add new skills incrementally.
+        Only unseen skills are embedded; their similarity rows are appended.
+        Returns the number of skills added.
+        """
+        np = self.env.np
+        new_skills, seen = [], set()
+        for skill in skills:
+            if not skill or not skill.strip():
+                continue
+            canonical = self.canonical(skill)
+            key = self.normalize(canonical)
+            if key in self.skill_ids or key in seen:
+                continue
+            seen.add(key)
+            new_skills.append(canonical)
+        
+        if not new_skills:
+            return 0
+        
+        if self.encoder is None:
+            raise RuntimeError("No encoder configured. Cannot embed new skills.")
+        
+        vectors = np.asarray(self.encoder(new_skills), dtype='float32')
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.maximum(norms, 1e-12)
+        
+        start = len(self.skills)
+        end = start + len(new_skills)
+        self._ensure_capacity(end, vectors.shape[1])
+        
+        self.embeddings[start:end] = vectors
+        all_vectors = self.embeddings[:end].astype('float32')
+        new_rows = np.clip(vectors @ all_vectors.T, -1.0, 1.0).astype('float16')
+        self.similarity[start:end, :end] = new_rows
+        self.similarity[:end, start:end] = new_rows.T
+        
+        for offset, skill in enumerate(new_skills):
+            self.skill_ids[self.normalize(skill)] = start + offset
+            self.skills.append(skill)
+        return len(new_skills)
+    
+    def _ensure_capacity(self, size: int, dimension: int):
+        """Grow the preallocated arrays geometrically so appends stay amortized O(n)."""
+        np = self.env.np
+        capacity = 0 if self.similarity is None else self.similarity.shape[0]
+        if size <= capacity:
+            return
+        
+        new_capacity = max(size, capacity * 2, 64)
+        similarity = np.zeros((new_capacity, new_capacity), dtype='float16')
+        embeddings = np.zeros((new_capacity, dimension), dtype='float16')
+        n = len(self.skills)
+        if n:
+            similarity[:n, :n] = self.similarity[:n, :n]
+            embeddings[:n] = self.embeddings[:n]
+        self.similarity = similarity
+        self.embeddings = embeddings
+    
+    def similarity_of(self, skill_a: str, skill_b: str) -> float:
+        """Cosine similarity between two skills (1.0 for identical canonical names)."""
+        id_a, id_b = self.skill_id(skill_a), self.skill_id(skill_b)
+        if id_a is None or id_b is None:
+            return 1.0 if self.normalize(self.canonical(skill_a)) == self.normalize(self.canonical(skill_b)) else 0.0
+        return float(self.similarity[id_a, id_b])
+    
+    def best_match(
+        self,
+        skill: str,
+        candidate_ids: 'np.ndarray',
+        threshold: Optional[float] = None
+    ) -> Optional[int]:
+        """Skill ID of the most similar candidate above the threshold, or None."""
+        skill_id = self.skill_id(skill)
+        if skill_id is None or len(candidate_ids) == 0:
+            return None
+        
+        threshold = self.threshold if threshold is None else threshold
+        row = self.similarity[skill_id, candidate_ids]
+        best = int(row.argmax())
+        return int(candidate_ids[best]) if row[best] >= threshold else None
+    
+    def matches(
+        self,
+        skill: str,
+        candidates: Iterable[str],
+        candidate_ids: Optional['np.ndarray'] = None,
+        threshold: Optional[float] = None,
+        candidate_keys: Optional[AbstractSet[str]] = None
+    ) -> bool:
+        """
+        Whether a skill matches any candidate exactly, by alias or semantically.
+        Callers matching many skills against the same candidates can pass
+        precomputed candidate_ids and normalized candidate_keys.
+        """
+        key = self.normalize(self.canonical(skill))
+        if candidate_keys is None:
+            candidate_keys = {self.normalize(self.canonical(c)) for c in candidates}
+        if key in candidate_keys:
+            return True
+        if candidate_ids is None:
+            candidate_ids = self.ids(candidates)
+        return self.best_match(skill, candidate_ids, threshold) is not None
+    
+    def save(self, directory: Optional[Union[str, Path]] = None) -> str:
+        """Save the float16 matrix, embeddings and vocabulary."""
+        directory = Path(directory) if directory else OUTPUT_DIR
+        directory.mkdir(parents=True, exist_ok=True)
+        n = len(self.skills)
+        
+        self.env.np.save(directory / self.MATRIX_FILE, self.similarity[:n, :n])
+        self.env.np.save(directory / self.EMBEDDINGS_FILE, self.embeddings[:n])
+        with open(directory / self.VOCAB_FILE, 'w') as f:
+            json.dump({'skills': self.skills, 'aliases': self.aliases, 'threshold': self.threshold}, f, indent=2)
+        
+        print(f"✅ Saved: {directory / self.MATRIX_FILE} ({n}x{n} float16)")
+        return str(directory / self.MATRIX_FILE)
+    
+    def load(self, directory: Optional[Union[str, Path]] = None) -> bool:
+        """Load a previously saved table. Returns False if none exists."""
+        directory = Path(directory) if directory else OUTPUT_DIR
+        if not (directory / self.VOCAB_FILE).exists():
+            return False
+        
+        np = self.env.np
+        with open(directory / self.VOCAB_FILE) as f:
+            vocab = json.load(f)
+        
+        self.skills = list(vocab['skills'])
+        self.skill_ids = {self.normalize(skill): i for i, skill in enumerate(self.skills)}
+        self.aliases.update(vocab.get('aliases', {}))
+        self.threshold = vocab.get('threshold', self.threshold)
+        self.similarity = np.load(directory / self.MATRIX_FILE)
+        self.embeddings = np.load(directory / self.EMBEDDINGS_FILE)
+        return True
@@ -1,23 +1,126 @@
-from typing import List, Dict, Any
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterable, Tuple, Union
 from .environment import EnvironmentConfig
 from .config import OUTPUT_DIR
+from .artifacts import ARTIFACT_DIR, ArtifactManifest, atomic_write, content_hash
+from .lexical import BM25Index, reciprocal_rank_fusion, tokenize
 
 class JobFitmentVectorDB:
     """
     FAISS vector database for semantic job matching.
     Converts text to embeddings and enables similarity search.
+    
+    Supports exact (Flat) and approximate (IVF-Flat, IVF-PQ, HNSW) indexes,
+    with either L2 distance or inner product on normalized vectors.
+    
+    Every index is keyed by stable document IDs (IndexIDMap2, or the native
+    ID lists of IVF indexes), so documents can be added, removed and
+    upserted without a full rebuild. HNSW graphs cannot delete, so replaced
+    vectors are retired (relabelled -1) and the graph is rebuilt from the stored
+    embeddings once they exceed MAX_RETIRED_FRACTION of the index.
+    With a store_dir, updates go to an append-only delta log on top of the
+    last snapshot and are folded back in by compact().
+    
+    A BM25 index over the same documents is kept in step with the FAISS
+    index for exact-term and hybrid (reciprocal-rank fused) retrieval.
     """
     
     EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
     EMBEDDING_DIM = 384
     TOP_K = 5
     
-    def __init__(self, env: EnvironmentConfig):
+    # Index factory defaults
+    INDEX_TYPES = ("flat", "ivf_flat", "ivf_pq", "hnsw")
+    METRICS = ("l2", "ip")
+    INDEX_TYPE = "flat"
+    METRIC = "l2"
+    NLIST = 1024            # IVF coarse clusters
+    PQ_M = 48               # PQ sub-quantizers (must divide dimension)
+    PQ_NBITS = 8            # bits per PQ code
+    HNSW_M = 32             # HNSW graph neighbours per node
+    HNSW_EF_CONSTRUCTION = 200
+    NPROBE = 16             # IVF clusters visited per query
+    EF_SEARCH = 64          # HNSW candidate list size per query
+    TRAIN_SAMPLE_SIZE = 100_000
+    
+    # Incremental updates
+    ID_KEY = "doc_id"
+    COMPACT_EVERY = 1000    # delta log operations before automatic compaction
+    MAX_RETIRED_FRACTION = 0.25     # HNSW retired vectors per live one before a rebuild
+    SNAPSHOT_INDEX = "index.faiss"
+    SNAPSHOT_EMBEDDINGS = "embeddings.npy"
+    SNAPSHOT_IDS = "ids.npy"
+    SNAPSHOT_DOCUMENTS = "documents.json"
+    DELTA_LOG = "delta.jsonl"
+    DELTA_VECTORS = "delta.f32"
+    
+    # Hybrid retrieval
+    LEXICAL_FIELDS = ("question", "answer")
+    CANDIDATE_MULTIPLIER = 4    # per-retriever candidates fused per result
+    LEXICAL_CACHE_SIZE = 1024   # cached BM25 result lists (cleared on any update)
+    
+    def __init__(
+        self,
+        env: EnvironmentConfig,
+        index_type: Optional[str] = None,
+        metric: Optional[str] = None,
+        nlist: Optional[int] = None,
+        pq_m: Optional[int] = None,
+        pq_nbits: Optional[int] = None,
+        hnsw_m: Optional[int] = None,
+        nprobe: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        train_sample_size: Optional[int] = None,
+        store_dir: Optional[Union[str, Path]] = None
+    ):
         self.env = env
         self.embedding_model = None
+        self._loaded_model = None   # the model load_embedding_model() created, if any
         self.faiss_index = None
         self.embeddings = None
         self.documents = []
+        
+        # Stable ID bookkeeping (aligned with documents / embeddings rows)
+        self.doc_ids: List[int] = []
+        self._positions: Dict[int, int] = {}
+        self._text_hashes: Dict[int, str] = {}
+        self._retired = 0   # HNSW vectors still in the graph but relabelled -1
+        self.text_key = "question"
+        
+        self.lexical_index = BM25Index()
+        self._lexical_cache: 'OrderedDict[Tuple[Tuple[str, ...], int], List[Tuple[int, float]]]' = OrderedDict()
+        
+        # Work counters (exported by Metrics.register)
+        self.stats = {
+            'embeddings_computed': 0, 'dense_queries': 0, 'documents_searched': 0,
+            'lexical_queries': 0, 'lexical_cache_hits': 0, 'lexical_only': 0, 'hybrid': 0,
+            'index_cache_hits': 0, 'embedding_cache_hits': 0,
+        }
+        
+        self.store_dir = Path(store_dir) if store_dir else None
+        self._pending_ops = 0
+        
+        # Content key of the cached artifacts this state matches (None once mutated)
+        self.artifact_key: Optional[str] = None
+        
+        self.index_type = (index_type or self.INDEX_TYPE).lower()
+        self.metric = (metric or self.METRIC).lower()
+        if self.index_type not in self.INDEX_TYPES:
+            raise ValueError(f"Unknown index type '{self.index_type}'. Choose from {self.INDEX_TYPES}")
+        if self.metric not in self.METRICS:
+            raise ValueError(f"Unknown metric '{self.metric}'. Choose from {self.METRICS}")
+        
+        self.nlist = nlist or self.NLIST
+        self.pq_m = pq_m or self.PQ_M
+        self.pq_nbits = pq_nbits or self.PQ_NBITS
+        self.hnsw_m = hnsw_m or self.HNSW_M
+        self.nprobe = nprobe or self.NPROBE
+        self.ef_search = ef_search or self.EF_SEARCH
+        self.train_sample_size = train_sample_size or self.TRAIN_SAMPLE_SIZE
     
     def load_embedding_model(self):
         """Load the sentence transformer model."""
@@ -25,7 +128,7 @@ class JobFitmentVectorDB:
             raise RuntimeError("SentenceTransformer not available. Ensure environment is properly initialized.")
         
         print(f"   Loading embedding model: {self.EMBEDDING_MODEL}")
-        self.embedding_model = self.env.SentenceTransformer(self.EMBEDDING_MODEL)
+        self.embedding_model = self._loaded_model = self.env.SentenceTransformer(self.EMBEDDING_MODEL)
         if self.embedding_model is not None:
             print(f"   ✅ Model loaded (dim: {self.embedding_model.get_sentence_embedding_dimension()})")
         return self.embedding_model
@@ -43,6 +146,7 @@ class JobFitmentVectorDB:
             show_progress_bar=True, 
             convert_to_numpy=True
         )
+        self.stats['embeddings_computed'] += len(texts)
         return embeddings.astype('float32')
     
     def build_index(self, documents: List[Dict[str, Any]], text_key: str = "question"):
@@ -52,20 +156,633 @@ class JobFitmentVectorDB:
         if self.env.faiss is None:
             raise RuntimeError("FAISS not available. Ensure environment is properly initialized.")
         
-        self.documents = documents
-        texts = [doc.get(text_key, "") + " " + doc.get("answer", "") for doc in documents]
+        ids, docs, texts = self._prepare_documents(documents, text_key)
         
         # Generate embeddings
-        self.embeddings = self.generate_embeddings(texts)
+        embeddings = self.generate_embeddings(texts)
         
         # Create FAISS index
-        dimension = self.embeddings.shape[1]
-        self.faiss_index = self.env.faiss.IndexFlatL2(dimension)
-        self.faiss_index.add(self.embeddings)
+        self.index_embeddings(embeddings, ids=ids, documents=docs)
+        self._report_built()
+        
+        if self.store_dir:
+            self.compact()
+        return self.faiss_index
+    
+    def _prepare_documents(
+        self,
+        documents: List[Dict[str, Any]],
+        text_key: str
+    ) -> Tuple[List[int], List[Dict[str, Any]], List[str]]:
+        """Dedupe documents by ID and return (ids, docs, texts)."""
+        self.text_key = text_key
+        
+        # Later duplicates of the same document ID win
+        unique_docs = {self.document_id(doc): doc for doc in documents}
+        ids = list(unique_docs.keys())
+        docs = [self._with_doc_key(doc) for doc in unique_docs.values()]
+        texts = [self._document_text(doc) for doc in docs]
+        return ids, docs, texts
+    
+    def _report_built(self):
+        print(f"   ✅ Index built: {self.faiss_index.ntotal} vectors, "
+              f"{self.embeddings.shape[1]} dimensions ({self.index_type}, {self.metric})")
+    
+    def encoder_identity(self) -> Tuple[str, int]:
+        """
+        (name, dimension) of the encoder producing this database's embeddings.
+        Before any model is set this is the model generate_embeddings() will load;
+        a swapped-in encoder is identified by its class instead.
+        """
+        model = self.embedding_model
+        if model is None:
+            return self.EMBEDDING_MODEL, self.EMBEDDING_DIM
+        if model is self._loaded_model:
+            name = self.EMBEDDING_MODEL
+        else:
+            name = f"{type(model).__module__}.{type(model).__qualname__}"
+        return name, int(model.get_sentence_embedding_dimension())
+    
+    def artifact_keys(self, source_key: str, text_key: str = "question") -> Tuple[str, str]:
+        """(embeddings key, index key) derived from the source documents' content key and the encoder."""
+        embeddings_key = content_hash(source_key, *self.encoder_identity(), text_key)
+        index_key = content_hash(
+            embeddings_key, self.index_type, self.metric,
+            self.nlist, self.pq_m, self.pq_nbits, self.hnsw_m, self.HNSW_EF_CONSTRUCTION
+        )
+        return embeddings_key, index_key
+    
+    def build_index_cached(
+        self,
+        documents: List[Dict[str, Any]],
+        source_key: str,
+        text_key: str = "question",
+        cache_dir: Optional[Union[str, Path]] = None
+    ):
+        """
+        build_index() keyed on the documents' content key.
+        Reuses a cached index snapshot when nothing changed, or cached
+        embeddings (no model load) when only the index configuration did.
+        """
+        if self.env.faiss is None or self.env.np is None:
+            raise RuntimeError("FAISS or NumPy not available. Ensure environment is properly initialized.")
+        
+        cache_dir = Path(cache_dir) if cache_dir else ARTIFACT_DIR
+        embeddings_key, index_key = self.artifact_keys(source_key, text_key)
+        embeddings_path = cache_dir / f"embeddings-{embeddings_key}.npy"
+        
+        # The cached snapshot uses the store format, in its own directory
+        store_dir = self.store_dir
+        self.store_dir = cache_dir / f"index-{index_key}"
+        try:
+            if (self.store_dir / self.SNAPSHOT_INDEX).exists() and self.load_store():
+                self.stats['index_cache_hits'] += 1
+                print(f"🗄️  Reused cached FAISS index ({index_key})")
+            else:
+                print("🗄️  Building FAISS index...")
+                ids, docs, texts = self._prepare_documents(documents, text_key)
+                
+                embeddings = None
+                if embeddings_path.exists():
+                    embeddings = self.env.np.load(embeddings_path)
+                    if embeddings.shape[0] != len(texts):
+                        embeddings = None
+                    else:
+                        self.stats['embedding_cache_hits'] += 1
+                        print(f"   ✅ Reused cached embeddings ({embeddings_key})")
+                if embeddings is None:
+                    embeddings = self.generate_embeddings(texts)
+                    
+                    def write(p: Path):
+                        with open(p, 'wb') as f:
+                            self.env.np.save(f, embeddings)
+                    
+                    atomic_write(embeddings_path, write)
+                
+                self.index_embeddings(embeddings, ids=ids, documents=docs)
+                self._report_built()
+                self.compact()
+        finally:
+            self.store_dir = store_dir
         
-        print(f"   ✅ Index built: {self.faiss_index.ntotal} vectors, {dimension} dimensions")
+        self.artifact_key = index_key
+        if self.store_dir:
+            self.compact()
         return self.faiss_index
     
+    def index_embeddings(
+        self,
+        embeddings: 'np.ndarray',
+        ids: Optional[List[int]] = None,
+        documents: Optional[List[Dict[str, Any]]] = None
+    ):
+        """Create, train and fill the configured index from precomputed embeddings."""
+        if self.env.faiss is None or self.env.np is None:
+            raise RuntimeError("FAISS or NumPy not available. Ensure environment is properly initialized.")
+        
+        self.artifact_key = None
+        np = self.env.np
+        embeddings = self._prepare_vectors(embeddings)
+        if ids is None:
+            ids = list(range(len(embeddings)))
+        if documents is not None:
+            self.documents = list(documents)
+        
+        self.embeddings = embeddings
+        self.doc_ids = [int(i) for i in ids]
+        self._positions = {doc_id: pos for pos, doc_id in enumerate(self.doc_ids)}
+        self._text_hashes = {
+            doc_id: self._text_hash(self._document_text(doc))
+            for doc_id, doc in zip(self.doc_ids, self.documents)
+        }
+        self._retired = 0
+        self._rebuild_lexical_index()
+        
+        base_index = self.create_index(embeddings.shape[1], len(embeddings))
+        self._train_index(base_index, embeddings)
+        if self._is_ivf():
+            # IVF lists store IDs natively; IndexIDMap2 cannot renumber them on removal
+            base_index.set_direct_map_type(self.env.faiss.DirectMap.Hashtable)
+            self.faiss_index = base_index
+        else:
+            self.faiss_index = self.env.faiss.IndexIDMap2(base_index)
+        self.faiss_index.add_with_ids(embeddings, np.asarray(self.doc_ids, dtype='int64'))
+        self.set_search_params()
+        return self.faiss_index
+    
+    # ------------------------------------------------------------------
+    # Stable document IDs and incremental updates
+    # ------------------------------------------------------------------
+    
+    def document_key(self, doc: Dict[str, Any]) -> str:
+        """Natural key of a document: explicit doc_id, else its question/title text."""
+        key = doc.get(self.ID_KEY)
+        if key is None or key == "":
+            key = doc.get(self.text_key, "")
+        return str(key)
+    
+    def document_id(self, doc_or_key: Union[Dict[str, Any], str, int]) -> int:
+        """Stable non-negative int64 FAISS ID derived from the document key."""
+        if isinstance(doc_or_key, int):
+            return doc_or_key
+        key = self.document_key(doc_or_key) if isinstance(doc_or_key, dict) else str(doc_or_key)
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'big') >> 1
+    
+    def _with_doc_key(self, doc: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy of the document with its natural key stored under ID_KEY."""
+        doc = dict(doc)
+        doc[self.ID_KEY] = self.document_key(doc)
+        return doc
+    
+    def _document_text(self, doc: Dict[str, Any]) -> str:
+        """Text that gets embedded for a document."""
+        return doc.get(self.text_key, "") + " " + doc.get("answer", "")
+    
+    @staticmethod
+    def _text_hash(text: str) -> str:
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+    
+    def _prepare_vectors(self, embeddings: 'np.ndarray') -> 'np.ndarray':
+        """Cast stored vectors to contiguous float32, normalized for inner product."""
+        embeddings = self.env.np.array(embeddings, dtype='float32', order='C', copy=True)
+        if embeddings.ndim == 1:
+            embeddings = embeddings.reshape(1, -1)
+        if self.metric == "ip":
+            self.env.faiss.normalize_L2(embeddings)
+        return embeddings
+    
+    def __contains__(self, doc_or_key) -> bool:
+        return self.document_id(doc_or_key) in self._positions
+    
+    def add_documents(
+        self,
+        documents: List[Dict[str, Any]],
+        embeddings: Optional['np.ndarray'] = None
+    ) -> List[int]:
+        """
+        Add new documents to the index without rebuilding it.
+        Documents whose ID is already indexed are skipped (use upsert to replace).
+        """
+        if self.env.faiss is None or self.env.np is None:
+            raise RuntimeError("FAISS or NumPy not available. Ensure environment is properly initialized.")
+        
+        new_docs, new_rows, seen = [], [], set()
+        for row, doc in enumerate(documents):
+            doc_id = self.document_id(doc)
+            if doc_id in self._positions or doc_id in seen:
+                continue
+            seen.add(doc_id)
+            new_docs.append(self._with_doc_key(doc))
+            new_rows.append(row)
+        
+        if not new_docs:
+            return []
+        
+        if embeddings is not None:
+            vectors = self.env.np.asarray(embeddings, dtype='float32')[new_rows]
+        else:
+            vectors = self.generate_embeddings([self._document_text(doc) for doc in new_docs])
+        
+        return self._apply_add(new_docs, vectors)
+    
+    def remove_documents(self, doc_ids: Iterable[Union[Dict[str, Any], str, int]]) -> int:
+        """Remove documents by doc dict, natural key or FAISS ID. Returns number removed."""
+        ids = []
+        for doc_or_key in doc_ids:
+            doc_id = self.document_id(doc_or_key)
+            if doc_id in self._positions and doc_id not in ids:
+                ids.append(doc_id)
+        
+        if ids:
+            self._apply_remove(ids)
+        return len(ids)
+    
+    def upsert(
+        self,
+        documents: List[Dict[str, Any]],
+        embeddings: Optional['np.ndarray'] = None
+    ) -> Dict[str, int]:
+        """
+        Insert new documents and replace changed ones.
+        Documents whose embedded text is unchanged keep their existing vector;
+        only their metadata is refreshed (and logged).
+        """
+        latest = {self.document_id(doc): (row, doc) for row, doc in enumerate(documents)}
+        
+        changed_ids, new_docs, new_rows, same_text = [], [], [], []
+        for doc_id, (row, doc) in latest.items():
+            doc = self._with_doc_key(doc)
+            text_hash = self._text_hash(self._document_text(doc))
+            if doc_id in self._positions:
+                if self._text_hashes.get(doc_id) == text_hash:
+                    same_text.append(doc)
+                    continue
+                changed_ids.append(doc_id)
+            new_docs.append(doc)
+            new_rows.append(row)
+        
+        if same_text:
+            self._apply_update(same_text)
+        if new_docs:
+            if embeddings is not None:
+                vectors = self.env.np.asarray(embeddings, dtype='float32')[new_rows]
+            else:
+                vectors = self.generate_embeddings([self._document_text(doc) for doc in new_docs])
+            if changed_ids:
+                self._apply_remove(changed_ids)
+            self._apply_add(new_docs, vectors)
+        
+        return {
+            'added': len(new_docs) - len(changed_ids),
+            'updated': len(changed_ids),
+            'unchanged': len(same_text)
+        }
+    
+    def _apply_update(self, documents: List[Dict[str, Any]], log: bool = True):
+        """Replace indexed documents' metadata in place, keeping their vectors."""
+        self.artifact_key = None
+        self._lexical_cache.clear()
+        ids = [self.document_id(doc) for doc in documents]
+        for doc_id, doc in zip(ids, documents):
+            self.documents[self._positions[doc_id]] = doc
+            self.lexical_index.remove(doc_id)
+            self.lexical_index.add(doc_id, self._lexical_text(doc))
+        
+        if log:
+            self._log_update(documents, ids)
+    
+    def _apply_add(
+        self,
+        documents: List[Dict[str, Any]],
+        vectors: 'np.ndarray',
+        log: bool = True
+    ) -> List[int]:
+        """Append documents and their vectors to the index and aligned arrays."""
+        self.artifact_key = None
+        np = self.env.np
+        vectors = self._prepare_vectors(vectors)
+        ids = [self.document_id(doc) for doc in documents]
+        
+        if self.faiss_index is None:
+            self.index_embeddings(vectors, ids=ids, documents=documents)
+        else:
+            start = len(self.doc_ids)
+            self.documents.extend(documents)
+            self.doc_ids.extend(ids)
+            self.embeddings = np.vstack([self.embeddings, vectors]) if len(self.embeddings) else vectors
+            for offset, (doc_id, doc) in enumerate(zip(ids, documents)):
+                self._positions[doc_id] = start + offset
+                self._text_hashes[doc_id] = self._text_hash(self._document_text(doc))
+                self.lexical_index.add(doc_id, self._lexical_text(doc))
+            self._lexical_cache.clear()
+            self.faiss_index.add_with_ids(vectors, np.asarray(ids, dtype='int64'))
+        
+        if log:
+            self._log_add(documents, ids, vectors)
+        return ids
+    
+    def _apply_remove(self, ids: List[int], log: bool = True):
+        """Drop documents from the index (or retire their HNSW vectors) and swap-remove rows."""
+        self.artifact_key = None
+        np = self.env.np
+        
+        if self._is_ivf():
+            id_array = np.asarray(ids, dtype='int64')
+            self.faiss_index.remove_ids(
+                self.env.faiss.IDSelectorArray(len(id_array), self.env.faiss.swig_ptr(id_array))
+            )
+        elif self._supports_remove():
+            self.faiss_index.remove_ids(np.asarray(ids, dtype='int64'))
+        else:
+            # Relabel the vectors -1 so searches skip them; the ID can then be added again
+            id_map = self.faiss_index.id_map
+            labels = self.env.faiss.rev_swig_ptr(id_map.data(), id_map.size())
+            retired = np.isin(labels, np.asarray(ids, dtype='int64'))
+            labels[retired] = -1
+            self._retired += int(retired.sum())
+        
+        self._lexical_cache.clear()
+        for doc_id in ids:
+            pos = self._positions.pop(doc_id)
+            self._text_hashes.pop(doc_id, None)
+            self.lexical_index.remove(doc_id)
+            last = len(self.doc_ids) - 1
+            if pos != last:
+                moved_id = self.doc_ids[last]
+                self.doc_ids[pos] = moved_id
+                self.documents[pos] = self.documents[last]
+                self.embeddings[pos] = self.embeddings[last]
+                self._positions[moved_id] = pos
+            self.doc_ids.pop()
+            self.documents.pop()
+            self.embeddings = self.embeddings[:last]
+        
+        if self._retired > self.MAX_RETIRED_FRACTION * len(self.doc_ids):
+            self._rebuild_from_embeddings()
+        if log:
+            self._log_remove(ids)
+    
+    def _is_ivf(self) -> bool:
+        return self.index_type.startswith("ivf")
+    
+    def _supports_remove(self) -> bool:
+        """FAISS HNSW graphs do not implement remove_ids."""
+        return self.index_type != "hnsw"
+    
+    def _rebuild_from_embeddings(self):
+        """Rebuild the index from the preserved embeddings (no re-encoding)."""
+        print(f"   ♻️  Rebuilding {self.index_type} index from {len(self.doc_ids)} stored embeddings...")
+        self.index_embeddings(self.embeddings, ids=list(self.doc_ids), documents=self.documents)
+    
+    # ------------------------------------------------------------------
+    # Snapshot + append-only delta log
+    # ------------------------------------------------------------------
+    
+    def _store_path(self, name: str) -> Path:
+        if self.store_dir is None:
+            raise RuntimeError("No store_dir configured for this vector database.")
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        return self.store_dir / name
+    
+    def _log_add(self, documents: List[Dict[str, Any]], ids: List[int], vectors: 'np.ndarray'):
+        if self.store_dir is None:
+            return
+        
+        vector_path = self._store_path(self.DELTA_VECTORS)
+        row_bytes = vectors.shape[1] * 4
+        first_row = vector_path.stat().st_size // row_bytes if vector_path.exists() else 0
+        with open(vector_path, 'ab') as f:
+            f.write(self.env.np.ascontiguousarray(vectors, dtype='<f4').tobytes())
+        
+        with open(self._store_path(self.DELTA_LOG), 'a') as f:
+            for offset, (doc_id, doc) in enumerate(zip(ids, documents)):
+                f.write(json.dumps({'op': 'add', 'id': doc_id, 'row': first_row + offset, 'doc': doc}) + "\n")
+        self._record_ops(len(ids))
+    
+    def _log_update(self, documents: List[Dict[str, Any]], ids: List[int]):
+        if self.store_dir is None:
+            return
+        
+        with open(self._store_path(self.DELTA_LOG), 'a') as f:
+            for doc_id, doc in zip(ids, documents):
+                f.write(json.dumps({'op': 'update', 'id': doc_id, 'doc': doc}) + "\n")
+        self._record_ops(len(ids))
+    
+    def _log_remove(self, ids: List[int]):
+        if self.store_dir is None:
+            return
+        
+        with open(self._store_path(self.DELTA_LOG), 'a') as f:
+            for doc_id in ids:
+                f.write(json.dumps({'op': 'remove', 'id': doc_id}) + "\n")
+        self._record_ops(len(ids))
+    
+    def _record_ops(self, count: int):
+        self._pending_ops += count
+        if self._pending_ops >= self.COMPACT_EVERY:
+            self.compact()
+    
+    def compact(self):
+        """Write a fresh snapshot of the current state and truncate the delta log."""
+        if self.faiss_index is None:
+            raise RuntimeError("FAISS index not built. Nothing to compact.")
+        
+        if self._retired:
+            self._rebuild_from_embeddings()
+        
+        np = self.env.np
+        atomic_write(self._store_path(self.SNAPSHOT_INDEX), lambda p: self.env.faiss.write_index(self.faiss_index, str(p)))
+        
+        def write_array(array):
+            def write(p):
+                with open(p, 'wb') as f:
+                    np.save(f, array)
+            return write
+        
+        atomic_write(self._store_path(self.SNAPSHOT_EMBEDDINGS), write_array(self.embeddings))
+        atomic_write(self._store_path(self.SNAPSHOT_IDS), write_array(np.asarray(self.doc_ids, dtype='int64')))
+        
+        def write_documents(p):
+            with open(p, 'w') as f:
+                json.dump({'text_key': self.text_key, 'documents': self.documents}, f)
+        
+        atomic_write(self._store_path(self.SNAPSHOT_DOCUMENTS), write_documents)
+        
+        for name in (self.DELTA_LOG, self.DELTA_VECTORS):
+            self._store_path(name).unlink(missing_ok=True)
+        self._pending_ops = 0
+        print(f"   🗜️  Compacted vector store: {len(self.doc_ids)} documents → {self.store_dir}")
+    
+    def load_store(self) -> bool:
+        """Load the last snapshot and replay the delta log. Returns False if none exists."""
+        if self.env.faiss is None or self.env.np is None:
+            raise RuntimeError("FAISS or NumPy not available. Ensure environment is properly initialized.")
+        
+        index_path = self._store_path(self.SNAPSHOT_INDEX)
+        if not index_path.exists():
+            return False
+        
+        np = self.env.np
+        with open(self._store_path(self.SNAPSHOT_DOCUMENTS)) as f:
+            snapshot = json.load(f)
+        
+        self.text_key = snapshot.get('text_key', self.text_key)
+        self.documents = snapshot['documents']
+        self.embeddings = np.load(self._store_path(self.SNAPSHOT_EMBEDDINGS))
+        self.doc_ids = [int(i) for i in np.load(self._store_path(self.SNAPSHOT_IDS))]
+        self._positions = {doc_id: pos for pos, doc_id in enumerate(self.doc_ids)}
+        self._text_hashes = {
+            doc_id: self._text_hash(self._document_text(doc))
+            for doc_id, doc in zip(self.doc_ids, self.documents)
+        }
+        self._retired = 0
+        self._rebuild_lexical_index()
+        self.faiss_index = self.env.faiss.read_index(str(index_path))
+        self.set_search_params()
+        
+        replayed = self._replay_delta_log()
+        print(f"   ✅ Loaded vector store: {len(self.doc_ids)} documents "
+              f"({replayed} delta operations replayed)")
+        return True
+    
+    def _replay_delta_log(self) -> int:
+        """Apply logged operations on top of the snapshot without re-logging them."""
+        log_path = self._store_path(self.DELTA_LOG)
+        if not log_path.exists():
+            return 0
+        
+        np = self.env.np
+        dimension = self.embeddings.shape[1]
+        vector_path = self._store_path(self.DELTA_VECTORS)
+        vectors = None
+        if vector_path.exists() and vector_path.stat().st_size:
+            vectors = np.memmap(vector_path, dtype='<f4', mode='r').reshape(-1, dimension)
+        
+        replayed = 0
+        with open(log_path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if entry['op'] == 'add':
+                    if entry['id'] in self._positions:
+                        self._apply_remove([entry['id']], log=False)
+                    self._apply_add([entry['doc']], np.array(vectors[entry['row']]), log=False)
+                elif entry['op'] == 'update' and entry['id'] in self._positions:
+                    self._apply_update([entry['doc']], log=False)
+                elif entry['op'] == 'remove' and entry['id'] in self._positions:
+                    self._apply_remove([entry['id']], log=False)
+                replayed += 1
+        
+        self._pending_ops = replayed
+        return replayed
+    
+    def create_index(
+        self,
+        dimension: int,
+        n_vectors: int,
+        index_type: Optional[str] = None
+    ):
+        """Create an (untrained) FAISS index for the configured type and metric."""
+        faiss = self.env.faiss
+        if faiss is None:
+            raise RuntimeError("FAISS not available. Ensure environment is properly initialized.")
+        
+        index_type = (index_type or self.index_type).lower()
+        metric = faiss.METRIC_INNER_PRODUCT if self.metric == "ip" else faiss.METRIC_L2
+        
+        if index_type == "flat":
+            if self.metric == "ip":
+                return faiss.IndexFlatIP(dimension)
+            return faiss.IndexFlatL2(dimension)
+        
+        if index_type == "hnsw":
+            index = faiss.IndexHNSWFlat(dimension, self.hnsw_m, metric)
+            index.hnsw.efConstruction = self.HNSW_EF_CONSTRUCTION
+            return index
+        
+        # IVF variants: clustering cannot use more centroids than training points
+        nlist = max(1, min(self.nlist, n_vectors))
+        if self.metric == "ip":
+            quantizer = faiss.IndexFlatIP(dimension)
+        else:
+            quantizer = faiss.IndexFlatL2(dimension)
+        
+        if index_type == "ivf_flat":
+            return faiss.IndexIVFFlat(quantizer, dimension, nlist, metric)
+        
+        if index_type == "ivf_pq":
+            pq_m = self._resolve_pq_m(dimension)
+            # Each sub-quantizer needs at least 2**nbits training points
+            pq_nbits = self.pq_nbits
+            while pq_nbits > 1 and 2 ** pq_nbits > n_vectors:
+                pq_nbits -= 1
+            return faiss.IndexIVFPQ(quantizer, dimension, nlist, pq_m, pq_nbits, metric)
+        
+        raise ValueError(f"Unknown index type '{index_type}'. Choose from {self.INDEX_TYPES}")
+    
+    def _resolve_pq_m(self, dimension: int) -> int:
+        """Largest sub-quantizer count <= pq_m that divides the dimension."""
+        for m in range(min(self.pq_m, dimension), 0, -1):
+            if dimension % m == 0:
+                return m
+        return 1
+    
+    def _train_index(self, index, embeddings: 'np.ndarray'):
+        """Train the index on a random sample of the embeddings if required."""
+        if index.is_trained:
+            return
+        
+        np = self.env.np
+        sample = embeddings
+        if len(embeddings) > self.train_sample_size:
+            rng = np.random.default_rng(42)
+            rows = rng.choice(len(embeddings), size=self.train_sample_size, replace=False)
+            sample = embeddings[rows]
+        
+        print(f"   Training index on {len(sample)} vectors...")
+        index.train(sample)
+    
+    def set_search_params(self, nprobe: Optional[int] = None, ef_search: Optional[int] = None, index=None):
+        """Apply nprobe (IVF) / efSearch (HNSW) query-time knobs."""
+        if nprobe is not None:
+            self.nprobe = nprobe
+        if ef_search is not None:
+            self.ef_search = ef_search
+        
+        index = index if index is not None else self.faiss_index
+        if index is None:
+            return
+        
+        faiss = self.env.faiss
+        try:
+            faiss.extract_index_ivf(index).nprobe = self.nprobe
+        except (RuntimeError, AttributeError):
+            pass
+        
+        hnsw_index = faiss.downcast_index(index)
+        if isinstance(hnsw_index, (faiss.IndexIDMap, faiss.IndexIDMap2)):
+            hnsw_index = faiss.downcast_index(hnsw_index.index)
+        if hasattr(hnsw_index, "hnsw"):
+            hnsw_index.hnsw.efSearch = self.ef_search
+    
+    def _prepare_queries(self, query_embeddings: 'np.ndarray') -> 'np.ndarray':
+        """Cast queries to float32 and normalize them for inner-product search."""
+        queries = self.env.np.ascontiguousarray(query_embeddings, dtype='float32')
+        if queries.ndim == 1:
+            queries = queries.reshape(1, -1)
+        if self.metric == "ip":
+            queries = queries.copy()
+            self.env.faiss.normalize_L2(queries)
+        return queries
+    
+    def _to_similarity(self, dist: float) -> float:
+        """Convert a raw FAISS score to a similarity in which higher is better."""
+        if self.metric == "ip":
+            return float(dist)
+        return float(1 / (1 + dist))
+    
     def search(self, query: str, top_k: int = None) -> List[Dict[str, Any]]:
         """Search for similar documents."""
         if top_k is None:
@@ -78,23 +795,119 @@ class JobFitmentVectorDB:
             raise RuntimeError("FAISS index not built. Call build_index() first.")
         
         # Generate query embedding
-        query_embedding = self.embedding_model.encode(
+        query_embedding = self._prepare_queries(self.embedding_model.encode(
             [query], 
             convert_to_numpy=True
-        ).astype('float32')
+        ))
+        self.stats['dense_queries'] += 1
+        self.stats['embeddings_computed'] += 1
+        self.stats['documents_searched'] += self.faiss_index.ntotal
         
-        # Search FAISS
-        distances, indices = self.faiss_index.search(query_embedding, top_k)
+        # Search FAISS (over-fetch to skip retired HNSW vectors)
+        distances, indices = self.faiss_index.search(query_embedding, top_k + self._retired)
         
         # Get results with scores
         results = []
         for dist, idx in zip(distances[0], indices[0]):
-            if idx < len(self.documents):
-                doc = self.documents[idx].copy()
-                doc['similarity_score'] = float(1 / (1 + dist))
+            pos = self._positions.get(int(idx))
+            if pos is not None:
+                doc = self.documents[pos].copy()
+                doc['similarity_score'] = self._to_similarity(dist)
                 doc['distance'] = float(dist)
                 results.append(doc)
+                if len(results) == top_k:
+                    break
+        
+        return results
+    
+    # ------------------------------------------------------------------
+    # Lexical and hybrid retrieval
+    # ------------------------------------------------------------------
+    
+    def _lexical_text(self, doc: Dict[str, Any]) -> str:
+        return " ".join(str(doc.get(field, "")) for field in self.LEXICAL_FIELDS)
+    
+    def _rebuild_lexical_index(self):
+        self.lexical_index = BM25Index()
+        self.lexical_index.add_many(
+            (doc_id, self._lexical_text(doc)) for doc_id, doc in zip(self.doc_ids, self.documents)
+        )
+        self._lexical_cache.clear()
+    
+    def _lexical_ranking(self, terms: Tuple[str, ...], top_k: int) -> List[Tuple[int, float]]:
+        """BM25 (doc ID, score) list, served from an LRU cache while the index is unchanged."""
+        key = (terms, top_k)
+        ranking = self._lexical_cache.get(key)
+        if ranking is not None:
+            self._lexical_cache.move_to_end(key)
+            self.stats['lexical_cache_hits'] += 1
+            return ranking
+        
+        ranking = self.lexical_index.search(terms, top_k)
+        self.stats['lexical_queries'] += 1
+        self._lexical_cache[key] = ranking
+        if len(self._lexical_cache) > self.LEXICAL_CACHE_SIZE:
+            self._lexical_cache.popitem(last=False)
+        return ranking
+    
+    def lexical_search(self, query: str, top_k: int = None) -> List[Dict[str, Any]]:
+        """BM25 search on exact terms; never touches the embedding model."""
+        if top_k is None:
+            top_k = self.TOP_K
+        results = []
+        for doc_id, score in self._lexical_ranking(tuple(sorted(set(tokenize(query)))), top_k):
+            doc = self.documents[self._positions[doc_id]].copy()
+            doc['similarity_score'] = doc['bm25_score'] = score
+            results.append(doc)
+        return results
+    
+    def is_lexical_query(self, query: str, vocabulary: Iterable[str]) -> bool:
+        """
+        True when every query term is in the given vocabulary (e.g. skill-name
+        terms) and in the BM25 index, so dense retrieval has nothing to add.
+        """
+        terms = tokenize(query)
+        vocabulary = vocabulary if isinstance(vocabulary, (set, frozenset)) else set(vocabulary)
+        return bool(terms) and all(t in vocabulary and t in self.lexical_index for t in terms)
+    
+    def hybrid_search(
+        self,
+        query: str,
+        top_k: int = None,
+        lexical_vocabulary: Optional[Iterable[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Fuse BM25 and dense rankings with reciprocal-rank fusion.
+        Queries made only of lexical_vocabulary terms are answered from
+        BM25 alone, skipping the encoder.
         
+        Results are ordered by 'rrf_score'; 'similarity_score' stays the dense
+        similarity (None for documents only BM25 retrieved) and 'bm25_score' the
+        lexical score (None for documents only the dense search retrieved).
+        """
+        if top_k is None:
+            top_k = self.TOP_K
+        
+        if lexical_vocabulary is not None and self.is_lexical_query(query, lexical_vocabulary):
+            self.stats['lexical_only'] += 1
+            return self.lexical_search(query, top_k)
+        
+        self.stats['hybrid'] += 1
+        candidates = top_k * self.CANDIDATE_MULTIPLIER
+        lexical = self._lexical_ranking(tuple(sorted(set(tokenize(query)))), candidates)
+        dense = self.search(query, candidates)
+        
+        bm25_scores = dict(lexical)
+        dense_docs = {self.document_id(doc): doc for doc in dense}
+        fused = reciprocal_rank_fusion([[doc_id for doc_id, _ in lexical], list(dense_docs)])
+        
+        results = []
+        for doc_id, score in fused[:top_k]:
+            doc = dense_docs.get(doc_id) or self.documents[self._positions[doc_id]].copy()
+            doc.setdefault('similarity_score', None)
+            doc['bm25_score'] = bm25_scores.get(doc_id)
+            doc['rrf_score'] = score
+            results.append(doc)
         return results
     
     def embed_query(self, query: str) -> 'np.ndarray':
@@ -105,8 +918,84 @@ class JobFitmentVectorDB:
         if self.embedding_model is None:
             raise RuntimeError("Embedding model not loaded. Cannot embed query.")
         
+        self.stats['embeddings_computed'] += 1
         return self.embedding_model.encode([query], convert_to_numpy=True).astype('float32')[0]
     
+    def benchmark(
+        self,
+        query_embeddings: 'np.ndarray',
+        k: int = 10,
+        index_types: Optional[List[str]] = None,
+        nprobe_values: Optional[List[int]] = None,
+        ef_search_values: Optional[List[int]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Measure recall@k and per-query latency of ANN indexes against the exact index.
+        
+        Uses the embeddings already indexed via build_index()/index_embeddings().
+        Returns one row per (index type, search knob) combination.
+        """
+        if self.embeddings is None:
+            raise RuntimeError("Embeddings not generated. Call build_index() first.")
+        
+        np = self.env.np
+        index_types = index_types or list(self.INDEX_TYPES)
+        nprobe_values = nprobe_values or [self.nprobe]
+        ef_search_values = ef_search_values or [self.ef_search]
+        queries = self._prepare_queries(query_embeddings)
+        k = min(k, len(self.embeddings))
+        
+        def timed_search(index):
+            start = time.perf_counter()
+            _, ids = index.search(queries, k)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            return ids, elapsed_ms / len(queries)
+        
+        exact = self.create_index(self.embeddings.shape[1], len(self.embeddings), "flat")
+        exact.add(self.embeddings)
+        exact_ids, exact_latency = timed_search(exact)
+        
+        rows = []
+        for index_type in index_types:
+            build_start = time.perf_counter()
+            index = self.create_index(self.embeddings.shape[1], len(self.embeddings), index_type)
+            self._train_index(index, self.embeddings)
+            index.add(self.embeddings)
+            build_s = time.perf_counter() - build_start
+            
+            if index_type.startswith("ivf"):
+                knobs = [("nprobe", v) for v in nprobe_values]
+            elif index_type == "hnsw":
+                knobs = [("efSearch", v) for v in ef_search_values]
+            else:
+                knobs = [(None, None)]
+            
+            for knob, value in knobs:
+                if knob == "nprobe":
+                    self.set_search_params(nprobe=value, index=index)
+                elif knob == "efSearch":
+                    self.set_search_params(ef_search=value, index=index)
+                
+                ids, latency_ms = timed_search(index)
+                hits = sum(
+                    len(set(approx[approx >= 0]) & set(truth))
+                    for approx, truth in zip(ids, exact_ids)
+                )
+                rows.append({
+                    'index_type': index_type,
+                    'metric': self.metric,
+                    'param': knob,
+                    'value': value,
+                    f'recall@{k}': round(hits / (len(queries) * k), 4),
+                    'latency_ms': round(latency_ms, 4),
+                    'exact_latency_ms': round(exact_latency, 4),
+                    'build_s': round(build_s, 3),
+                })
+        
+        # Restore the knobs of the live index
+        self.set_search_params()
+        return rows
+    
     def save_index(self, filename: str = "job_fitment.faiss"):
         """Save FAISS index to file."""
         if self.faiss_index is None:
@@ -119,13 +1008,19 @@ class JobFitmentVectorDB:
             raise RuntimeError("Embeddings not generated. Nothing to save.")
         
         filepath = OUTPUT_DIR / filename
+        emb_path = OUTPUT_DIR / "embeddings.npy"
+        manifest = ArtifactManifest(OUTPUT_DIR)
+        if manifest.is_current(filepath, self.artifact_key) and manifest.is_current(emb_path, self.artifact_key):
+            print(f"✅ Up to date: {filepath}")
+            return str(filepath)
+        
         self.env.faiss.write_index(self.faiss_index, str(filepath))
+        manifest.record(filepath, self.artifact_key)
         print(f"✅ Saved: {filepath}")
         
         # Save embeddings
-        emb_path = OUTPUT_DIR / "embeddings.npy"
         self.env.np.save(emb_path, self.embeddings)
+        manifest.record(emb_path, self.artifact_key)
         print(f"✅ Saved: {emb_path}")
         
         return str(filepath)
-
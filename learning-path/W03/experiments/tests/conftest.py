@@ -0,0 +1,56 @@
+"""
+Shared fixtures for tests that run without the transformer stack.
+The sentence-transformer model is replaced by a deterministic hashing encoder,
+so only NumPy and FAISS need to be installed.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# One hashing encoder for the tests and the benchmarks (imported by test modules from here)
+from benchmarks.synthetic import HashingEncoder
+
+
+@pytest.fixture
+def offline_agent():
+    """A JobFitmentAgent wired up like setup(), minus package and model loading."""
+    pytest.importorskip("faiss")
+    pytest.importorskip("numpy")
+
+    from src.job_fitment import (
+        EnvironmentConfig,
+        FitmentScorer,
+        JobFitmentAgent,
+        JobFitmentAnalyzer,
+        JobFitmentPromptEngineer,
+        JobFitmentRAGPipeline,
+        JobFitmentVectorDB,
+        KnowledgeBaseGenerator,
+        SkillSimilarityTable,
+    )
+
+    env = EnvironmentConfig()
+
+    agent = JobFitmentAgent()
+    agent.env = env
+    agent.prompt_engineer = JobFitmentPromptEngineer(env)
+    agent.prompt_engineer.create_system_prompt()
+    agent.knowledge_base_gen = KnowledgeBaseGenerator(env)
+    knowledge_base = agent.knowledge_base_gen.generate_full_knowledge_base()
+
+    agent.vector_db = JobFitmentVectorDB(env)
+    agent.vector_db.embedding_model = HashingEncoder()
+    agent.vector_db.build_index(knowledge_base)
+
+    agent.skill_table = SkillSimilarityTable(env, encoder=agent.vector_db.generate_embeddings)
+    agent.skill_table.build(agent.knowledge_base_gen.skill_categories)
+    agent.analyzer = JobFitmentAnalyzer(env, agent.vector_db, agent.skill_table)
+    agent.pipeline = JobFitmentRAGPipeline(env, agent.prompt_engineer, agent.vector_db, agent.analyzer)
+    agent.scorer = FitmentScorer(env)
+    agent.initialized = True
+    return agent
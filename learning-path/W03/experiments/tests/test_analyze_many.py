@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Tests for cohort analysis with JobFitmentAgent.analyze_many().
+"""
+
+import copy
+
+import pytest
+
+from src.job_fitment import JobFitmentAgent, OUTPUT_DIR, create_sample_jobs, create_sample_profile
+
+
+def make_cohort(n: int = 6):
+    base = create_sample_profile()
+    cohort = []
+    for i in range(n):
+        profile = copy.deepcopy(base)
+        profile.name = f"Student {i}"
+        profile.skills = base.skills[: 4 + i]
+        cohort.append(profile)
+    return cohort
+
+
+def test_analyze_many_matches_sequential_analysis(offline_agent):
+    """Parallel results equal per-profile analyze() results and each report is written."""
+    cohort = make_cohort()
+    jobs = create_sample_jobs()
+
+    streamed = dict(
+        (profile.name, results)
+        for profile, results in offline_agent.analyze_many(cohort, jobs, workers=3)
+    )
+    assert sorted(streamed) == sorted(p.name for p in cohort)
+
+    for i, profile in enumerate(cohort):
+        expected = offline_agent.analyze(profile, jobs, generate_report=False, verbose=False)
+        got = streamed[profile.name]
+        assert [(r.job.job_id, r.fitment_score) for r in got] == \
+               [(r.job.job_id, r.fitment_score) for r in expected]
+
+        report = OUTPUT_DIR / offline_agent.report_filename(profile, i)
+        assert report.exists() and profile.name in report.read_text()
+
+
+def test_analyze_many_single_worker_runs_in_process(offline_agent):
+    cohort = make_cohort(2)
+    results = list(offline_agent.analyze_many(cohort, create_sample_jobs(), workers=1, generate_reports=False))
+    assert [p.name for p, _ in results] == [p.name for p in cohort]
+
+
+def test_analyze_many_validates_before_iteration(offline_agent):
+    """Bad arguments raise at the call, not on the first next()."""
+    with pytest.raises(ValueError):
+        offline_agent.analyze_many(make_cohort(2), create_sample_jobs(), workers=0)
+
+    agent = JobFitmentAgent()
+    with pytest.raises(RuntimeError):
+        agent.analyze_many(make_cohort(2), create_sample_jobs())
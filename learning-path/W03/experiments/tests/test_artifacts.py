@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for content-addressed knowledge base and index artifacts.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+pytest.importorskip("faiss")
+
+from conftest import HashingEncoder
+from src.job_fitment import EnvironmentConfig, JobFitmentVectorDB, KnowledgeBaseGenerator
+
+
+def test_knowledge_base_generates_each_section_once(monkeypatch):
+    generator = KnowledgeBaseGenerator(EnvironmentConfig())
+    calls = []
+    original = generator.generate_skill_qa_pairs
+    monkeypatch.setattr(generator, "generate_skill_qa_pairs", lambda: calls.append(1) or original())
+
+    generator.generate_full_knowledge_base()
+    assert len(calls) == 1
+
+
+def test_knowledge_base_is_reused_until_inputs_change(tmp_path, monkeypatch):
+    env = EnvironmentConfig()
+    first = KnowledgeBaseGenerator(env)
+    kb = first.load_or_generate(tmp_path)
+
+    second = KnowledgeBaseGenerator(env)
+    monkeypatch.setattr(second, "generate_full_knowledge_base", lambda: pytest.fail("should hit the cache"))
+    assert second.load_or_generate(tmp_path) == kb
+    assert second.content_key == first.content_key
+
+    third = KnowledgeBaseGenerator(env)
+    third.skill_categories["programming_languages"].append("Zig")
+    assert third.content_hash() != first.content_hash()
+    assert len(third.load_or_generate(tmp_path)) == len(kb) + 2
+
+
+def test_index_and_embeddings_are_keyed_on_the_knowledge_base(tmp_path):
+    env = EnvironmentConfig()
+    generator = KnowledgeBaseGenerator(env)
+    kb = generator.load_or_generate(tmp_path)
+
+    first = JobFitmentVectorDB(env)
+    first.embedding_model = HashingEncoder()
+    first.build_index_cached(kb, generator.content_key, cache_dir=tmp_path)
+    assert first.embedding_model.encoded == len(kb)
+
+    # Same inputs: the snapshot is loaded, nothing is embedded
+    second = JobFitmentVectorDB(env)
+    second.embedding_model = HashingEncoder()
+    second.build_index_cached(kb, generator.content_key, cache_dir=tmp_path)
+    assert second.embedding_model.encoded == 0
+    assert second.faiss_index.ntotal == len(kb)
+    assert second.artifact_key == first.artifact_key
+
+    query = "How can I learn Python?"
+    assert [d['question'] for d in second.search(query, 3)] == [d['question'] for d in first.search(query, 3)]
+
+    # New index type: embeddings are reused, only the index is rebuilt
+    third = JobFitmentVectorDB(env, index_type="hnsw")
+    third.embedding_model = HashingEncoder()
+    third.build_index_cached(kb, generator.content_key, cache_dir=tmp_path)
+    assert third.embedding_model.encoded == 0
+    assert third.artifact_key != first.artifact_key
+
+    # Mutations invalidate the key, so later saves are not skipped
+    third.remove_documents([kb[0]])
+    assert third.artifact_key is None
+
+
+def test_artifact_keys_follow_the_loaded_encoder():
+    """A swapped encoder never shares cached embeddings or indexes with the real model."""
+    env = EnvironmentConfig()
+    real = JobFitmentVectorDB(env)
+    hashed = JobFitmentVectorDB(env)
+    hashed.embedding_model = HashingEncoder()
+    wider = JobFitmentVectorDB(env)
+    wider.embedding_model = HashingEncoder(dim=512)
+
+    keys = {db.artifact_keys("kb-key") for db in (real, hashed, wider)}
+    assert len({embeddings_key for embeddings_key, _ in keys}) == 3
+    assert real.encoder_identity() == (real.EMBEDDING_MODEL, real.EMBEDDING_DIM)
+    assert hashed.encoder_identity()[1] == 256
+
+
+def test_save_skips_unchanged_exports(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr("src.job_fitment.knowledge_base.OUTPUT_DIR", tmp_path)
+    generator = KnowledgeBaseGenerator(EnvironmentConfig())
+    generator.load_or_generate(tmp_path / "cache")
+
+    generator.save_knowledge_base()
+    generator.save_knowledge_base()
+    output = capsys.readouterr().out
+    assert output.count("✅ Saved:") == 1 and output.count("✅ Up to date:") == 1
+
+    generator.content_key = None  # unknown provenance: always write
+    generator.save_knowledge_base()
+    assert "✅ Saved:" in capsys.readouterr().out
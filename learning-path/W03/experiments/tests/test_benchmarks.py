@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Smoke test for the benchmark suite and its regression gate.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+pytest.importorskip("faiss")
+
+from benchmarks.fitment_suite import check_regressions, run_suite
+
+
+def test_suite_records_every_stage(tmp_path):
+    report = run_suite([50], queries=5, output_dir=tmp_path)
+
+    stages = {(row['scale'], row['stage']) for row in report['results']}
+    assert {("setup", "kb_generation"), ("setup", "embedding"), ("setup", "index_build"),
+            (50, "scoring"), (50, "retrieval"), (50, "report")} <= stages
+    assert all(row['seconds'] >= 0 and 'peak_rss_mb' in row for row in report['results'])
+    assert (tmp_path / "report_50_0.md").exists()
+
+
+def test_regression_gate():
+    baseline = {'results': [
+        {'scale': 1000, 'stage': 'scoring', 'seconds': 1.0},
+        {'scale': 1000, 'stage': 'report', 'seconds': 0.001},
+    ]}
+    current = {'results': [
+        {'scale': 1000, 'stage': 'scoring', 'seconds': 1.5},
+        {'scale': 1000, 'stage': 'report', 'seconds': 0.01},   # below the noise floor
+        {'scale': 10000, 'stage': 'scoring', 'seconds': 9.0},  # no baseline
+    ]}
+
+    regressions = check_regressions(current, baseline, threshold=0.2)
+    assert len(regressions) == 1 and regressions[0].startswith("scoring @ 1000")
+    assert check_regressions(current, baseline, threshold=0.6) == []
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Tests for lazy library resolution in EnvironmentConfig.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.job_fitment import EnvironmentConfig
+
+
+def test_libraries_resolve_on_first_access_only():
+    """Creating the config and checking packages imports nothing heavy."""
+    env = EnvironmentConfig()
+    env.import_libraries()
+    assert not env.is_imported("torch")
+    assert not env.is_imported("SentenceTransformer")
+
+    np = env.np
+    assert env.is_imported("np")
+    assert np is None or np.__name__ == "numpy"
+
+
+def test_missing_library_resolves_to_none_and_can_be_overridden():
+    env = EnvironmentConfig()
+    env.faiss = None
+    assert env.faiss is None
+    # The override is per instance; new configs still resolve lazily
+    fresh = EnvironmentConfig()
+    assert (fresh.faiss is not None) == EnvironmentConfig.is_available("faiss")
+
+
+def test_availability_check_does_not_import():
+    assert EnvironmentConfig.is_available("json")
+    assert not EnvironmentConfig.is_available("definitely_not_a_real_module_xyz")
+    assert "definitely_not_a_real_module_xyz" not in sys.modules
+
+
+def test_install_packages_reports_packages_pip_did_not_install(monkeypatch, capsys):
+    """A failed pip run is reported per package instead of claiming success."""
+    installed = {"numpy"}
+    monkeypatch.setattr(EnvironmentConfig, "PACKAGES", {"numpy": "numpy", "pandas": "pandas", "faiss-cpu": "faiss"})
+    monkeypatch.setattr(EnvironmentConfig, "is_available", staticmethod(lambda module: module in installed))
+
+    def fake_pip(args, check):
+        installed.add("pandas")  # faiss-cpu fails to build
+        return subprocess.CompletedProcess(args, returncode=1)
+
+    monkeypatch.setattr(subprocess, "run", fake_pip)
+    failed = EnvironmentConfig().install_packages()
+
+    assert failed == ["faiss-cpu"]
+    out = capsys.readouterr().out
+    assert "1 package(s) installed" in out
+    assert "status 1" in out and "faiss-cpu" in out
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Tests for async LLM fitment explanations: concurrency cap, coalescing,
+prompt-hash cache and template fallback, against fake and local stub servers.
+"""
+
+import asyncio
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.job_fitment import (
+    EnvironmentConfig,
+    FitmentExplainer,
+    FitmentResult,
+    JobFitmentPromptEngineer,
+    JobPosting,
+    StudentProfile,
+)
+
+
+class FakeAsyncClient:
+    """Mimics openai.AsyncOpenAI().chat.completions.create() with a configurable delay."""
+
+    def __init__(self, delay: float = 0.01, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, model, messages, temperature, max_tokens):
+        self.calls += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail:
+                raise ConnectionError("server down")
+        finally:
+            self.active -= 1
+        job_line = messages[-1]['content'].split("JOB POSTING")[1].splitlines()[1]
+        message = SimpleNamespace(content=f"Explained: {job_line[:40]}")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def make_results(n: int, distinct: int = None):
+    distinct = distinct or n
+    results = []
+    for i in range(n):
+        job = JobPosting(f"J-{i % distinct}", f"Engineer {i % distinct}", "Acme", 1)
+        results.append(FitmentResult(
+            job=job, fitment_score=70.0, skill_matches=["python"], skill_gaps=["go"],
+            experience_match=60.0, education_match=80.0, location_match=True,
+            recommendations=["Learn go"], priority_level=1, profile_name="Sam",
+        ))
+    return results
+
+
+@pytest.fixture
+def profile():
+    return StudentProfile(name="Sam", skills=["Python"])
+
+
+@pytest.fixture
+def explainer_factory(tmp_path):
+    env = EnvironmentConfig()
+    prompt_engineer = JobFitmentPromptEngineer(env)
+    prompt_engineer.create_system_prompt()
+
+    def make(client, **options):
+        options.setdefault('cache_dir', tmp_path)
+        return FitmentExplainer(env, prompt_engineer, client=client, **options)
+
+    return make
+
+
+def test_concurrency_is_bounded_and_order_preserved(explainer_factory, profile):
+    client = FakeAsyncClient(delay=0.02)
+    explainer = explainer_factory(client, max_concurrency=3)
+    results = make_results(10)
+
+    explanations = explainer.explain_results(profile, results)
+
+    assert client.calls == 10
+    assert client.max_active == 3
+    for i, (result, text) in enumerate(zip(results, explanations)):
+        assert f"Engineer {i}" in text
+        assert result.analysis_text == text
+        assert text.startswith("## Fitment Analysis: Sam")
+
+
+def test_identical_prompts_are_coalesced(explainer_factory, profile):
+    client = FakeAsyncClient(delay=0.02)
+    explainer = explainer_factory(client)
+
+    explanations = explainer.explain_results(profile, make_results(6, distinct=2))
+
+    assert client.calls == 2
+    assert explainer.stats['coalesced'] == 4
+    assert explanations[0] == explanations[2] == explanations[4]
+
+
+def test_cache_persists_across_instances(explainer_factory, profile):
+    first = explainer_factory(FakeAsyncClient())
+    first.explain_results(profile, make_results(3))
+
+    client = FakeAsyncClient()
+    second = explainer_factory(client)
+    second.explain_results(profile, make_results(3))
+
+    assert client.calls == 0
+    assert second.stats['cache_hits'] == 3
+
+    # A different model is a different prompt key
+    other = explainer_factory(client, model="other-model")
+    other.explain_results(profile, make_results(1))
+    assert client.calls == 1
+
+
+def test_cache_is_keyed_by_endpoint(explainer_factory, profile, monkeypatch):
+    """Responses cached from one endpoint are never served for another."""
+    monkeypatch.delenv("OPENAI_BASE_URL", raising=False)
+    stub = FakeAsyncClient()
+    stub.base_url = "http://127.0.0.1:8000/v1/"
+    explainer_factory(stub).explain_results(profile, make_results(2))
+
+    real = FakeAsyncClient()
+    real.base_url = "https://api.openai.com/v1/"
+    explainer_factory(real).explain_results(profile, make_results(2))
+    assert real.calls == 2
+
+    client = FakeAsyncClient()
+    same_stub = explainer_factory(client, base_url="http://127.0.0.1:8000/v1")
+    same_stub.explain_results(profile, make_results(2))
+    assert client.calls == 0 and same_stub.stats['cache_hits'] == 2
+
+
+def test_timeout_and_errors_fall_back_to_template(explainer_factory, profile):
+    for client in (FakeAsyncClient(delay=1.0), FakeAsyncClient(fail=True)):
+        explainer = explainer_factory(client, timeout=0.05)
+        results = make_results(2)
+        templates = [r.render_detailed_analysis() for r in results]
+
+        assert explainer.explain_results(profile, results) == templates
+        assert explainer.stats['fallbacks'] == 2
+        # Failures are not cached, so the next run retries
+        assert explainer.cache == {}
+
+
+def test_explain_from_running_loop(explainer_factory, profile):
+    explainer = explainer_factory(FakeAsyncClient())
+
+    async def notebook_cell():
+        return explainer.explain_results(profile, make_results(2))
+
+    assert len(asyncio.run(notebook_cell())) == 2
+
+
+def test_agent_explains_only_detailed_results(offline_agent, profile, tmp_path, monkeypatch):
+    monkeypatch.setattr("src.job_fitment.pipeline.OUTPUT_DIR", tmp_path)
+    from src.job_fitment import create_sample_jobs
+
+    client = FakeAsyncClient()
+    offline_agent.enable_explanations(client=client, cache_dir=tmp_path)
+    results = offline_agent.analyze(profile, create_sample_jobs(), verbose=False, explain=True)
+
+    assert client.calls == min(5, len(results))
+    assert "Explained:" in results[0].analysis_text
+    assert "Explained:" in (tmp_path / "fitment_report.md").read_text()
+
+
+class StubChatHandler(BaseHTTPRequestHandler):
+    """Minimal OpenAI-compatible /v1/chat/completions endpoint."""
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        payload = json.dumps({
+            "id": "stub", "object": "chat.completion", "created": 0, "model": body["model"],
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": "Stub explanation."}}],
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_local_openai_compatible_server(explainer_factory, profile):
+    pytest.importorskip("openai")
+    server = HTTPServer(("127.0.0.1", 0), StubChatHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        explainer = explainer_factory(None, base_url=f"http://127.0.0.1:{server.server_port}/v1")
+        explanations = explainer.explain_results(profile, make_results(2))
+        # A second blocking call runs on a new event loop and must not reuse the closed one's pool
+        again = explainer.explain_results(profile, make_results(4)[2:])
+    finally:
+        server.shutdown()
+
+    assert all(text.endswith("Stub explanation.") for text in explanations + again)
+    assert explainer.stats['requests'] == 4 and explainer.stats['fallbacks'] == 0
+
+
+class LoopBoundClient(FakeAsyncClient):
+    """FakeAsyncClient that, like httpx, only works on the event loop that created it."""
+
+    created = []
+
+    def __init__(self, **options):
+        super().__init__()
+        self.loop = asyncio.get_running_loop()
+        self.closed = False
+        LoopBoundClient.created.append(self)
+
+    async def create(self, **request):
+        if self.closed or asyncio.get_running_loop() is not self.loop:
+            raise RuntimeError("Event loop is closed")
+        return await super().create(**request)
+
+    async def close(self):
+        self.closed = True
+
+
+def test_created_client_is_closed_after_each_run(explainer_factory, profile):
+    """Each explain_results() call gets its own client, closed when the run ends."""
+    LoopBoundClient.created = []
+    explainer = explainer_factory(None)
+    explainer.env.openai = SimpleNamespace(AsyncOpenAI=LoopBoundClient)
+
+    first = explainer.explain_results(profile, make_results(2))
+    second = explainer.explain_results(profile, make_results(4)[2:])
+
+    assert explainer.stats['fallbacks'] == 0
+    assert all("Explained:" in text for text in first + second)
+    assert len(LoopBoundClient.created) == 2
+    assert all(client.closed for client in LoopBoundClient.created)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for ProfileFeatures: compiled scoring must match per-pair parsing.
+"""
+
+import random
+import re
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.job_fitment import (
+    EnvironmentConfig,
+    JobFitmentAnalyzer,
+    JobPosting,
+    ProfileFeatures,
+    StudentProfile,
+    create_sample_jobs,
+    create_sample_profile,
+)
+
+
+def reference_experience(profile, job):
+    total_years = sum(int(re.findall(r'\d+', e.get('duration', ''))[0])
+                      for e in profile.experience if re.findall(r'\d+', e.get('duration', '')))
+    lo, hi = {"Entry": (0, 2), "Mid": (2, 5), "Senior": (5, 10), "Executive": (10, 20)}.get(job.experience_level, (0, 2))
+    if lo <= total_years <= hi:
+        return 100.0
+    return max(0, 100 - (lo - total_years) * 20) if total_years < lo else max(70, 100 - (total_years - hi) * 5)
+
+
+def reference_education(profile, job):
+    if not job.education_requirements:
+        return 100.0
+    degrees = [e.get('degree', '').lower() for e in profile.education]
+    fields = [e.get('field', '').lower() for e in profile.education]
+    score = 0
+    for _ in job.education_requirements:
+        if any(any(d in degree for d in ['bachelor', 'master', 'phd', 'bs', 'ms', 'mba']) for degree in degrees):
+            score += 30
+        if any(any(f in fld for f in ['computer', 'software', 'engineering', 'science', 'data']) for fld in fields):
+            score += 40
+    if profile.certifications:
+        score += min(len(profile.certifications) * 10, 30)
+    return min(score, 100.0)
+
+
+def reference_location(profile, job):
+    pref, loc = profile.preferences.get('location', '').lower(), job.location.lower()
+    if 'remote' in loc or 'remote' in pref or (pref and pref in loc):
+        return 100.0
+    if any(c in pref and c in loc for c in ['us', 'usa', 'united states', 'india', 'uk', 'germany']):
+        return 70.0
+    return 50.0
+
+
+def random_profile(rng):
+    return StudentProfile(
+        name="P",
+        education=[{"degree": rng.choice(["Bachelor of Science", "Diploma", "MBA", ""]),
+                    "field": rng.choice(["Computer Science", "History", "Data Analytics", ""])}],
+        experience=[{"duration": rng.choice(["3 months", "2 years", "", "1.5 years"])} for _ in range(rng.randint(0, 3))],
+        certifications=["AWS"] * rng.randint(0, 4),
+        preferences={"location": rng.choice(["Bay Area", "Remote", "Berlin, Germany", "Austin, USA", ""])},
+    )
+
+
+def random_job(rng, i):
+    return JobPosting(
+        f"J-{i}", "SWE", "Acme", 2,
+        location=rng.choice(["Bay Area, CA", "Remote", "Munich, Germany", "Austin, USA", "Pune, India"]),
+        experience_level=rng.choice(["Entry", "Mid", "Senior", "Executive", "Intern"]),
+        education_requirements=["BS in CS"] * rng.randint(0, 2),
+    )
+
+
+def test_compiled_scores_match_reference():
+    analyzer = JobFitmentAnalyzer(EnvironmentConfig(), vector_db=None)
+    rng = random.Random(3)
+    for _ in range(50):
+        profile = random_profile(rng)
+        features = analyzer.compile_profile(profile)
+        for i in range(20):
+            job = random_job(rng, i)
+            assert analyzer.calculate_experience_match(profile, job, features) == reference_experience(profile, job)
+            assert analyzer.calculate_education_match(profile, job, features) == reference_education(profile, job)
+            assert analyzer.calculate_location_match(profile, job, features) == reference_location(profile, job)
+
+
+def test_features_are_compiled_once():
+    profile = create_sample_profile()
+    features = ProfileFeatures.compile(profile)
+
+    assert features.total_years == 3 + 6  # first number of each duration, as before
+    assert features.degree_mask and features.field_mask
+    assert features.skills == frozenset(s.lower() for s in profile.skills)
+
+    analyzer = JobFitmentAnalyzer(EnvironmentConfig(), vector_db=None)
+    jobs = create_sample_jobs()
+    compiled = [analyzer.analyze_fitment(profile, job, features) for job in jobs]
+    assert compiled == [analyzer.analyze_fitment(profile, job) for job in jobs]
+    assert set(features.location_scores) == {job.location for job in jobs}
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for BM25 + dense hybrid retrieval with reciprocal-rank fusion.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+pytest.importorskip("faiss")
+pytest.importorskip("numpy")
+
+from src.job_fitment import EnvironmentConfig, JobFitmentVectorDB
+from src.job_fitment.lexical import BM25Index, reciprocal_rank_fusion, tokenize
+from conftest import HashingEncoder
+
+DOCS = [
+    {"question": "How do I learn C# for backend work?", "answer": "Build a .NET Web API and deploy it."},
+    {"question": "How do I learn C++?", "answer": "Work through systems programming projects."},
+    {"question": "What is Kubernetes?", "answer": "A container orchestrator; start with minikube."},
+    {"question": "How should I prepare for interviews?", "answer": "Practice coding problems daily."},
+    {"question": "How do I learn Python?", "answer": "Automate small tasks and build a Flask app."},
+]
+
+
+def make_vector_db() -> JobFitmentVectorDB:
+    vector_db = JobFitmentVectorDB(EnvironmentConfig(), metric="ip")
+    vector_db.embedding_model = HashingEncoder()
+    vector_db.build_index(DOCS)
+    return vector_db
+
+
+def test_tokenize_keeps_skill_symbols():
+    assert tokenize("How to learn C#, .NET, C++ and Node.js?") == ["c#", ".net", "c++", "node.js"]
+
+
+def test_bm25_add_remove_and_ranking():
+    index = BM25Index()
+    index.add_many([(1, "python python"), (2, "python flask"), (3, "go rust")])
+    assert [doc_id for doc_id, _ in index.search(["python"], 5)] == [1, 2]
+
+    index.remove(1)
+    index.add(3, "python go")
+    assert [doc_id for doc_id, _ in index.search(["python"], 5)] == [2, 3]
+    assert "rust" not in index and "flask" in index
+    assert index.total_length == sum(index.doc_lengths.values())
+
+
+def test_rrf_rewards_agreement():
+    fused = reciprocal_rank_fusion([[1, 2, 3], [3, 1, 4]])
+    assert [doc_id for doc_id, _ in fused] == [1, 3, 2, 4]
+
+
+def test_exact_skill_query_skips_encoder_and_is_cached():
+    vector_db = make_vector_db()
+    encoded = vector_db.embedding_model.encoded
+
+    for _ in range(3):
+        results = vector_db.hybrid_search("How to learn C#", top_k=2, lexical_vocabulary={"c#", ".net"})
+        assert results[0]["question"] == DOCS[0]["question"]
+        assert all("C++" not in r["question"] for r in results)
+
+    assert vector_db.embedding_model.encoded == encoded
+    assert vector_db.stats["lexical_only"] == 3
+    assert vector_db.stats["lexical_cache_hits"] == 2
+
+
+def test_hybrid_fuses_both_rankings_and_tracks_updates():
+    vector_db = make_vector_db()
+    encoded = vector_db.embedding_model.encoded
+
+    results = vector_db.hybrid_search(".NET interview preparation", top_k=3, lexical_vocabulary={"c#"})
+    assert vector_db.embedding_model.encoded == encoded + 1
+    assert {DOCS[0]["question"], DOCS[3]["question"]} <= {r["question"] for r in results}
+    assert all(r["rrf_score"] > 0 for r in results)
+    assert [r["rrf_score"] for r in results] == sorted((r["rrf_score"] for r in results), reverse=True)
+
+    # similarity_score keeps the dense similarity, as plain search() reports it
+    dense = {d["question"]: d["similarity_score"] for d in vector_db.search(".NET interview preparation", 3 * vector_db.CANDIDATE_MULTIPLIER)}
+    for r in results:
+        assert r["similarity_score"] == dense.get(r["question"])
+
+    vector_db.remove_documents([DOCS[0]])
+    vector_db.add_documents([{"question": "Is .NET still worth learning?", "answer": "Yes, for enterprise roles."}])
+    results = vector_db.lexical_search(".NET", top_k=5)
+    assert [r["question"] for r in results] == ["Is .NET still worth learning?"]
+
+
+def test_pipeline_skill_gap_queries_use_bm25_only(offline_agent):
+    pipeline = offline_agent.pipeline
+    encoder = offline_agent.vector_db.embedding_model
+    encoded = encoder.encoded
+
+    assert pipeline.retrieval == "hybrid"
+    assert {"python", "docker"} <= pipeline.skill_terms()
+    assert pipeline.retrieve_context("How to learn Python Docker")
+    assert encoder.encoded == encoded
+
+    pipeline.retrieve_context("Tips for a behavioral interview at a startup")
+    assert encoder.encoded == encoded + 1
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming posting ingestion and the Parquet posting store.
+"""
+
+import csv
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+pa = pytest.importorskip("pyarrow")
+
+from src.job_fitment import (
+    EnvironmentConfig,
+    JobPosting,
+    JobPostingIngestor,
+    JobPostingStore,
+    SkillSimilarityTable,
+    create_sample_profile,
+)
+
+
+def write_jsonl(path: Path, records):
+    with open(path, 'w') as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+def make_records(n: int):
+    companies = ["Google", "Cisco", "Acme Robotics"]
+    return [
+        {
+            "job_id": f"J-{i}",
+            "title": f"Engineer {i}",
+            "company": companies[i % len(companies)],
+            "location": "Remote",
+            "requirements": ["python", "k8s"] if i % 2 else ["Java", "SQL"],
+            "preferred_skills": "postgres; Docker",
+        }
+        for i in range(n)
+    ]
+
+
+def test_jsonl_and_csv_are_normalized(tmp_path):
+    env = EnvironmentConfig()
+    jsonl = tmp_path / "postings.jsonl"
+    write_jsonl(jsonl, make_records(2) + [{"title": "", "company": "Nobody"}])
+    with open(jsonl, 'a') as f:
+        f.write("{not json\n")
+
+    csv_path = tmp_path / "postings.csv"
+    with open(csv_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=["title", "company", "requirements"])
+        writer.writeheader()
+        writer.writerow({"title": "Data Analyst", "company": "SAP", "requirements": "SQL, Python, sql"})
+
+    ingestor = JobPostingIngestor(env, SkillSimilarityTable(env))
+    postings = list(ingestor.stream([jsonl, csv_path]))
+
+    assert len(postings) == 3
+    assert ingestor.skipped == 2
+    assert postings[1]["requirements"] == ["Python", "Kubernetes"]
+    assert postings[1]["preferred_skills"] == ["PostgreSQL", "Docker"]
+    assert postings[0]["company_priority"] == 1  # Google is a priority-1 target company
+
+    analyst = postings[2]
+    assert analyst["requirements"] == ["SQL", "Python"]
+    assert analyst["job_id"] and analyst["job_type"] == "Full-time"
+    assert JobPosting(**analyst).company == "SAP"
+
+
+def test_skill_spelling_is_canonical_across_postings():
+    """Case variants of one skill are stored as a single dictionary value."""
+    env = EnvironmentConfig()
+    table = SkillSimilarityTable(env)
+    table.skills, table.skill_ids = ["scikit-learn"], {table.normalize("scikit-learn"): 0}
+    ingestor = JobPostingIngestor(env, table)
+
+    first = ingestor.normalize_skills(["rust", "Scikit-Learn", "python"])
+    second = ingestor.normalize_skills(["RUST", "scikit learn", "Python", "PYTHON"])
+
+    assert first == ["rust", "scikit-learn", "Python"]
+    assert second == first
+
+
+def test_store_round_trip_in_bounded_batches(tmp_path):
+    env = EnvironmentConfig()
+    source = tmp_path / "postings.jsonl"
+    write_jsonl(source, make_records(25))
+
+    store = JobPostingStore(env, tmp_path / "postings.parquet")
+    assert store.ingest(source, batch_size=10) == 25
+    assert store.num_rows == 25
+
+    batches = list(store.iter_batches(batch_size=4))
+    assert max(b.num_rows for b in batches) <= 4
+    assert sum(b.num_rows for b in batches) == 25
+    assert pa.types.is_dictionary(batches[0].schema.field("company").type)
+    assert pa.types.is_dictionary(batches[0].schema.field("requirements").type.value_type)
+    assert "Kubernetes" in store.batch_skills(batches[0])
+
+    jobs = [job for chunk in store.iter_postings(batch_size=7) for job in chunk]
+    assert [job.job_id for job in jobs] == [f"J-{i}" for i in range(25)]
+    assert jobs[3].requirements == ["Python", "Kubernetes"]
+    assert jobs[3].company == "Google"
+
+
+def test_pipeline_streams_results_from_store(tmp_path, offline_agent):
+    source = tmp_path / "postings.jsonl"
+    write_jsonl(source, make_records(12))
+    store = JobPostingStore(offline_agent.env, tmp_path / "postings.parquet")
+    store.ingest(source, batch_size=5)
+
+    results = list(offline_agent.pipeline.analyze_store(create_sample_profile(), store, batch_size=5))
+
+    assert len(results) == 12
+    assert {r.job.job_id for r in results} == {f"J-{i}" for i in range(12)}
+    assert all(0 <= r.fitment_score <= 100 for r in results)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Tests for metrics spans, counters and the JSON / Prometheus / OTLP exporters.
+"""
+
+import io
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.job_fitment import (
+    JSONExporter,
+    Metrics,
+    OTLPSpanExporter,
+    PrometheusTextfileExporter,
+    create_sample_jobs,
+    create_sample_profile,
+)
+
+
+def test_spans_nest_and_aggregate():
+    metrics = Metrics()
+    with metrics.span("setup", step=1):
+        with metrics.span("setup.vector_db"):
+            pass
+        for _ in range(3):
+            with metrics.span("score.skills", trace=False):
+                pass
+
+    assert metrics.timings["score.skills"][0] == 3
+    assert [s["name"] for s in metrics.spans] == ["setup.vector_db", "setup"]
+    child, parent = metrics.spans
+    assert child["parent_id"] == parent["span_id"] and child["trace_id"] == parent["trace_id"]
+    assert parent["parent_id"] is None and parent["attributes"] == {"step": 1}
+    assert parent["end_ns"] >= child["end_ns"]
+
+
+def test_failed_span_is_marked_and_disabled_metrics_record_nothing():
+    metrics = Metrics()
+    with pytest.raises(ValueError):
+        with metrics.span("load"):
+            raise ValueError("boom")
+    assert metrics.spans[0]["attributes"]["error"] == "ValueError"
+
+    disabled = Metrics(enabled=False)
+    with disabled.span("load"):
+        disabled.increment("docs")
+    assert disabled.timings == {} and disabled.counters == {}
+
+
+def test_counters_include_registered_stats():
+    metrics = Metrics()
+    stats = {"cache_hits": 0}
+    metrics.register("vector_db", stats)
+    metrics.increment("reports", 2)
+    stats["cache_hits"] += 5
+
+    assert metrics.counter_values() == {"reports": 2, "vector_db.cache_hits": 5}
+
+
+def test_json_and_prometheus_exports(tmp_path):
+    metrics = Metrics(exporters=[
+        JSONExporter(tmp_path / "metrics.json"),
+        PrometheusTextfileExporter(tmp_path / "job_fitment.prom"),
+    ])
+    metrics.register("vector_db", {"embeddings_computed": 42})
+    with metrics.span('setup."kb"'):
+        pass
+    metrics.export()
+
+    snapshot = json.loads((tmp_path / "metrics.json").read_text())
+    assert snapshot["counters"] == {"vector_db.embeddings_computed": 42}
+    assert snapshot["timings"]['setup."kb"']["count"] == 1
+
+    text = (tmp_path / "job_fitment.prom").read_text()
+    assert "# TYPE job_fitment_vector_db_embeddings_computed_total counter" in text
+    assert "job_fitment_vector_db_embeddings_computed_total 42" in text
+    assert 'job_fitment_span_count_total{span="setup.\\"kb\\""} 1' in text
+
+
+class CollectorHandler(BaseHTTPRequestHandler):
+    received = []
+
+    def do_POST(self):
+        self.received.append((self.path, json.loads(self.rfile.read(int(self.headers["Content-Length"])))))
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+def test_otlp_exporter_posts_new_spans_once():
+    server = HTTPServer(("127.0.0.1", 0), CollectorHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    CollectorHandler.received = []
+    exporter = OTLPSpanExporter(f"http://127.0.0.1:{server.server_port}/v1/traces")
+    metrics = Metrics(service_name="fitment-test", exporters=[exporter])
+    try:
+        with metrics.span("analyze", jobs=3):
+            with metrics.span("report"):
+                pass
+        metrics.export()
+        metrics.export()
+        with metrics.span("explain"):
+            pass
+        metrics.export()
+    finally:
+        server.shutdown()
+
+    assert len(CollectorHandler.received) == 2
+    path, payload = CollectorHandler.received[0]
+    assert path == "/v1/traces"
+    resource_spans = payload["resourceSpans"][0]
+    assert resource_spans["resource"]["attributes"][0]["value"] == {"stringValue": "fitment-test"}
+    spans = resource_spans["scopeSpans"][0]["spans"]
+    assert [s["name"] for s in spans] == ["report", "analyze"]
+    assert spans[0]["parentSpanId"] == spans[1]["spanId"]
+    assert spans[1]["attributes"] == [{"key": "jobs", "value": {"intValue": "3"}}]
+    assert [s["name"] for s in CollectorHandler.received[1][1]["resourceSpans"][0]["scopeSpans"][0]["spans"]] == ["explain"]
+
+
+def test_agent_analyze_records_stage_spans_and_counters(offline_agent, tmp_path, monkeypatch):
+    monkeypatch.setattr("src.job_fitment.pipeline.OUTPUT_DIR", tmp_path)
+    metrics = offline_agent.metrics
+    offline_agent.analyzer.metrics = offline_agent.pipeline.metrics = metrics
+    metrics.register("vector_db", offline_agent.vector_db.stats)
+
+    jobs = create_sample_jobs()
+    offline_agent.analyze(create_sample_profile(), jobs, verbose=False)
+
+    for name in ("score.skills", "score.experience", "score.education", "score.location"):
+        assert metrics.timings[name][0] == len(jobs)
+    assert {"analyze", "rank_jobs", "report"} <= {s["name"] for s in metrics.spans}
+    assert metrics.counter_values()["vector_db.embeddings_computed"] > 0
+
+    snapshot = offline_agent.export_metrics(tmp_path)
+    assert (tmp_path / "metrics.json").exists() and (tmp_path / "job_fitment.prom").exists()
+    assert snapshot["timings"]["analyze"]["count"] == 1
+
+
+def test_span_buffer_keeps_the_most_recent_spans(monkeypatch):
+    """Past MAX_SPANS the oldest spans are evicted, and the OTLP exporter still sees new ones."""
+    monkeypatch.setattr(Metrics, "MAX_SPANS", 3)
+    metrics = Metrics()
+    exporter = OTLPSpanExporter("http://127.0.0.1:9/v1/traces")
+    sent = []
+    monkeypatch.setattr(exporter, "payload", lambda m, spans: sent.append([s["name"] for s in spans]) or {})
+    monkeypatch.setattr("urllib.request.urlopen", lambda request, timeout: io.BytesIO(b"{}"))
+
+    for i in range(5):
+        with metrics.span(f"step{i}"):
+            pass
+    exporter.export(metrics)
+    with metrics.span("step5"):
+        pass
+    exporter.export(metrics)
+
+    assert [s["name"] for s in metrics.spans] == ["step3", "step4", "step5"]
+    assert metrics.dropped_spans == 3
+    assert sent == [["step2", "step3", "step4"], ["step5"]]
+
+
+def test_analyze_many_merges_worker_metrics(offline_agent):
+    """Metrics recorded in forked workers reach the parent's Metrics."""
+    metrics = offline_agent.metrics
+    offline_agent.analyzer.metrics = offline_agent.pipeline.metrics = metrics
+    metrics.register("vector_db", offline_agent.vector_db.stats)
+    queries_before = metrics.counter_values()["vector_db.lexical_queries"]
+
+    profile = create_sample_profile()
+    jobs = create_sample_jobs()
+    list(offline_agent.analyze_many([profile] * 3, jobs, workers=3, generate_reports=False))
+
+    assert metrics.timings["analyze"][0] == 3
+    assert metrics.timings["score.skills"][0] == 3 * len(jobs)
+    assert [s["name"] for s in metrics.spans].count("rank_jobs") == 3
+    assert metrics.counter_values()["vector_db.lexical_queries"] > queries_before
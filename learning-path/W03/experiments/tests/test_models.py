@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tests for the compact data models: slots, lazy analysis text and FitmentResultBatch.
+"""
+
+import pickle
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.job_fitment import (
+    FitmentResult,
+    FitmentResultBatch,
+    JobPosting,
+    StudentProfile,
+    create_sample_jobs,
+)
+
+
+def make_result(i: int, job: JobPosting) -> FitmentResult:
+    return FitmentResult(
+        job=job,
+        fitment_score=50.0 + i,
+        skill_matches=["python"],
+        skill_gaps=["kubernetes", "go"] if i % 2 else [],
+        experience_match=80.0,
+        education_match=70.0,
+        location_match=i % 2 == 0,
+        recommendations=[f"Tailor your resume to highlight skills matching {job.company}'s requirements."],
+        priority_level=job.company_priority,
+        skill_score=60.0,
+        location_score=100.0 if i % 2 == 0 else 50.0,
+        profile_name="Alex",
+    )
+
+
+def test_models_are_slotted():
+    job = create_sample_jobs()[0]
+    for obj in (job, StudentProfile(name="Alex"), make_result(0, job)):
+        assert not hasattr(obj, "__dict__")
+    with pytest.raises(AttributeError):
+        job.unknown_field = 1
+
+
+def test_posting_skills_are_interned():
+    a = JobPosting("1", "SWE", "".join(["Goo", "gle"]), 1, requirements=["".join(["Pyt", "hon"])])
+    b = JobPosting("2", "SRE", "Google", 1, requirements=["Python"])
+    assert a.company is b.company
+    assert a.requirements[0] is b.requirements[0]
+
+
+def test_detailed_analysis_is_rendered_lazily():
+    result = make_result(0, create_sample_jobs()[0])
+    assert result.analysis_text is None
+
+    text = result.detailed_analysis
+    assert text.startswith(f"## Fitment Analysis: Alex → {result.job.title}")
+    assert "Skills Match: 60.0%" in text
+    assert result.detailed_analysis is text
+    assert pickle.loads(pickle.dumps(result)) == result
+
+
+def test_result_batch_round_trips_results():
+    jobs = create_sample_jobs()
+    results = [make_result(i, jobs[i % len(jobs)]) for i in range(20)]
+
+    batch = FitmentResultBatch.from_results(iter(results))
+
+    assert len(batch) == 20
+    assert batch.profile_name == "Alex"
+    assert list(batch) == results
+    assert batch[-1] == results[-1]
+    assert len(batch.skills) == 3  # python, kubernetes, go stored once
+    assert len(batch.texts) == len({j.company for j in jobs})
+    assert batch.gap_counts() == {"kubernetes": 10, "go": 10}
+    assert batch[3].detailed_analysis == results[3].detailed_analysis
+    with pytest.raises(IndexError):
+        batch[20]
+
+
+def test_precomputed_analysis_is_kept():
+    job = create_sample_jobs()[0]
+    result = FitmentResult(
+        job=job, fitment_score=70.0, skill_matches=[], skill_gaps=[],
+        experience_match=50.0, education_match=50.0, location_match=True,
+        recommendations=[], priority_level=1, analysis_text="Custom analysis",
+    )
+    assert result.detailed_analysis == "Custom analysis"
+
+    result.detailed_analysis = "Edited"
+    assert result.analysis_text == "Edited"
+    assert pickle.loads(pickle.dumps(result)).detailed_analysis == "Edited"
+
+
+def test_stale_positional_construction_fails_loudly():
+    """The old positional order had detailed_analysis 8th; it must not shift into other fields."""
+    job = create_sample_jobs()[0]
+    with pytest.raises(TypeError):
+        FitmentResult(job, 70.0, [], [], 50.0, 50.0, True, "Analysis", [], 1)
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for bounded top-k ranking and its summary statistics.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.job_fitment import FitmentScorer, FitmentResult, EnvironmentConfig, JobPosting, create_sample_profile
+from src.job_fitment.scorer import RANKING_KEYS, TopKRanker
+
+
+def make_results(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    results = []
+    for i in range(n):
+        job = JobPosting(f"J-{i}", "Engineer", f"Company {i % 5}", rng.randint(1, 3))
+        results.append(FitmentResult(
+            job=job,
+            fitment_score=float(rng.randint(40, 60)),  # plenty of ties
+            skill_matches=[],
+            skill_gaps=["docker"] if i % 3 else ["docker", "go"],
+            experience_match=100.0,
+            education_match=100.0,
+            location_match=True,
+            recommendations=[],
+            priority_level=job.company_priority,
+        ))
+    return results
+
+
+@pytest.mark.parametrize("key", sorted(RANKING_KEYS))
+@pytest.mark.parametrize("k", [0, 1, 10, 500])
+def test_top_k_matches_full_sort(key, k):
+    results = make_results(300)
+    ranker = TopKRanker(k, key).extend(results)
+
+    assert ranker.results() == sorted(results, key=RANKING_KEYS[key])[:k]
+    assert len(ranker) == min(k, 300)
+
+
+def test_summary_covers_evicted_results():
+    results = make_results(30)
+    ranker = TopKRanker(3).extend(results)
+
+    summary = ranker.summary
+    assert summary.total == 30
+    assert summary.common_gaps(2) == [("docker", 30), ("go", 10)]
+    assert summary.mean_score == round(sum(r.fitment_score for r in results) / 30, 1)
+    assert sum(summary.priority_counts.values()) == 30
+
+
+def test_scorer_rank_results_top_k():
+    scorer = FitmentScorer(EnvironmentConfig())
+    results = make_results(50)
+
+    assert scorer.rank_results(results, top_k=5) == scorer.rank_results(results)[:5]
+    with pytest.raises(ValueError):
+        TopKRanker(5, "salary")
+
+
+def test_agent_keeps_only_top_k(offline_agent, tmp_path, monkeypatch):
+    monkeypatch.setattr("src.job_fitment.pipeline.OUTPUT_DIR", tmp_path)
+    from src.job_fitment import create_sample_jobs
+
+    jobs = create_sample_jobs()
+    full = offline_agent.analyze(create_sample_profile(), jobs, generate_report=False, verbose=False)
+    top = offline_agent.analyze(create_sample_profile(), jobs, generate_report=True, verbose=False, top_k=2)
+
+    assert [r.job.job_id for r in top] == [r.job.job_id for r in full[:2]]
+    report = (tmp_path / "fitment_report.md").read_text()
+    assert f"**Jobs Analyzed:** {len(jobs)}" in report
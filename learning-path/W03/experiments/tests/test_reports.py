@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for streamed Markdown/HTML/JSON fitment reports.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.job_fitment import (
+    EnvironmentConfig,
+    FitmentReportRenderer,
+    FitmentResult,
+    JobPosting,
+    StudentProfile,
+)
+from src.job_fitment.scorer import TopKRanker
+
+
+def make_results(n: int):
+    results = []
+    for i in range(n):
+        job = JobPosting(f"J-{i}", f"Engineer <{i}>", "R&D Labs", 1 + i % 3)
+        results.append(FitmentResult(
+            job=job,
+            fitment_score=float(90 - i),
+            skill_matches=["python"],
+            skill_gaps=["go"] if i % 2 else ["go", "rust"],
+            experience_match=80.0,
+            education_match=70.0,
+            location_match=True,
+            recommendations=[f"Learn go for {i % 2}", "Tailor your resume"],
+            priority_level=job.company_priority,
+            profile_name="Sam",
+        ))
+    return results
+
+
+@pytest.fixture
+def renderer():
+    return FitmentReportRenderer(EnvironmentConfig())
+
+
+def test_markdown_report_renders_details_for_displayed_results_only(renderer, tmp_path):
+    results = make_results(8)
+    path = renderer.write(tmp_path / "report.md", StudentProfile(name="Sam"), results)
+
+    text = Path(path).read_text()
+    assert "**Jobs Analyzed:** 8" in text
+    assert "Top match: **Engineer <0>** at **R&D Labs** with **90.0%** fitment" in text
+    assert "| 8 | R&D Labs | Engineer <7> | 83.0% | P2 |" in text
+    assert text.count("## Fitment Analysis: Sam") == 5
+    assert "- go (8 of 8 jobs)\n- rust (4 of 8 jobs)" in text
+    assert "1. Learn go for 0\n1. Tailor your resume\n1. Learn go for 1\n" in text
+    assert all(r.analysis_text is None for r in results[5:])
+
+
+def test_html_report_escapes_values(renderer, tmp_path):
+    path = renderer.write(tmp_path / "report.html", StudentProfile(name="Sam"), make_results(3))
+
+    text = Path(path).read_text()
+    assert text.startswith("<!DOCTYPE html>") and text.endswith("</html>\n")
+    assert "<td>Engineer &lt;1&gt;</td>" in text
+    assert "R&amp;D Labs" in text and "R&D Labs" not in text
+
+
+def test_json_report_streams_an_iterator_with_summary(renderer, tmp_path):
+    ranker = TopKRanker(4, key='fitment').extend(make_results(10))
+    consumed = iter(ranker.results())
+
+    path = renderer.write(tmp_path / "report.json", StudentProfile(name="Sam"), consumed, ranker.summary)
+
+    report = json.loads(Path(path).read_text())
+    assert report["jobs_analyzed"] == 10
+    assert [row["rank"] for row in report["rankings"]] == [1, 2, 3, 4]
+    assert "detailed_analysis" in report["rankings"][0]
+    assert report["common_gaps"][0] == {"skill": "go", "count": 10}
+    assert report["recommendations"] == ["Learn go for 0", "Tailor your resume", "Learn go for 1"]
+
+
+def test_empty_report_and_unknown_format(renderer, tmp_path):
+    path = renderer.write(tmp_path / "empty.md", StudentProfile(name="Sam"), [])
+    assert "No jobs analyzed" in Path(path).read_text()
+    with pytest.raises(ValueError):
+        renderer.write(tmp_path / "report.md", StudentProfile(name="Sam"), [], fmt="pdf")
+
+
+def test_pipeline_generate_report_returns_content(offline_agent, tmp_path, monkeypatch):
+    """generate_report() returns the markdown (None when streamed); write_report() the path."""
+    monkeypatch.setattr("src.job_fitment.pipeline.OUTPUT_DIR", tmp_path)
+    pipeline = offline_agent.pipeline
+    profile = StudentProfile(name="Sam")
+    results = make_results(3)
+
+    content = pipeline.generate_report(profile, results, filename="report.md")
+    assert content == (tmp_path / "report.md").read_text(encoding="utf-8")
+    assert content.startswith("# Job Fitment Analysis Report") and "Sam" in content
+
+    ranker = TopKRanker(3)
+    for result in results:
+        ranker.push(result)
+    assert pipeline.generate_report(profile, iter(ranker.results()), "streamed.json", ranker.summary) is None
+    assert (tmp_path / "streamed.json").exists()
+    assert pipeline.write_report(profile, results, "report.html") == str(tmp_path / "report.html")
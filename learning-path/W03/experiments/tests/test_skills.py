@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for semantic skill matching via SkillSimilarityTable.
+Uses a deterministic character-trigram encoder instead of a sentence model.
+"""
+
+import sys
+import zlib
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+np = pytest.importorskip("numpy")
+
+from src.job_fitment import (
+    EnvironmentConfig,
+    JobFitmentAnalyzer,
+    JobPosting,
+    KnowledgeBaseGenerator,
+    SkillSimilarityTable,
+    create_sample_profile,
+)
+
+
+class TrigramEncoder:
+    """Hashes character trigrams so similar spellings get similar vectors."""
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        vectors = np.zeros((len(texts), self.dim), dtype='float32')
+        for row, text in enumerate(texts):
+            padded = f"  {text.lower()}  "
+            for i in range(len(padded) - 2):
+                vectors[row, zlib.crc32(padded[i:i + 3].encode()) % self.dim] += 1.0
+        return vectors
+
+
+def make_env() -> EnvironmentConfig:
+    return EnvironmentConfig()
+
+
+def make_table(threshold: float = 0.6) -> SkillSimilarityTable:
+    env = make_env()
+    table = SkillSimilarityTable(env, encoder=TrigramEncoder(), threshold=threshold)
+    return table.build(KnowledgeBaseGenerator(env).skill_categories)
+
+
+def test_aliases_resolve_to_canonical_skill():
+    table = make_table()
+    assert table.skill_id("k8s") == table.skill_id("Kubernetes")
+    assert table.skill_id("Postgres") == table.skill_id("postgresql")
+    assert table.similarity_of("golang", "Go") == 1.0
+    assert table.similarity.dtype == np.float16
+
+
+def test_incremental_add_only_embeds_new_skills():
+    table = make_table()
+    encoder = table.encoder
+    size = len(table)
+
+    assert table.add_skills(["Python", "k8s", "Microservices", "microservices"]) == 1
+    assert encoder.calls[-1] == ["Microservices"]
+    assert len(table) == size + 1
+    new_id = table.skill_id("Microservices")
+    assert table.similarity[new_id, new_id] == pytest.approx(1.0, abs=1e-3)
+    assert table.similarity[new_id, 0] == table.similarity[0, new_id]
+
+
+def test_save_and_load_roundtrip(tmp_path):
+    table = make_table()
+    table.save(tmp_path)
+
+    loaded = SkillSimilarityTable(make_env(), encoder=TrigramEncoder())
+    assert loaded.load(tmp_path)
+    assert loaded.skills == table.skills
+    assert loaded.similarity_of("PyTorch", "TensorFlow") == table.similarity_of("PyTorch", "TensorFlow")
+    assert loaded.add_skills(["Microservices"]) == 1
+
+
+def test_analyzer_counts_aliases_and_near_duplicates_as_matches():
+    table = make_table(threshold=0.6)
+    analyzer = JobFitmentAnalyzer(make_env(), vector_db=None, skill_table=table)
+    profile = create_sample_profile()
+    profile.skills = ["Python", "Postgres", "k8s", "React.js"]
+    job = JobPosting(
+        job_id="TEST-001",
+        title="Backend Engineer",
+        company="Example",
+        company_priority=1,
+        requirements=["Python", "PostgreSQL", "Kubernetes"],
+        preferred_skills=["React", "Rust"],
+    )
+
+    analyzer.register_job_skills([job])
+    score, matches, gaps = analyzer.calculate_skill_match(profile, job)
+    assert sorted(matches) == ["kubernetes", "postgresql", "python", "react"]
+    assert gaps == ["rust"]
+    assert score == pytest.approx(70 + 15)
+
+    exact = JobFitmentAnalyzer(make_env(), vector_db=None)
+    exact_score, exact_matches, _ = exact.calculate_skill_match(profile, job)
+    assert exact_matches == ["python"] and exact_score < score
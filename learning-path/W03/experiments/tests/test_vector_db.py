@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Tests for the JobFitmentVectorDB index factory.
+Runs on precomputed embeddings, so only FAISS and NumPy are required.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+pytest.importorskip("faiss")
+np = pytest.importorskip("numpy")
+
+from src.job_fitment import EnvironmentConfig, JobFitmentVectorDB
+from conftest import HashingEncoder
+
+
+def make_env() -> EnvironmentConfig:
+    """Environment whose libraries resolve lazily (only FAISS/NumPy get imported)."""
+    return EnvironmentConfig()
+
+
+def make_embeddings(n: int = 2000, dim: int = 32, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((16, dim)).astype('float32')
+    return centers[rng.integers(0, 16, size=n)] + 0.3 * rng.standard_normal((n, dim)).astype('float32')
+
+
+@pytest.mark.parametrize("index_type", JobFitmentVectorDB.INDEX_TYPES)
+@pytest.mark.parametrize("metric", JobFitmentVectorDB.METRICS)
+def test_index_factory_builds_every_type(index_type, metric):
+    """Every index type trains, fills and returns the query itself as nearest neighbour."""
+    embeddings = make_embeddings()
+    vector_db = JobFitmentVectorDB(make_env(), index_type=index_type, metric=metric,
+                                   nlist=32, pq_m=8, nprobe=32, ef_search=128)
+    index = vector_db.index_embeddings(embeddings)
+
+    assert index.ntotal == len(embeddings)
+    queries = vector_db._prepare_queries(embeddings[:20])
+    _, ids = index.search(queries, 1)
+    hit_rate = float(np.mean(ids[:, 0] == np.arange(20)))
+    assert hit_rate >= (0.8 if index_type == "ivf_pq" else 1.0), f"{index_type}/{metric}: {hit_rate}"
+
+
+def test_small_corpus_clamps_ivf_pq_parameters():
+    """IVF-PQ on a toy corpus must not fail on nlist or codebook size."""
+    vector_db = JobFitmentVectorDB(make_env(), index_type="ivf_pq", nlist=1024)
+    index = vector_db.index_embeddings(make_embeddings(n=100, dim=384))
+    assert index.ntotal == 100
+
+
+def test_benchmark_reports_recall_against_exact_index():
+    """Flat recall is exact; ANN rows expose the tuning knob that produced them."""
+    vector_db = JobFitmentVectorDB(make_env(), metric="ip", nlist=32, pq_m=8)
+    vector_db.index_embeddings(make_embeddings())
+    rows = vector_db.benchmark(make_embeddings(n=50, seed=1), k=5,
+                               nprobe_values=[1, 32], ef_search_values=[64])
+
+    by_type = {(r['index_type'], r['value']): r for r in rows}
+    assert by_type[("flat", None)]['recall@5'] == 1.0
+    assert by_type[("ivf_flat", 32)]['recall@5'] >= by_type[("ivf_flat", 1)]['recall@5']
+    assert by_type[("hnsw", 64)]['param'] == "efSearch"
+
+
+def make_docs(n: int, prefix: str = "skill"):
+    return [{"question": f"How can I learn {prefix}{i}?", "answer": f"Practice {prefix}{i} daily."}
+            for i in range(n)]
+
+
+@pytest.mark.parametrize("index_type", ["flat", "ivf_flat", "hnsw"])
+def test_add_remove_upsert_without_rebuild(index_type):
+    """Only new or changed documents are embedded; removed IDs never come back."""
+    vector_db = JobFitmentVectorDB(make_env(), index_type=index_type, metric="ip", nlist=4)
+    vector_db.embedding_model = HashingEncoder()
+    docs = make_docs(20)
+    vector_db.build_index(docs)
+    assert vector_db.embedding_model.encoded == 20
+
+    assert vector_db.add_documents(docs[:2] + make_docs(3, prefix="tool")) != []
+    assert vector_db.embedding_model.encoded == 23, "existing documents must not be re-embedded"
+
+    assert vector_db.remove_documents([docs[0]["question"], docs[1]]) == 2
+    assert docs[0] not in vector_db and docs[2] in vector_db
+    results = vector_db.search(docs[0]["question"], top_k=5)
+    assert all(r["question"] != docs[0]["question"] for r in results)
+
+    changed = dict(docs[3], answer="Read the official tutorial.")
+    relabelled = dict(docs[4], category="learning")
+    encoded_before = vector_db.embedding_model.encoded
+    stats = vector_db.upsert([changed, relabelled, docs[0]])
+    assert stats == {"added": 1, "updated": 1, "unchanged": 1}
+    assert vector_db.embedding_model.encoded - encoded_before == 2
+    assert vector_db.documents[vector_db._positions[vector_db.document_id(relabelled)]]["category"] == "learning"
+    assert vector_db.search(docs[0]["question"], top_k=1)[0]["question"] == docs[0]["question"]
+
+    doc_count = len(vector_db.doc_ids)
+    assert doc_count == len(vector_db.documents) == len(vector_db.embeddings) == 22
+    if index_type != "hnsw":
+        assert vector_db.faiss_index.ntotal == doc_count
+
+
+def test_delta_log_replay_and_compaction(tmp_path):
+    """Updates survive a reload via the delta log and are folded in by compaction."""
+    vector_db = JobFitmentVectorDB(make_env(), metric="ip", store_dir=tmp_path)
+    vector_db.embedding_model = HashingEncoder()
+    docs = make_docs(10)
+    vector_db.build_index(docs)
+    assert not (tmp_path / JobFitmentVectorDB.DELTA_LOG).exists()
+
+    vector_db.add_documents(make_docs(2, prefix="tool"))
+    vector_db.remove_documents([docs[0]])
+    assert (tmp_path / JobFitmentVectorDB.DELTA_LOG).exists()
+
+    reloaded = JobFitmentVectorDB(make_env(), metric="ip", store_dir=tmp_path)
+    reloaded.embedding_model = HashingEncoder()
+    assert reloaded.load_store()
+    assert sorted(reloaded.doc_ids) == sorted(vector_db.doc_ids)
+    assert np.allclose(reloaded.embeddings[reloaded._positions[vector_db.doc_ids[-1]]], vector_db.embeddings[-1])
+    assert reloaded.embedding_model.encoded == 0
+
+    reloaded.COMPACT_EVERY = 1
+    reloaded.remove_documents([docs[1]])
+    assert not (tmp_path / JobFitmentVectorDB.DELTA_LOG).exists()
+    assert reloaded.faiss_index.ntotal == 10
+
+
+@pytest.mark.parametrize("index_type", ["flat", "hnsw"])
+def test_metadata_only_upsert_survives_reload(tmp_path, index_type):
+    """An upsert that keeps the text still logs the new metadata for the next load."""
+    vector_db = JobFitmentVectorDB(make_env(), index_type=index_type, metric="ip", store_dir=tmp_path)
+    vector_db.embedding_model = HashingEncoder()
+    docs = [dict(doc, category="old") for doc in make_docs(10)]
+    vector_db.build_index(docs)
+
+    stats = vector_db.upsert([dict(docs[2], category="NEW")])
+    assert stats == {"added": 0, "updated": 0, "unchanged": 1}
+
+    reloaded = JobFitmentVectorDB(make_env(), index_type=index_type, metric="ip", store_dir=tmp_path)
+    reloaded.embedding_model = HashingEncoder()
+    assert reloaded.load_store()
+    doc = reloaded.documents[reloaded._positions[reloaded.document_id(docs[2])]]
+    assert doc["category"] == "NEW"
+    assert reloaded.search(docs[2]["question"], top_k=1)[0]["category"] == "NEW"
+
+
+def test_hnsw_upsert_retires_old_vector_without_rebuild(monkeypatch):
+    """Changed HNSW documents are re-added in place; only many retirements trigger a rebuild."""
+    vector_db = JobFitmentVectorDB(make_env(), index_type="hnsw", metric="ip")
+    vector_db.embedding_model = HashingEncoder()
+    docs = make_docs(40)
+    vector_db.build_index(docs)
+    rebuilds = []
+    original_rebuild = vector_db._rebuild_from_embeddings
+    monkeypatch.setattr(vector_db, "_rebuild_from_embeddings", lambda: rebuilds.append(1) or original_rebuild())
+
+    changed = dict(docs[5], answer="Pair program with a mentor.")
+    assert vector_db.upsert([changed])["updated"] == 1
+    assert rebuilds == [] and vector_db._retired == 1
+    assert vector_db.faiss_index.ntotal == 41
+    results = vector_db.search(changed["question"], top_k=40)
+    assert len(results) == 40
+    assert [r["answer"] for r in results if r["question"] == changed["question"]] == [changed["answer"]]
+
+    vector_db.remove_documents(docs[10:20])
+    assert rebuilds == [1] and vector_db._retired == 0
+    assert vector_db.faiss_index.ntotal == len(vector_db.doc_ids) == 30
@@ -13,10 +13,14 @@ A GenAI-driven application that helps IST402 students with:
 # Fix OpenMP library conflict on macOS (required for FAISS)
 # This prevents the "libomp.dylib already initialized" error
 import os
+import shutil
+import tempfile
+import zipfile
 os.environ.setdefault('KMP_DUPLICATE_LIB_OK', 'TRUE')
 
 import streamlit as st
 import pandas as pd
+from itertools import islice
 from pathlib import Path
 import sys
 import json
@@ -51,7 +55,8 @@ from core import (
     PromptEngineer,
     PromptType,
     APIIntegrationManager,
-    ContentGenerator
+    ContentGenerator,
+    get_response_cache
 )
 
 # Initialize logger
@@ -163,7 +168,9 @@ def initialize_generator():
         try:
             st.session_state.generator = ContentGenerator(
                 model_name="gpt-4o-mini",
-                temperature=0.7
+                temperature=0.7,
+                response_cache=get_response_cache(str(RESPONSE_CACHE_PATH)),
+                cache_sampled_responses=st.session_state.get('reuse_cached_responses', False)
             )
             logger.info("Content generator initialized")
         except Exception as e:
@@ -171,8 +178,42 @@ def initialize_generator():
             st.error(f"Error initializing generator: {str(e)}")
 
 
+EMBEDDING_MODEL = "text-embedding-3-small"
+VECTOR_CACHE_DIR = Path(__file__).parent / "data" / "vector_cache"
+RESPONSE_CACHE_PATH = Path(__file__).parent / "data" / "response_cache.sqlite"
+CSV_PREVIEW_ROWS = 1000
+
+
+@st.cache_resource(show_spinner="Loading IST concept index...")
+def get_shared_concepts_store(concepts_path: str, content_key: str, model: str = EMBEDDING_MODEL):
+    """
+    Process-wide IST concepts vector store, shared by every browser session.
+    
+    Built (and embedded) once per CSV content + embedding model, persisted under
+    data/vector_cache/<content_key>, and memory-mapped on later process starts.
+    content_key is part of the cache key, so editing the CSV rebuilds the store.
+    
+    Returns:
+        DataProcessor holding the read-only store, or None if embeddings are unavailable
+    """
+    processor = DataProcessor()
+    if not processor.embeddings_model or not FAISS_AVAILABLE:
+        return None
+    
+    concepts_df = processor.load_ist_concepts(concepts_path)
+    concept_chunks, concept_metadata = processor.build_concept_chunks(concepts_df)
+    if not concept_chunks:
+        return None
+    
+    loaded = processor.load_or_build_vector_store(
+        concept_chunks, concept_metadata, cache_dir=str(VECTOR_CACHE_DIR), key=content_key, model=model
+    )
+    logger.info(f"{'Loaded' if loaded else 'Built'} shared vector store for {len(concept_chunks)} IST concepts")
+    return processor
+
+
 def load_ist_concepts():
-    """Load IST concepts knowledge base and build vector store for semantic search."""
+    """Load IST concepts knowledge base and attach the shared vector store for semantic search."""
     try:
         if 'ist_concepts' not in st.session_state or st.session_state.ist_concepts is None:
             # Use path relative to app.py file location
@@ -186,46 +227,23 @@ def load_ist_concepts():
                 st.session_state.ist_concepts = ist_concepts_df
                 logger.info(f"Loaded {len(ist_concepts_df)} IST concepts")
                 
-                # Build vector store from IST concepts for semantic search
+                # Attach the process-wide vector store (built at most once per deployment)
                 if st.session_state.data_processor.embeddings_model and FAISS_AVAILABLE:
                     try:
-                        # Create text chunks from concept information
-                        concept_chunks = []
-                        concept_metadata = []
-                        
-                        for idx, row in ist_concepts_df.iterrows():
-                            # Combine concept information into searchable text
-                            concept_text = f"""
-                            Concept: {row.get('concept_name', '')}
-                            Week: {row.get('week', '')}
-                            Description: {row.get('description', '')}
-                            Learning Objectives: {row.get('learning_objectives', '')}
-                            Prerequisites: {row.get('prerequisites', 'None')}
-                            Difficulty: {row.get('difficulty', '')}
-                            Keywords: {row.get('keywords', '')}
-                            """.strip()
-                            
-                            concept_chunks.append(concept_text)
-                            concept_metadata.append({
-                                'concept_name': row.get('concept_name', ''),
-                                'week': row.get('week', ''),
-                                'difficulty': row.get('difficulty', ''),
-                                'chunk_id': idx
-                            })
-                        
-                        # Build vector store
-                        if concept_chunks:
-                            st.session_state.data_processor.build_vector_store(
-                                chunks=concept_chunks,
-                                metadata=concept_metadata,
-                                model="text-embedding-3-small"
-                            )
+                        shared = get_shared_concepts_store(
+                            str(concepts_path),
+                            DataProcessor.content_key(str(concepts_path), EMBEDDING_MODEL)
+                        )
+                        if shared is not None:
+                            # Sessions share the index and chunks by reference; searches only read them
+                            st.session_state.data_processor.vector_store = shared.vector_store
+                            st.session_state.data_processor.text_chunks = shared.text_chunks
+                            st.session_state.data_processor.metadata = shared.metadata
                             st.session_state.ist_concepts_vector_store_ready = True
-                            logger.info(f"Built vector store for {len(concept_chunks)} IST concepts")
                         else:
                             st.session_state.ist_concepts_vector_store_ready = False
                     except Exception as e:
-                        logger.warning(f"Could not build vector store for IST concepts: {str(e)}")
+                        logger.warning(f"Could not load vector store for IST concepts: {str(e)}")
                         st.session_state.ist_concepts_vector_store_ready = False
                 else:
                     st.session_state.ist_concepts_vector_store_ready = False
@@ -276,12 +294,23 @@ def main():
             help="Controls randomness in generation (0 = deterministic, 1 = creative)"
         )
         
+        reuse_cached_responses = st.checkbox(
+            "Reuse cached responses",
+            value=False,
+            key="reuse_cached_responses",
+            help="Serve identical requests (same model, temperature and prompt) from the shared response cache even when temperature > 0, so they return a previous sample instead of a fresh one. Requests at temperature 0 are always cached."
+        )
+        if st.session_state.generator:
+            st.session_state.generator.cache_sampled_responses = reuse_cached_responses
+        
         # Initialize generator with selected settings
         if st.button("Initialize Generator"):
             try:
                 st.session_state.generator = ContentGenerator(
                     model_name=model_name,
-                    temperature=temperature
+                    temperature=temperature,
+                    response_cache=get_response_cache(str(RESPONSE_CACHE_PATH)),
+                    cache_sampled_responses=reuse_cached_responses
                 )
                 st.success("Generator initialized!")
                 logger.info(f"Generator initialized with model: {model_name}")
@@ -298,6 +327,13 @@ def main():
                 st.success("✅ OpenAI API: Connected")
             else:
                 st.warning("⚠️ OpenAI API: Not configured")
+            cache_stats = st.session_state.generator.response_cache.get_stats()
+            if cache_stats['hits'] or cache_stats['misses']:
+                st.caption(
+                    f"🗃️ Response cache: {cache_stats['hit_rate']:.0%} hit rate "
+                    f"({cache_stats['hits']}/{cache_stats['hits'] + cache_stats['misses']}), "
+                    f"{cache_stats['tokens_saved']} tokens and {cache_stats['latency_saved_s']:.1f}s saved"
+                )
         else:
             st.info("ℹ️ Generator not initialized")
         
@@ -968,6 +1004,9 @@ def main():
                         ]
                         log_execution("Study Plan Generator", f"Applied topic filter: {topic_filter}", "✅")
                     
+                    # Order concepts so prerequisites come first, with their full prerequisite chains
+                    filtered_concepts = st.session_state.data_processor.get_catalog(ist_concepts_df).in_learning_order(filtered_concepts)
+                    
                     # Prepare concepts data for prompt
                     concepts_data = filtered_concepts.to_string(index=False) if not filtered_concepts.empty else "No concepts found"
                     
@@ -1023,10 +1062,10 @@ def main():
         st.divider()
         
         # Initialize session state for user notes vector store
-        if 'user_notes_chunks' not in st.session_state:
-            st.session_state.user_notes_chunks = []
         if 'user_notes_file' not in st.session_state:
             st.session_state.user_notes_file = None
+        if 'user_notes_chunk_plan' not in st.session_state:
+            st.session_state.user_notes_chunk_plan = None
         
         # User Notes Vector Store Status Card
         if st.session_state.user_notes_vector_store_ready and st.session_state.user_notes_processor.vector_store:
@@ -1037,7 +1076,7 @@ def main():
             with col2:
                 st.metric("Vectors", st.session_state.user_notes_processor.vector_store.ntotal if st.session_state.user_notes_processor.vector_store else 0)
             with col3:
-                st.metric("Chunks", len(st.session_state.user_notes_chunks))
+                st.metric("Chunks", len(st.session_state.user_notes_processor.text_chunks))
             with col4:
                 st.metric("Status", "Ready")
             
@@ -1061,210 +1100,284 @@ def main():
             try:
                 log_execution("Data Processing", f"Learning notes uploaded: {uploaded_file.name}", "✅")
                 st.session_state.user_notes_file = uploaded_file.name
-                file_path = f"data/temp_{uploaded_file.name}"
                 Path("data").mkdir(exist_ok=True)
                 
-                with open(file_path, "wb") as f:
-                    f.write(uploaded_file.getbuffer())
-                log_execution("Data Processing", "File saved to disk", "✅")
+                # Stream each new upload into a temp file of this session's own, instead of
+                # copying its whole buffer to a data/temp_<name> path shared by all sessions
+                if st.session_state.get('user_notes_upload_id') != uploaded_file.file_id:
+                    fd, upload_path = tempfile.mkstemp(prefix="temp_user_notes_", suffix=Path(uploaded_file.name).suffix, dir="data")
+                    with os.fdopen(fd, "wb") as f:
+                        uploaded_file.seek(0)
+                        shutil.copyfileobj(uploaded_file, f)
+                    previous_path = st.session_state.get('user_notes_upload_path')
+                    if previous_path:
+                        Path(previous_path).unlink(missing_ok=True)
+                        Path(previous_path + ".txt").unlink(missing_ok=True)  # CSV converted to text
+                    st.session_state.user_notes_upload_path = upload_path
+                    st.session_state.user_notes_upload_id = uploaded_file.file_id
+                    st.session_state.user_notes_chunk_plan = None
+                    log_execution("Data Processing", "File saved to disk", "✅")
+                file_path = st.session_state.user_notes_upload_path
                 
                 if uploaded_file.name.endswith('.csv'):
-                    df = st.session_state.user_notes_processor.load_csv(file_path)
+                    # Stream the CSV once per upload for its overview; later steps stream it again
+                    overview = st.session_state.get('user_notes_csv_overview')
+                    if overview is None or overview["path"] != file_path:
+                        overview = {"path": file_path, "rows": 0, "missing": 0}
+                        for chunk in st.session_state.user_notes_processor.iter_csv(file_path):
+                            if overview["rows"] == 0:
+                                overview["preview"] = chunk.head(CSV_PREVIEW_ROWS)
+                                overview["dtypes"] = chunk.dtypes
+                                overview["text_columns"] = chunk.select_dtypes(include=['object']).columns.tolist()
+                            overview["rows"] += len(chunk)
+                            overview["missing"] += int(chunk.isna().sum().sum())
+                        if overview["rows"] == 0:
+                            raise ValueError(f"CSV file is empty: {uploaded_file.name}")
+                        st.session_state.user_notes_csv_overview = overview
                     
                     st.subheader("Data Overview")
                     col1, col2, col3, col4 = st.columns(4)
                     with col1:
-                        st.metric("Rows", len(df))
+                        st.metric("Rows", overview["rows"])
                     with col2:
-                        st.metric("Columns", len(df.columns))
+                        st.metric("Columns", len(overview["dtypes"]))
                     with col3:
-                        st.metric("Missing Values", df.isna().sum().sum())
+                        st.metric("Missing Values", overview["missing"])
                     with col4:
-                        st.metric("Data Types", len(df.dtypes.unique()))
+                        st.metric("Data Types", len(overview["dtypes"].unique()))
                     
                     st.subheader("Data Preview")
-                    st.dataframe(df)
+                    st.caption(f"First {len(overview['preview'])} of {overview['rows']} rows")
+                    st.dataframe(overview["preview"])
                     
                     st.subheader("Column Information")
-                    st.json(df.dtypes.to_dict())
+                    st.json(overview["dtypes"].to_dict())
                     
                     if st.button("Preprocess Data"):
-                        processed = st.session_state.data_processor.preprocess_dataframe(df)
-                        st.success(f"Processed {len(processed)} records")
-                        st.json(processed[:3])  # Show first 3 records
+                        # Process the CSV chunk by chunk, in batches, so large uploads never exist
+                        # as one DataFrame or one list of dicts
+                        num_records = 0
+                        preview = []
+                        for chunk in st.session_state.user_notes_processor.iter_csv(file_path):
+                            for batch in st.session_state.data_processor.iter_preprocessed_records(chunk, overview["text_columns"]):
+                                if not preview:
+                                    preview = batch[:3]
+                                num_records += len(batch)
+                        st.success(f"Processed {num_records} records")
+                        st.json(preview)  # Show first 3 records
                     
                     # For CSV, convert to text for vector search
                     st.info("💡 Tip: Convert CSV to text chunks for vector search using LangChain, or upload a text/markdown file directly.")
                     if st.button("Convert to Text for Vector Search (LangChain)"):
-                        # Combine all text columns
-                        text_columns = df.select_dtypes(include=['object']).columns
-                        if len(text_columns) > 0:
-                            combined_text = "\n\n".join([f"{col}: {df[col].astype(str).str.cat(sep=' ')}" for col in text_columns])
+                        # Combine all text columns into a text file, then chunk it as it is read
+                        text_path = file_path + ".txt"
+                        text_columns = st.session_state.user_notes_processor.csv_to_text_file(file_path, text_path, overview["text_columns"])
+                        if text_columns:
                             log_execution("Data Processing", "Chunking CSV text with LangChain", "⏳")
-                            st.session_state.user_notes_chunks = st.session_state.user_notes_processor.chunk_text(combined_text, 1000, 200, use_langchain=True)
-                            st.success(f"Created {len(st.session_state.user_notes_chunks)} text chunks from CSV using LangChain")
-                            log_execution("Data Processing", f"Created {len(st.session_state.user_notes_chunks)} chunks from CSV using LangChain", "✅")
+                            num_chunks = sum(1 for _ in st.session_state.user_notes_processor.iter_text_chunks(text_path, 1000, 200, use_langchain=True))
+                            st.session_state.user_notes_chunk_plan = {
+                                "path": text_path,
+                                "chunk_size": 1000,
+                                "chunk_overlap": 200,
+                                "num_chunks": num_chunks
+                            }
+                            st.success(f"Created {num_chunks} text chunks from CSV using LangChain")
+                            log_execution("Data Processing", f"Created {num_chunks} chunks from CSV using LangChain", "✅")
                         else:
                             st.warning("No text columns found in CSV for vector search.")
                 
-                elif uploaded_file.name.endswith('.txt'):
-                    log_execution("Data Processing", "Loading learning notes text file", "⏳")
-                    text = st.session_state.user_notes_processor.load_text_file(file_path)
-                    log_execution("Data Processing", f"Text loaded: {len(text)} characters", "✅")
-                
-                elif uploaded_file.name.endswith('.md'):
-                    log_execution("Data Processing", "Loading learning notes markdown file using LangChain", "⏳")
-                    text = st.session_state.user_notes_processor.load_markdown_file(file_path)
-                    log_execution("Data Processing", f"Markdown loaded: {len(text)} characters using LangChain", "✅")
+                elif uploaded_file.name.endswith(('.txt', '.md')):
+                    file_kind = "Markdown" if uploaded_file.name.endswith('.md') else "Text"
+                    log_execution("Data Processing", f"Streaming learning notes {file_kind.lower()} file", "⏳")
+                    # Count in one streamed pass; words split across two blocks are counted once
+                    num_chars = num_words = num_lines = 0
+                    mid_word = False
+                    for block in st.session_state.user_notes_processor.iter_text_file(file_path):
+                        num_chars += len(block)
+                        num_lines += block.count('\n')
+                        num_words += len(block.split()) - (1 if mid_word and not block[0].isspace() else 0)
+                        mid_word = not block[-1].isspace()
+                    num_lines += 1
+                    log_execution("Data Processing", f"{file_kind} streamed: {num_chars} characters", "✅")
                     
-                    st.subheader("Markdown File Statistics")
+                    st.subheader(f"{file_kind} File Statistics")
                     col1, col2, col3 = st.columns(3)
                     with col1:
-                        st.metric("Characters", len(text))
+                        st.metric("Characters", num_chars)
                     with col2:
-                        st.metric("Words", len(text.split()))
+                        st.metric("Words", num_words)
                     with col3:
-                        st.metric("Lines", len(text.split('\n')))
+                        st.metric("Lines", num_lines)
                     
                     st.divider()
                     st.subheader("📝 Text Chunking (Using LangChain)")
-                    st.info("💡 **Using LangChain's RecursiveCharacterTextSplitter** for intelligent text chunking that preserves context and markdown structure.")
+                    st.info("💡 **Using LangChain's RecursiveCharacterTextSplitter** for intelligent text chunking that preserves context and markdown structure. The file is chunked as it is read, so large notes are never held in memory at once.")
                     chunk_size = st.slider("Chunk Size", 500, 2000, 1000, 100)
                     chunk_overlap = st.slider("Chunk Overlap", 0, 500, 200, 50, help="Overlap between chunks to preserve context")
-                    if st.button("Chunk Markdown with LangChain", type="primary"):
-                        log_execution("Data Processing", f"Chunking markdown with LangChain (size: {chunk_size}, overlap: {chunk_overlap})", "⏳")
-                        chunks = st.session_state.user_notes_processor.chunk_text(text, chunk_size, chunk_overlap, use_langchain=True)
-                        st.session_state.user_notes_chunks = chunks
-                        log_execution("Data Processing", f"Created {len(chunks)} chunks using LangChain", "✅")
-                        st.success(f"✅ Created {len(chunks)} chunks using LangChain's RecursiveCharacterTextSplitter")
-                        for i, chunk in enumerate(chunks[:3], 1):
+                    if st.button(f"Chunk {file_kind} with LangChain", type="primary"):
+                        log_execution("Data Processing", f"Chunking {file_kind.lower()} with LangChain (size: {chunk_size}, overlap: {chunk_overlap})", "⏳")
+                        chunks = st.session_state.user_notes_processor.iter_text_chunks(file_path, chunk_size, chunk_overlap, use_langchain=True)
+                        preview = list(islice(chunks, 3))
+                        num_chunks = len(preview) + sum(1 for _ in chunks)
+                        # Keep only the settings; the chunks are streamed again into the vector store
+                        st.session_state.user_notes_chunk_plan = {
+                            "path": file_path,
+                            "chunk_size": chunk_size,
+                            "chunk_overlap": chunk_overlap,
+                            "num_chunks": num_chunks
+                        }
+                        log_execution("Data Processing", f"Created {num_chunks} chunks using LangChain", "✅")
+                        st.success(f"✅ Created {num_chunks} chunks using LangChain's RecursiveCharacterTextSplitter")
+                        for i, chunk in enumerate(preview, 1):
                             with st.expander(f"Chunk {i} (Preview)"):
                                 st.text(chunk[:500])
+                
+                # Vector Store Creation for User Notes
+                chunk_plan = st.session_state.get('user_notes_chunk_plan')
+                if chunk_plan:
+                    st.divider()
+                    st.subheader("🔍 Build Vector Store for Your Learning Notes")
+                    st.info("💡 This vector store will be used in Concept Explainer and Quiz Me to enhance explanations with citations from your notes.")
+                    
+                    col1, col2 = st.columns([2, 1])
+                    with col1:
+                        embedding_model = st.selectbox(
+                            "Embedding Model",
+                            ["text-embedding-3-small", "text-embedding-3-large", "text-embedding-ada-002"],
+                            help="OpenAI embedding model to use",
+                            key="user_notes_embedding_model"
+                        )
+                    with col2:
+                        st.metric("Chunks Ready", chunk_plan["num_chunks"])
+                    
+                    if st.button("🔨 Build Vector Store for Learning Notes", type="primary"):
+                        try:
+                            if not st.session_state.user_notes_processor.embeddings_model:
+                                st.error("❌ OpenAI API key not configured. Please set OPENAI_API_KEY in .env file.")
+                                log_execution("Data Processing", "OpenAI API key not configured", "❌")
+                            else:
+                                log_execution("Data Processing", f"Creating embeddings for {chunk_plan['num_chunks']} chunks using {embedding_model}", "⏳")
+                                with st.spinner(f"Creating embeddings for {chunk_plan['num_chunks']} chunks..."):
+                                    # Stream the chunks from the file straight into the embedding batches
+                                    chunks = st.session_state.user_notes_processor.iter_text_chunks(
+                                    chunk_plan["path"], chunk_plan["chunk_size"], chunk_plan["chunk_overlap"], use_langchain=True
+                                    )
+                                    st.session_state.user_notes_processor.build_vector_store(
+                                        chunks=chunks,
+                                        metadata={"file": uploaded_file.name, "source": "user_notes"},
+                                        model=embedding_model
+                                    )
+                                    st.session_state.user_notes_vector_store_ready = True
+                                    num_vectors = st.session_state.user_notes_processor.vector_store.ntotal if st.session_state.user_notes_processor.vector_store else 0
+                                    log_execution("Data Processing", f"User notes vector store built successfully", "✅", f"{num_vectors} vectors created")
+                                    st.success(f"✅ Learning notes vector store created with {num_vectors} vectors!")
+                                    st.balloons()  # Celebration!
+                        except Exception as e:
+                            st.error(f"Error building vector store: {str(e)}")
+                            log_execution("Data Processing", f"Error building vector store: {str(e)}", "❌")
+                            logger.log_error(e, "Error building user notes vector store")
                     
-                    # Vector Store Creation for User Notes
-                    if st.session_state.user_notes_chunks:
+                    # Vector Search
+                    if st.session_state.user_notes_vector_store_ready:
                         st.divider()
-                        st.subheader("🔍 Build Vector Store for Your Learning Notes")
-                        st.info("💡 This vector store will be used in Concept Explainer and Quiz Me to enhance explanations with citations from your notes.")
+                        st.subheader("🔎 Semantic Search")
                         
-                        col1, col2 = st.columns([2, 1])
+                        col1, col2 = st.columns([3, 1])
                         with col1:
-                            embedding_model = st.selectbox(
-                                "Embedding Model",
-                                ["text-embedding-3-small", "text-embedding-3-large", "text-embedding-ada-002"],
-                                help="OpenAI embedding model to use",
-                                key="user_notes_embedding_model"
+                            search_query = st.text_input(
+                                "Search Query",
+                                placeholder="Enter your search query...",
+                                key="vector_search_query"
                             )
                         with col2:
-                            st.metric("Chunks Ready", len(st.session_state.user_notes_chunks))
+                            num_results = st.number_input("Results", min_value=1, max_value=20, value=5, step=1)
                         
-                        if st.button("🔨 Build Vector Store for Learning Notes", type="primary"):
+                        if st.button("🔍 Search Your Notes", type="primary") and search_query:
                             try:
-                                if not st.session_state.user_notes_processor.embeddings_model:
-                                    st.error("❌ OpenAI API key not configured. Please set OPENAI_API_KEY in .env file.")
-                                    log_execution("Data Processing", "OpenAI API key not configured", "❌")
-                                else:
-                                    log_execution("Data Processing", f"Creating embeddings for {len(st.session_state.user_notes_chunks)} chunks using {embedding_model}", "⏳")
-                                    with st.spinner(f"Creating embeddings for {len(st.session_state.user_notes_chunks)} chunks..."):
-                                        # Create metadata for chunks with file info
-                                        metadata = [{"chunk_id": i, "file": uploaded_file.name, "source": "user_notes"} for i in range(len(st.session_state.user_notes_chunks))]
-                                        
-                                        st.session_state.user_notes_processor.build_vector_store(
-                                            chunks=st.session_state.user_notes_chunks,
-                                            metadata=metadata,
-                                            model=embedding_model
-                                        )
-                                        st.session_state.user_notes_vector_store_ready = True
-                                        num_vectors = st.session_state.user_notes_processor.vector_store.ntotal if st.session_state.user_notes_processor.vector_store else 0
-                                        log_execution("Data Processing", f"User notes vector store built successfully", "✅", f"{num_vectors} vectors created")
-                                        st.success(f"✅ Learning notes vector store created with {num_vectors} vectors!")
-                                        st.balloons()  # Celebration!
+                                log_execution("Data Processing", f"Searching user notes for: '{search_query}'", "⏳")
+                                with st.spinner("Searching your learning notes..."):
+                                    results = st.session_state.user_notes_processor.search_vectors(
+                                        query=search_query,
+                                        k=num_results,
+                                        model=embedding_model
+                                    )
+                                    log_execution("Data Processing", f"Search completed", "✅", f"Found {len(results)} results")
+                                
+                                st.subheader(f"📊 Search Results ({len(results)} found)")
+                                
+                                for result in results:
+                                    with st.expander(f"Result #{result['rank']} (Similarity: {result['similarity']:.2%})"):
+                                        st.markdown(f"**Similarity Score:** {result['similarity']:.2%}")
+                                        st.markdown(f"**Distance:** {result['score']:.4f}")
+                                        st.markdown("**Content:**")
+                                        st.text(result['chunk'])
+                                        if result['metadata']:
+                                            st.markdown("**Metadata:**")
+                                            st.json(result['metadata'])
+                                
+                                # Show summary
+                                st.info(f"Found {len(results)} most similar chunks for: '{search_query}'")
+                                
                             except Exception as e:
-                                st.error(f"Error building vector store: {str(e)}")
-                                log_execution("Data Processing", f"Error building vector store: {str(e)}", "❌")
-                                logger.log_error(e, "Error building user notes vector store")
+                                st.error(f"Error searching: {str(e)}")
+                                logger.log_error(e, "Error in vector search")
                         
-                        # Vector Search
-                        if st.session_state.user_notes_vector_store_ready:
-                            st.divider()
-                            st.subheader("🔎 Semantic Search")
-                            
-                            col1, col2 = st.columns([3, 1])
-                            with col1:
-                                search_query = st.text_input(
-                                    "Search Query",
-                                    placeholder="Enter your search query...",
-                                    key="vector_search_query"
-                                )
-                            with col2:
-                                num_results = st.number_input("Results", min_value=1, max_value=20, value=5, step=1)
-                            
-                            if st.button("🔍 Search Your Notes", type="primary") and search_query:
+                        # Save/Load Vector Store
+                        st.divider()
+                        st.subheader("💾 Learning Notes Vector Store Management")
+                        col1, col2 = st.columns(2)
+                        
+                        with col1:
+                            if st.session_state.user_notes_vector_store_ready:
+                                if st.button("💾 Save Learning Notes Vector Store"):
+                                    try:
+                                        save_path = f"data/user_notes_vector_store_{Path(uploaded_file.name).stem}"
+                                        st.session_state.user_notes_processor.save_vector_store(save_path)
+                                        # Zip the store directory so it can be downloaded and loaded again
+                                        archive_path = shutil.make_archive(save_path, 'zip', root_dir=save_path)
+                                        st.success(f"Learning notes vector store saved to {save_path}/")
+                                        with open(archive_path, "rb") as f:
+                                            st.download_button(
+                                                "⬇️ Download Vector Store",
+                                                data=f.read(),
+                                                file_name=Path(archive_path).name,
+                                                mime="application/zip"
+                                            )
+                                        log_execution("Data Processing", f"Vector store saved: {save_path}", "✅")
+                                    except Exception as e:
+                                        st.error(f"Error saving: {str(e)}")
+                                        log_execution("Data Processing", f"Error saving vector store: {str(e)}", "❌")
+                        
+                        with col2:
+                            load_file = st.file_uploader(
+                                "Load Learning Notes Vector Store",
+                                type=['zip'],
+                                key="load_user_notes_vector_store"
+                            )
+                            if load_file and st.button("📂 Load Learning Notes Vector Store"):
                                 try:
-                                    log_execution("Data Processing", f"Searching user notes for: '{search_query}'", "⏳")
-                                    with st.spinner("Searching your learning notes..."):
-                                        results = st.session_state.user_notes_processor.search_vectors(
-                                            query=search_query,
-                                            k=num_results,
-                                            model=embedding_model
-                                        )
-                                        log_execution("Data Processing", f"Search completed", "✅", f"Found {len(results)} results")
-                                    
-                                    st.subheader(f"📊 Search Results ({len(results)} found)")
-                                    
-                                    for result in results:
-                                        with st.expander(f"Result #{result['rank']} (Similarity: {result['similarity']:.2%})"):
-                                            st.markdown(f"**Similarity Score:** {result['similarity']:.2%}")
-                                            st.markdown(f"**Distance:** {result['score']:.4f}")
-                                            st.markdown("**Content:**")
-                                            st.text(result['chunk'])
-                                            if result['metadata']:
-                                                st.markdown("**Metadata:**")
-                                                st.json(result['metadata'])
-                                    
-                                    # Show summary
-                                    st.info(f"Found {len(results)} most similar chunks for: '{search_query}'")
-                                    
-                                except Exception as e:
-                                    st.error(f"Error searching: {str(e)}")
-                                    logger.log_error(e, "Error in vector search")
-                            
-                            # Save/Load Vector Store
-                            st.divider()
-                            st.subheader("💾 Learning Notes Vector Store Management")
-                            col1, col2 = st.columns(2)
-                            
-                            with col1:
-                                if st.session_state.user_notes_vector_store_ready:
-                                    if st.button("💾 Save Learning Notes Vector Store"):
-                                        try:
-                                            save_path = f"data/user_notes_vector_store_{uploaded_file.name.replace('.txt', '').replace('.csv', '')}.pkl"
-                                            st.session_state.user_notes_processor.save_vector_store(save_path)
-                                            st.success(f"Learning notes vector store saved to {save_path}")
-                                            log_execution("Data Processing", f"Vector store saved: {save_path}", "✅")
-                                        except Exception as e:
-                                            st.error(f"Error saving: {str(e)}")
-                                            log_execution("Data Processing", f"Error saving vector store: {str(e)}", "❌")
-                            
-                            with col2:
-                                load_file = st.file_uploader(
-                                    "Load Learning Notes Vector Store",
-                                    type=['pkl'],
-                                    key="load_user_notes_vector_store"
-                                )
-                                if load_file and st.button("📂 Load Learning Notes Vector Store"):
+                                    # Stores are directories (no pickles); extract the uploaded archive into a
+                                    # directory of this session's own, so sessions uploading the same file don't collide
+                                    load_path = tempfile.mkdtemp(prefix="temp_user_notes_store_", dir="data")
                                     try:
-                                        load_path = f"data/temp_{load_file.name}"
-                                        with open(load_path, "wb") as f:
-                                            f.write(load_file.getbuffer())
+                                        with zipfile.ZipFile(load_file) as archive:
+                                            archive.extractall(load_path)
                                         st.session_state.user_notes_processor.load_vector_store(load_path)
-                                        st.session_state.user_notes_vector_store_ready = True
-                                        st.success("Learning notes vector store loaded successfully!")
-                                        log_execution("Data Processing", f"Vector store loaded: {load_file.name}", "✅")
-                                    except Exception as e:
-                                        st.error(f"Error loading: {str(e)}")
-                                        log_execution("Data Processing", f"Error loading vector store: {str(e)}", "❌")
-            
+                                    except Exception:
+                                        shutil.rmtree(load_path, ignore_errors=True)
+                                        raise
+                                    # The loaded store maps its files; only the previous one can be removed
+                                    previous_path = st.session_state.get('user_notes_store_dir')
+                                    if previous_path:
+                                        shutil.rmtree(previous_path, ignore_errors=True)
+                                    st.session_state.user_notes_store_dir = load_path
+                                    st.session_state.user_notes_vector_store_ready = True
+                                    st.success("Learning notes vector store loaded successfully!")
+                                    log_execution("Data Processing", f"Vector store loaded: {load_file.name}", "✅")
+                                except Exception as e:
+                                    st.error(f"Error loading: {str(e)}")
+                                    log_execution("Data Processing", f"Error loading vector store: {str(e)}", "❌")
+        
             except Exception as e:
                 st.error(f"Error processing file: {str(e)}")
                 logger.log_error(e, "Error in data processing tab")
@@ -4,17 +4,27 @@ Core modules for Skill Builder for IST Students.
 
 from core.logger import get_logger
 from core.data_processor import DataProcessor
+from core.embedding_cache import EmbeddingCache, get_embedding_cache
+from core.text_chunker import TextChunker
+from core.concept_catalog import ConceptCatalog
 from core.prompt_engineer import PromptEngineer, PromptType
 from core.api_integration import APIIntegrationManager, OpenAIWebSearchAPI, NewsAPI
 from core.content_generator import ContentGenerator
+from core.response_cache import ResponseCache, get_response_cache
 
 __all__ = [
     'get_logger',
     'DataProcessor',
+    'EmbeddingCache',
+    'get_embedding_cache',
+    'TextChunker',
+    'ConceptCatalog',
     'PromptEngineer',
     'PromptType',
     'APIIntegrationManager',
     'OpenAIWebSearchAPI',
     'NewsAPI',
-    'ContentGenerator'
+    'ContentGenerator',
+    'ResponseCache',
+    'get_response_cache'
 ]
\ No newline at end of file
@@ -0,0 +1,160 @@
+"""
+Concept Catalog Module
+Indexed view of the IST concepts knowledge base, built once at load.
+Serves name and week lookups from dictionaries and precomputed prerequisite
+chains instead of scanning the DataFrame on every Streamlit rerun.
+"""
+
+from typing import Any, Dict, List, Optional
+import pandas as pd
+
+from core.logger import get_logger
+
+logger = get_logger()
+
+
+class ConceptCatalog:
+    """
+    Read-only index over an IST concepts DataFrame.
+    
+    Names are case-folded and weeks upper-cased once, so lookups are dictionary
+    hits. The prerequisites column becomes a graph whose transitive chains and
+    learning order are computed up front.
+    """
+    
+    # Values of the prerequisites column meaning "no prerequisites"
+    NO_PREREQUISITES = {"", "none", "nan", "n/a"}
+    
+    def __init__(self, df: pd.DataFrame):
+        """
+        Build the indexes.
+        
+        Args:
+            df: IST concepts DataFrame (concept_name, week, prerequisites, ...)
+        """
+        self.logger = logger
+        self.df = df
+        self._records: List[Dict[str, Any]] = df.to_dict('records')
+        self._by_name: Dict[str, int] = {}
+        self._by_week: Dict[str, List[int]] = {}
+        
+        for position, record in enumerate(self._records):
+            name = record.get('concept_name')
+            if isinstance(name, str):
+                # Like the DataFrame scan this replaces, the first row with a name wins
+                self._by_name.setdefault(name.casefold(), position)
+            week = record.get('week')
+            if isinstance(week, str):
+                self._by_week.setdefault(week.upper(), []).append(position)
+        
+        self.prerequisites: Dict[str, List[str]] = {
+            self._records[position]['concept_name']: self._parse_prerequisites(self._records[position].get('prerequisites'))
+            for position in self._by_name.values()
+        }
+        self._chains: Dict[str, List[str]] = {}
+        self._order: Dict[str, int] = {}
+        for name in self.prerequisites:
+            self._resolve_chain(name, set())
+        
+        self.logger.info(f"Concept catalog built: {len(self._by_name)} concepts, {len(self._by_week)} weeks")
+    
+    def __len__(self) -> int:
+        return len(self._by_name)
+    
+    def __contains__(self, concept_name: str) -> bool:
+        return concept_name.casefold() in self._by_name
+    
+    def _canonical(self, name: str) -> str:
+        """Catalog spelling of a concept name (unknown names are returned as given)."""
+        position = self._by_name.get(name.casefold())
+        return self._records[position]['concept_name'] if position is not None else name
+    
+    def _parse_prerequisites(self, value: Any) -> List[str]:
+        if not isinstance(value, str):
+            return []
+        names = [part.strip() for part in value.split(',')]
+        return [self._canonical(name) for name in names if name.casefold() not in self.NO_PREREQUISITES]
+    
+    def _resolve_chain(self, name: str, visiting: set) -> List[str]:
+        """
+        Depth-first walk computing every concept's chain and learning-order rank.
+        
+        Args:
+            name: Concept to resolve
+            visiting: Concepts on the current path (a prerequisite cycle is cut there)
+        
+        Returns:
+            Transitive prerequisites of name, each listed after its own prerequisites
+        """
+        if name in self._chains:
+            return self._chains[name]
+        visiting.add(name)
+        chain: List[str] = []
+        seen = set()
+        for prerequisite in self.prerequisites.get(name, []):
+            if prerequisite in visiting:
+                self.logger.warning(f"Prerequisite cycle between {name} and {prerequisite}, ignoring")
+                continue
+            for step in self._resolve_chain(prerequisite, visiting) + [prerequisite]:
+                if step not in seen:
+                    seen.add(step)
+                    chain.append(step)
+        visiting.discard(name)
+        
+        self._chains[name] = chain
+        self._order[name] = len(self._order)  # post-order: after all prerequisites
+        return chain
+    
+    def get(self, concept_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Get information about a concept (case-insensitive).
+        
+        Args:
+            concept_name: Name of the concept
+        
+        Returns:
+            Dictionary with concept information or None
+        """
+        position = self._by_name.get(concept_name.casefold())
+        return dict(self._records[position]) if position is not None else None
+    
+    def by_week(self, week: str) -> pd.DataFrame:
+        """
+        Concepts of a week (case-insensitive).
+        
+        Args:
+            week: Week identifier (e.g., "W00", "W01")
+        
+        Returns:
+            Filtered DataFrame
+        """
+        return self.df.iloc[self._by_week.get(week.upper(), [])]
+    
+    def prerequisite_chain(self, concept_name: str) -> List[str]:
+        """
+        All prerequisites of a concept, transitively, in the order to learn them.
+        
+        Args:
+            concept_name: Name of the concept
+        
+        Returns:
+            Concept names (empty for unknown concepts or none)
+        """
+        return list(self._chains.get(self._canonical(concept_name), []))
+    
+    def in_learning_order(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Reorder concept rows so prerequisites come before the concepts needing them.
+        
+        Args:
+            df: Subset of the concepts DataFrame
+        
+        Returns:
+            Reordered DataFrame with a prerequisite_chain column added
+        """
+        names = df['concept_name'].map(lambda name: self._canonical(name) if isinstance(name, str) else name)
+        rank = names.map(lambda name: self._order.get(name, len(self._order)))
+        ordered = df.assign(
+            prerequisite_chain=names.map(lambda name: " -> ".join(self._chains.get(name, [])) or "None")
+        )
+        return ordered.iloc[rank.to_numpy().argsort(kind='stable')]
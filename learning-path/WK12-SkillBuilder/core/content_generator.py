@@ -3,9 +3,13 @@ GenAI Model Integration Module
 Integrates with OpenAI and LangChain for content generation.
 """
 
+import asyncio
 import os
-from typing import Dict, Any, Optional, List
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Any, Optional, List, Tuple
 from langchain_openai import ChatOpenAI
+from openai import DefaultAsyncHttpxClient
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
 
 # Try to import callback for token tracking (optional)
@@ -40,6 +44,8 @@ except ImportError:
 
 from core.logger import get_logger
 from core.prompt_engineer import PromptEngineer, PromptType
+from core.response_cache import ResponseCache, get_response_cache
+from core.retry import retry_delay
 
 logger = get_logger()
 
@@ -50,16 +56,32 @@ class ContentGenerator:
     Handles model initialization, prompt execution, and response generation.
     """
     
-    def __init__(self, model_name: str = "gpt-4o-mini", temperature: float = 0.7):
+    # abatch_generate() defaults
+    BATCH_CONCURRENCY = 5
+    REQUEST_TIMEOUT_S = 60.0
+    MAX_RETRIES = 3
+    BACKOFF_S = 1.0
+    MAX_BACKOFF_S = 30.0
+    
+    def __init__(self, model_name: str = "gpt-4o-mini", temperature: float = 0.7,
+                 response_cache: Optional[ResponseCache] = None,
+                 cache_sampled_responses: bool = False,
+                 base_url: Optional[str] = None):
         """
         Initialize content generator with OpenAI model.
         
         Args:
             model_name: OpenAI model name (gpt-4, gpt-4o-mini, gpt-3.5-turbo)
             temperature: Sampling temperature (0.0-2.0)
+            response_cache: Response cache to use (default: the shared process-wide cache)
+            cache_sampled_responses: Also cache when temperature > 0, where a fresh
+                call would give a different response
+            base_url: OpenAI-compatible endpoint, e.g. a local stub server
+                (default: OPENAI_BASE_URL or the OpenAI API)
         """
         self.logger = logger
         self.api_key = os.getenv('OPENAI_API_KEY')
+        self.base_url = base_url or os.getenv('OPENAI_BASE_URL')
         
         if not self.api_key:
             self.logger.error("OPENAI_API_KEY not configured. Content generation will fail.")
@@ -69,7 +91,8 @@ class ContentGenerator:
                 self.llm = ChatOpenAI(
                     model_name=model_name,
                     temperature=temperature,
-                    openai_api_key=self.api_key
+                    openai_api_key=self.api_key,
+                    base_url=self.base_url
                 )
                 self.logger.info(f"Initialized OpenAI model: {model_name}")
             except Exception as e:
@@ -79,12 +102,15 @@ class ContentGenerator:
         self.prompt_engineer = PromptEngineer()
         self.model_name = model_name
         self.temperature = temperature
+        self.response_cache = response_cache if response_cache is not None else get_response_cache()
+        self.cache_sampled_responses = cache_sampled_responses
     
     def generate_content(self,
                         prompt: str,
                         system_message: Optional[str] = None,
                         max_tokens: int = 1000,
-                        use_callback: bool = True) -> Dict[str, Any]:
+                        use_callback: bool = True,
+                        use_cache: Optional[bool] = None) -> Dict[str, Any]:
         """
         Generate content using the LLM.
         
@@ -93,9 +119,11 @@ class ContentGenerator:
             system_message: Optional system message for context
             max_tokens: Maximum tokens in response
             use_callback: Whether to track token usage
+            use_cache: Serve and store the response in the response cache (default:
+                only at temperature 0, or when cache_sampled_responses is set)
             
         Returns:
-            Dictionary with generated content and metadata
+            Dictionary with generated content and metadata ('cached' is True for cache hits)
         """
         try:
             if not self.llm:
@@ -103,13 +131,14 @@ class ContentGenerator:
                 self.logger.error(error_msg)
                 raise ValueError(error_msg)
             
-            # Build messages
-            messages = []
-            if system_message:
-                messages.append(SystemMessage(content=system_message))
-            messages.append(HumanMessage(content=prompt))
+            cache_key, cached = self._check_cache(prompt, system_message, max_tokens, use_cache)
+            if cached is not None:
+                return cached
+            
+            messages = self._build_messages(prompt, system_message)
             
             # Generate with callback for token tracking
+            start = time.perf_counter()
             if use_callback:
                 with get_openai_callback() as cb:
                     response = self.llm.invoke(messages)
@@ -128,18 +157,24 @@ class ContentGenerator:
                     'total_cost': None
                 }
             
+            latency = time.perf_counter() - start
             content = response.content if hasattr(response, 'content') else str(response)
             
             self.logger.info(f"Generated content: {len(content)} characters")
             if token_usage['total_tokens']:
                 self.logger.info(f"Token usage: {token_usage['total_tokens']} tokens")
             
-            return {
+            result = {
                 'content': content,
                 'model': self.model_name,
                 'token_usage': token_usage,
-                'success': True
+                'success': True,
+                'cached': False,
+                'latency_s': round(latency, 3)
             }
+            if cache_key is not None:
+                self.response_cache.put(cache_key, result)
+            return result
             
         except Exception as e:
             self.logger.log_error(e, "Error generating content")
@@ -151,6 +186,154 @@ class ContentGenerator:
                 'error': str(e)
             }
     
+    def _check_cache(self, prompt: str, system_message: Optional[str], max_tokens: int,
+                     use_cache: Optional[bool]) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Look up a request in the response cache.
+        
+        Returns:
+            Tuple of (cache key, or None if caching is off; cached result or None)
+        """
+        if use_cache is None:
+            use_cache = self.temperature == 0 or self.cache_sampled_responses
+        if not use_cache:
+            self.response_cache.record_bypass()
+            return None, None
+        
+        cache_key = ResponseCache.make_key(self.model_name, self.temperature, max_tokens, system_message, prompt,
+                                           base_url=self.base_url)
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            self.logger.info(f"Served content from response cache ({len(cached['content'])} characters)")
+        return cache_key, cached
+    
+    def _build_messages(self, prompt: str, system_message: Optional[str]) -> List[Any]:
+        messages = []
+        if system_message:
+            messages.append(SystemMessage(content=system_message))
+        messages.append(HumanMessage(content=prompt))
+        return messages
+    
+    @asynccontextmanager
+    async def _async_llm(self) -> AsyncIterator[ChatOpenAI]:
+        """
+        ChatOpenAI for async calls on the running event loop.
+        
+        It gets its own HTTP client, closed on exit, because a pooled client is bound
+        to the loop it first ran on and batch_generate() starts a new loop per call.
+        Client retries are off since agenerate_content() retries with backoff itself.
+        """
+        http_client = DefaultAsyncHttpxClient()
+        try:
+            yield ChatOpenAI(
+                model_name=self.model_name,
+                temperature=self.temperature,
+                openai_api_key=self.api_key,
+                base_url=self.base_url,
+                max_retries=0,
+                http_async_client=http_client
+            )
+        finally:
+            await http_client.aclose()
+    
+    async def agenerate_content(self,
+                                prompt: str,
+                                system_message: Optional[str] = None,
+                                max_tokens: int = 1000,
+                                use_cache: Optional[bool] = None,
+                                timeout: Optional[float] = None,
+                                max_retries: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Async version of generate_content() with a per-attempt timeout and
+        retries with backoff on rate limits (429), 5xx, timeouts and connection errors.
+        
+        Args:
+            prompt: User prompt
+            system_message: Optional system message for context
+            max_tokens: Maximum tokens in response
+            use_cache: Serve and store the response in the response cache (see generate_content())
+            timeout: Seconds per attempt (default: REQUEST_TIMEOUT_S)
+            max_retries: Retries after the first attempt (default: MAX_RETRIES)
+            
+        Returns:
+            Dictionary with generated content and metadata; failures are returned
+            with success=False rather than raised
+        """
+        if not self.llm:
+            return await self._agenerate_content(None, prompt, system_message, max_tokens, use_cache,
+                                                 timeout, max_retries)
+        async with self._async_llm() as llm:
+            return await self._agenerate_content(llm, prompt, system_message, max_tokens, use_cache,
+                                                 timeout, max_retries)
+    
+    async def _agenerate_content(self, llm: Optional[ChatOpenAI], prompt: str,
+                                 system_message: Optional[str] = None,
+                                 max_tokens: int = 1000,
+                                 use_cache: Optional[bool] = None,
+                                 timeout: Optional[float] = None,
+                                 max_retries: Optional[int] = None) -> Dict[str, Any]:
+        """agenerate_content() on a client from _async_llm()."""
+        timeout = timeout if timeout is not None else self.REQUEST_TIMEOUT_S
+        max_retries = max_retries if max_retries is not None else self.MAX_RETRIES
+        try:
+            if not llm:
+                error_msg = "OpenAI API not configured. Please set OPENAI_API_KEY environment variable."
+                self.logger.error(error_msg)
+                raise ValueError(error_msg)
+            
+            cache_key, cached = self._check_cache(prompt, system_message, max_tokens, use_cache)
+            if cached is not None:
+                return cached
+            
+            messages = self._build_messages(prompt, system_message)
+            start = time.perf_counter()
+            for attempt in range(max_retries + 1):
+                try:
+                    response = await asyncio.wait_for(llm.ainvoke(messages), timeout)
+                    break
+                except Exception as e:
+                    delay = retry_delay(e, attempt, self.BACKOFF_S, self.MAX_BACKOFF_S)
+                    if delay is None or attempt == max_retries:
+                        raise
+                    self.logger.warning(f"Generation failed ({type(e).__name__}: {str(e)}), retrying in "
+                                        f"{delay:.1f}s (attempt {attempt + 1}/{max_retries})")
+                    await asyncio.sleep(delay)
+            latency = time.perf_counter() - start
+            
+            # Concurrent requests can't share a callback, so read usage off each response
+            usage = getattr(response, 'usage_metadata', None) or {}
+            token_usage = {
+                'total_tokens': usage.get('total_tokens'),
+                'prompt_tokens': usage.get('input_tokens'),
+                'completion_tokens': usage.get('output_tokens'),
+                'total_cost': None
+            }
+            content = response.content if hasattr(response, 'content') else str(response)
+            self.logger.info(f"Generated content: {len(content)} characters")
+            
+            result = {
+                'content': content,
+                'model': self.model_name,
+                'token_usage': token_usage,
+                'success': True,
+                'cached': False,
+                'latency_s': round(latency, 3)
+            }
+            if cache_key is not None:
+                self.response_cache.put(cache_key, result)
+            return result
+            
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            self.logger.log_error(e, "Error generating content")
+            return {
+                'content': f"Error generating content: {error}",
+                'model': self.model_name,
+                'token_usage': {},
+                'success': False,
+                'error': error
+            }
+    
     def generate_with_prompt_type(self,
                                   prompt_type: PromptType,
                                   context: Optional[str] = None,
@@ -242,6 +425,9 @@ class ContentGenerator:
         """
         Generate content for multiple prompts.
         
+        Runs abatch_generate() when no event loop is running (e.g. in Streamlit),
+        and one prompt at a time otherwise.
+        
         Args:
             prompts: List of prompts
             system_message: Optional system message for all prompts
@@ -249,6 +435,11 @@ class ContentGenerator:
         Returns:
             List of generation results
         """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.abatch_generate(prompts, system_message))
+        
         results = []
         for i, prompt in enumerate(prompts, 1):
             self.logger.info(f"Processing prompt {i}/{len(prompts)}")
@@ -259,6 +450,48 @@ class ContentGenerator:
             results.append(result)
         return results
     
+    async def abatch_generate(self,
+                              prompts: List[str],
+                              system_message: Optional[str] = None,
+                              max_concurrency: Optional[int] = None,
+                              timeout: Optional[float] = None,
+                              max_retries: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Generate content for multiple prompts concurrently.
+        
+        Args:
+            prompts: List of prompts
+            system_message: Optional system message for all prompts
+            max_concurrency: Requests in flight at once (default: BATCH_CONCURRENCY)
+            timeout: Seconds per request attempt (default: REQUEST_TIMEOUT_S)
+            max_retries: Retries per prompt on rate limits and transient errors (default: MAX_RETRIES)
+            
+        Returns:
+            List of generation results in the order of prompts; a failed prompt
+            gets a success=False result without affecting the others
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or self.BATCH_CONCURRENCY)
+        
+        async def generate(llm: Optional[ChatOpenAI], i: int, prompt: str) -> Dict[str, Any]:
+            async with semaphore:
+                self.logger.info(f"Processing prompt {i}/{len(prompts)}")
+                return await self._agenerate_content(
+                    llm,
+                    prompt=prompt,
+                    system_message=system_message,
+                    timeout=timeout,
+                    max_retries=max_retries
+                )
+        
+        start = time.perf_counter()
+        if self.llm:
+            async with self._async_llm() as llm:
+                results = await asyncio.gather(*(generate(llm, i, prompt) for i, prompt in enumerate(prompts, 1)))
+        else:
+            results = await asyncio.gather(*(generate(None, i, prompt) for i, prompt in enumerate(prompts, 1)))
+        failed = sum(1 for result in results if not result.get('success'))
+        self.logger.info(f"Generated {len(results) - failed}/{len(results)} prompts in {time.perf_counter() - start:.1f}s")
+        return list(results)
     
     def is_available(self) -> bool:
         """
@@ -5,16 +5,31 @@ Includes vector search functionality using OpenAI embeddings.
 Uses LangChain for document processing and text splitting.
 """
 
+import codecs
 import csv
+import hashlib
 import json
+import mmap
 import os
 import pickle
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Iterable, Sequence
+from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterator, Optional, Tuple, Union
 import pandas as pd
 import numpy as np
 
 from core.logger import get_logger
+from core.embedding_cache import EmbeddingCache, get_embedding_cache
+from core.retry import retry_delay
+from core.text_chunker import TextChunker
+from core.concept_catalog import ConceptCatalog
 
 logger = get_logger()
 
@@ -52,6 +67,50 @@ except ImportError:
     OPENAI_AVAILABLE = False
     logger.warning("OpenAI not installed. Install with: pip install openai")
 
+# Try to import tiktoken for exact token counts when batching embeddings
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+
+class MappedChunks(Sequence):
+    """
+    Read-only list of text chunks backed by a memory-mapped file and an offsets array.
+    Text is decoded only when an item is accessed, e.g. for the top-k search hits.
+    """
+    
+    def __init__(self, chunks_path: Path, offsets_path: Path):
+        """
+        Open a chunks file written by DataProcessor.save_vector_store().
+        
+        Args:
+            chunks_path: Concatenated UTF-8 chunk text
+            offsets_path: .npy array of n + 1 byte offsets into chunks_path
+        """
+        self.offsets = np.load(str(offsets_path), mmap_mode='r')
+        with open(chunks_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            # The mapping stays valid after the file is closed
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        if len(self.offsets) == 0 or int(self.offsets[-1]) != size:
+            raise ValueError(f"Chunk offsets do not match {chunks_path}")
+    
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+    
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        n = len(self)
+        i = int(i)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("chunk index out of range")
+        return self._data[int(self.offsets[i]):int(self.offsets[i + 1])].decode('utf-8')
+
 
 class DataProcessor:
     """
@@ -60,27 +119,95 @@ class DataProcessor:
     Includes vector search functionality using OpenAI embeddings and FAISS.
     """
     
-    def __init__(self):
-        """Initialize data processor."""
+    # On-disk vector store layout (see save_vector_store())
+    STORE_FORMAT = "skillbuilder-vector-store"
+    STORE_VERSION = 1
+    MANIFEST_FILE = "manifest.json"
+    INDEX_FILE = "index.faiss"
+    CHUNKS_FILE = "chunks.bin"
+    OFFSETS_FILE = "chunk_offsets.npy"
+    METADATA_FILE = "metadata.json"
+    
+    # Rows per batch yielded by iter_preprocessed_records()
+    PREPROCESS_BATCH_SIZE = 10_000
+    
+    # Streaming loaders: encodings tried (in order) on a sample, read sizes
+    ENCODINGS = ['utf-8', 'latin-1', 'cp1252']
+    ENCODING_SAMPLE_BYTES = 64 * 1024
+    READ_BLOCK_CHARS = 1024 * 1024
+    CSV_CHUNK_ROWS = 50_000
+    
+    # Embedding request limits (the API allows 2048 inputs and 300k tokens per request)
+    EMBEDDING_BATCH_SIZE = 2048
+    EMBEDDING_BATCH_TOKENS = 250_000
+    EMBEDDING_CONCURRENCY = 4
+    EMBEDDING_MAX_RETRIES = 5
+    EMBEDDING_BACKOFF_S = 1.0
+    EMBEDDING_MAX_BACKOFF_S = 30.0
+    
+    # Shared by every instance so concurrent sessions stay under the rate limit together
+    _embedding_slots = threading.BoundedSemaphore(EMBEDDING_CONCURRENCY)
+    _encodings: Dict[str, Any] = {}
+    
+    def __init__(self, embedding_cache: Optional[EmbeddingCache] = None, use_embedding_cache: bool = True):
+        """
+        Initialize data processor.
+        
+        Args:
+            embedding_cache: Embedding cache to use (default: the shared process-wide cache)
+            use_embedding_cache: Whether to cache embeddings at all
+        """
         self.logger = logger
         self.processed_data: List[Dict[str, Any]] = []
         self.vector_store = None
         self.text_chunks = []
         self.metadata = []
         self.embeddings_model = None
+        self.embedding_cache = None
+        self.concept_catalog: Optional[ConceptCatalog] = None
+        
+        if use_embedding_cache:
+            try:
+                self.embedding_cache = embedding_cache if embedding_cache is not None else get_embedding_cache()
+            except Exception as e:
+                self.logger.warning(f"Embedding cache unavailable, embeddings will not be cached: {str(e)}")
         
         # Initialize OpenAI client for embeddings if available
         if OPENAI_AVAILABLE:
             api_key = os.getenv('OPENAI_API_KEY')
             if api_key:
                 try:
-                    self.embeddings_model = OpenAI(api_key=api_key)
+                    # Retries are handled per batch in _embed_batch()
+                    self.embeddings_model = OpenAI(api_key=api_key, max_retries=0)
                     self.logger.info("OpenAI embeddings client initialized")
                 except Exception as e:
                     self.logger.warning(f"Could not initialize OpenAI client: {str(e)}")
             else:
                 self.logger.warning("OPENAI_API_KEY not found. Vector search will not be available.")
     
+    def detect_encoding(self, file_path: str) -> str:
+        """
+        Pick the first supported encoding that decodes a sample of the file.
+        
+        Args:
+            file_path: Path to file
+            
+        Returns:
+            Encoding name (utf-8-sig if the file starts with a UTF-8 BOM)
+        """
+        with open(file_path, 'rb') as f:
+            sample = f.read(self.ENCODING_SAMPLE_BYTES)
+        if sample.startswith(codecs.BOM_UTF8):
+            return 'utf-8-sig'
+        for encoding in self.ENCODINGS:
+            try:
+                # final=False: the sample may end in the middle of a character
+                codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+                return encoding
+            except UnicodeDecodeError:
+                continue
+        raise ValueError(f"Could not decode file with any supported encoding: {file_path}")
+    
     def load_csv(self, file_path: str) -> pd.DataFrame:
         """
         Load and validate CSV file.
@@ -102,16 +229,15 @@ class DataProcessor:
             
             self.logger.info(f"Loading CSV file: {file_path}")
             # Use proper CSV parsing with quote handling for fields with commas
-            # Try with error handling for malformed CSV
+            options = self._csv_options(file_path)
             try:
-                df = pd.read_csv(file_path, quotechar='"', escapechar='\\')
-            except pd.errors.ParserError:
-                # If that fails, try with Python engine (more lenient)
-                try:
-                    df = pd.read_csv(file_path, quotechar='"', on_bad_lines='skip', engine='python')
-                except Exception:
-                    # Last resort: try with basic settings and Python engine
-                    df = pd.read_csv(file_path, engine='python', sep=',', quotechar='"', doublequote=True)
+                df = pd.read_csv(file_path, **options)
+            except pd.errors.ParserError as e:
+                # Malformed lines: re-read with the Python engine, skipping and counting them
+                self.logger.warning(f"Malformed CSV ({str(e)}), skipping bad lines")
+                skip, skipped = self._bad_line_counter()
+                df = pd.read_csv(file_path, engine='python', on_bad_lines=skip, **options)
+                self.logger.warning(f"Skipped {skipped[0]} malformed lines in {file_path}")
             
             if df.empty:
                 raise ValueError(f"CSV file is empty: {file_path}")
@@ -129,6 +255,117 @@ class DataProcessor:
             self.logger.log_error(e, f"Error loading CSV file: {file_path}")
             raise
     
+    def iter_csv(self, file_path: str, chunksize: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """
+        Stream a CSV file as DataFrames of at most chunksize rows.
+        
+        Args:
+            file_path: Path to CSV file
+            chunksize: Rows per DataFrame (default: CSV_CHUNK_ROWS)
+            
+        Yields:
+            DataFrames with consecutive rows of the file
+            
+        Raises:
+            FileNotFoundError: If file doesn't exist
+            ValueError: If file is empty
+        """
+        if not Path(file_path).exists():
+            raise FileNotFoundError(f"CSV file not found: {file_path}")
+        
+        self.logger.info(f"Streaming CSV file: {file_path}")
+        chunksize = chunksize or self.CSV_CHUNK_ROWS
+        options = self._csv_options(file_path)
+        try:
+            reader = pd.read_csv(file_path, chunksize=chunksize, **options)
+        except pd.errors.EmptyDataError:
+            raise ValueError(f"CSV file is empty: {file_path}")
+        
+        rows = 0
+        try:
+            with reader:
+                for chunk in reader:
+                    rows += len(chunk)
+                    yield chunk
+            self.logger.info(f"Streamed {rows} rows from CSV")
+            return
+        except pd.errors.ParserError as e:
+            self.logger.warning(f"Malformed CSV after {rows} rows ({str(e)}), skipping bad lines")
+        
+        # Re-read with the Python engine, skipping (and counting) malformed lines;
+        # the rows already yielded parse the same way and are dropped
+        skip, skipped = self._bad_line_counter()
+        already_yielded = rows
+        with pd.read_csv(file_path, chunksize=chunksize, engine='python', on_bad_lines=skip, **options) as reader:
+            for chunk in reader:
+                if already_yielded:
+                    dropped = min(already_yielded, len(chunk))
+                    chunk = chunk.iloc[dropped:]
+                    already_yielded -= dropped
+                if len(chunk):
+                    rows += len(chunk)
+                    yield chunk
+        self.logger.warning(f"Skipped {skipped[0]} malformed lines in {file_path}")
+        self.logger.info(f"Streamed {rows} rows from CSV")
+    
+    def _csv_options(self, file_path: str) -> Dict[str, Any]:
+        """read_csv options shared by load_csv() and iter_csv()."""
+        return {
+            'encoding': self.detect_encoding(file_path),
+            'quotechar': '"',
+            'escapechar': '\\'
+        }
+    
+    @staticmethod
+    def _bad_line_counter() -> Tuple[Any, List[int]]:
+        """on_bad_lines callable for the Python engine that drops lines, and its [count]."""
+        skipped = [0]
+        
+        def skip(line: List[str]) -> None:
+            skipped[0] += 1
+            return None
+        
+        return skip, skipped
+    
+    def csv_to_text_file(self, file_path: str, text_path: str,
+                         text_columns: Optional[List[str]] = None) -> List[str]:
+        """
+        Write a CSV's text columns to a text file for chunking, streaming the CSV once.
+        
+        Each column becomes one "column: value value ..." paragraph, in column order.
+        
+        Args:
+            file_path: Path to CSV file
+            text_path: Text file to write
+            text_columns: Columns to include (default: object columns of the first rows)
+            
+        Returns:
+            The text columns written (empty if there are none)
+        """
+        with tempfile.TemporaryDirectory(dir=Path(text_path).parent) as parts_dir:
+            parts = []
+            try:
+                for chunk in self.iter_csv(file_path):
+                    if text_columns is None:
+                        text_columns = chunk.select_dtypes(include=['object']).columns.tolist()
+                    if not parts:
+                        parts = [open(Path(parts_dir) / f"{i}.txt", 'w+', encoding='utf-8')
+                                 for i in range(len(text_columns))]
+                    for part, col in zip(parts, text_columns):
+                        values = chunk[col].astype(str).str.cat(sep=' ')
+                        if values:
+                            part.write((' ' if part.tell() else '') + values)
+                
+                with open(text_path, 'w', encoding='utf-8') as out:
+                    for i, (part, col) in enumerate(zip(parts, text_columns)):
+                        out.write(("\n\n" if i else "") + f"{col}: ")
+                        part.seek(0)
+                        shutil.copyfileobj(part, out)
+            finally:
+                for part in parts:
+                    part.close()
+        return text_columns or []
+    
     def load_text_file(self, file_path: str) -> str:
         """
         Load text file content.
@@ -141,7 +378,7 @@ class DataProcessor:
             
         Raises:
             FileNotFoundError: If file doesn't exist
-            UnicodeDecodeError: If file encoding is invalid
+            ValueError: If file encoding is not supported
         """
         try:
             file_path_obj = Path(file_path)
@@ -150,23 +387,97 @@ class DataProcessor:
             
             self.logger.info(f"Loading text file: {file_path}")
             
-            # Try different encodings
-            encodings = ['utf-8', 'latin-1', 'cp1252']
-            for encoding in encodings:
-                try:
-                    with open(file_path, 'r', encoding=encoding) as f:
-                        content = f.read()
-                    self.logger.info(f"Successfully loaded text file with {len(content)} characters")
-                    return content
-                except UnicodeDecodeError:
-                    continue
-            
-            raise UnicodeDecodeError(f"Could not decode file with any supported encoding: {file_path}")
+            encoding = self.detect_encoding(file_path)
+            with open(file_path, 'r', encoding=encoding, errors='replace') as f:
+                content = f.read()
+            self._log_replacements(file_path, encoding, content.count('\ufffd'))
+            self.logger.info(f"Successfully loaded text file with {len(content)} characters ({encoding})")
+            return content
             
         except Exception as e:
             self.logger.log_error(e, f"Error loading text file: {file_path}")
             raise
     
+    def iter_text_file(self, file_path: str, block_size: Optional[int] = None) -> Iterator[str]:
+        """
+        Stream a text or markdown file in blocks, decoding it in one pass.
+        
+        Args:
+            file_path: Path to text file
+            block_size: Characters per block (default: READ_BLOCK_CHARS)
+            
+        Yields:
+            Consecutive blocks of the file's text
+        """
+        if not Path(file_path).exists():
+            raise FileNotFoundError(f"Text file not found: {file_path}")
+        
+        encoding = self.detect_encoding(file_path)
+        # Bytes past the sample that don't decode are replaced rather than failing a large upload midway
+        replacements = 0
+        with open(file_path, 'r', encoding=encoding, errors='replace') as f:
+            for block in iter(lambda: f.read(block_size or self.READ_BLOCK_CHARS), ''):
+                replacements += block.count('\ufffd')
+                yield block
+        self._log_replacements(file_path, encoding, replacements)
+    
+    def _log_replacements(self, file_path: str, encoding: str, count: int):
+        """Warn when a file read with errors='replace' contains replacement characters."""
+        if count:
+            self.logger.warning(f"{file_path}: {count} replacement characters (U+FFFD) after decoding as "
+                                f"{encoding}; bytes past the {self.ENCODING_SAMPLE_BYTES}-byte encoding "
+                                f"sample did not decode, or the file already contained them")
+    
+    def iter_text_chunks(self, file_path: str, chunk_size: int = 1000,
+                         overlap: int = 200, use_langchain: bool = False,
+                         token_model: Optional[str] = None,
+                         with_offsets: bool = False) -> Iterator[Any]:
+        """
+        Stream chunks of a text or markdown file without loading the whole file.
+        
+        Blocks are cut at the last paragraph break and chunked one at a time, so
+        only about one block of text is held in memory at a time.
+        
+        Args:
+            file_path: Path to text file
+            chunk_size: Maximum chunk size in characters (tokens with token_model)
+            overlap: Overlap between chunks in the same unit
+            use_langchain: Whether to use LangChain's text splitter
+            token_model: Embedding model whose tokenizer measures sizes (native chunker only)
+            with_offsets: Yield {'text', 'start', 'end', 'size'} dictionaries with
+                character offsets into the file instead of strings (native chunker only)
+            
+        Yields:
+            Text chunks (or chunk dictionaries) in file order
+        """
+        native = with_offsets or token_model is not None or not (use_langchain and LANGCHAIN_AVAILABLE)
+        chunker = self._chunker(chunk_size, overlap, token_model) if native else None
+        
+        def chunks(segment: str, offset: int) -> Iterator[Any]:
+            if not segment.strip():
+                return
+            if chunker is None:
+                yield from self.chunk_text(segment, chunk_size, overlap, use_langchain=True)
+            elif with_offsets:
+                yield from chunker.iter_chunks(segment, base_offset=offset)
+            else:
+                yield from chunker.split(segment)
+        
+        pending = ""
+        offset = 0  # character offset of pending in the file
+        for block in self.iter_text_file(file_path):
+            pending += block
+            cut = pending.rfind("\n\n")
+            if cut <= 0:
+                if len(pending) < 2 * self.READ_BLOCK_CHARS:
+                    continue
+                # No paragraph break for two blocks: cut at the last line or word break instead
+                cut = max(pending.rfind("\n"), pending.rfind(" "), len(pending) - self.READ_BLOCK_CHARS)
+            segment, pending = pending[:cut], pending[cut:]
+            yield from chunks(segment, offset)
+            offset += cut
+        yield from chunks(pending, offset)
+    
     def load_markdown_file(self, file_path: str) -> str:
         """
         Load markdown file content using LangChain.
@@ -200,8 +511,7 @@ class DataProcessor:
                 except Exception as e:
                     # Fallback to simple text reading
                     self.logger.warning(f"LangChain markdown loader failed, using fallback: {str(e)}")
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
+                    content = "".join(self.iter_text_file(file_path))
                     self.logger.info(f"Successfully loaded markdown file with {len(content)} characters (fallback)")
                     return content
             else:
@@ -210,8 +520,7 @@ class DataProcessor:
                     self.logger.warning("LangChain not available, using simple text reading for markdown")
                 else:
                     self.logger.info("Using simple text reading for markdown (UnstructuredMarkdownLoader not available)")
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                content = "".join(self.iter_text_file(file_path))
                 self.logger.info(f"Successfully loaded markdown file with {len(content)} characters")
                 return content
                 
@@ -235,28 +544,9 @@ class DataProcessor:
         """
         try:
             self.logger.info(f"Preprocessing DataFrame with {len(df)} rows")
+            df, text_columns = self._prepare_dataframe(df, text_columns, remove_na)
             
-            # Remove NA if requested
-            if remove_na:
-                initial_len = len(df)
-                df = df.dropna()
-                removed = initial_len - len(df)
-                if removed > 0:
-                    self.logger.info(f"Removed {removed} rows with NA values")
-            
-            # Identify text columns
-            if text_columns is None:
-                text_columns = df.select_dtypes(include=['object']).columns.tolist()
-            
-            # Convert to list of dictionaries
-            processed = []
-            for idx, row in df.iterrows():
-                record = {
-                    'id': idx,
-                    'text_content': self._extract_text_content(row, text_columns),
-                    'metadata': {col: str(row[col]) for col in df.columns if col not in text_columns}
-                }
-                processed.append(record)
+            processed = self._build_records(df, text_columns)
             
             self.processed_data = processed
             self.logger.info(f"Successfully preprocessed {len(processed)} records")
@@ -266,42 +556,118 @@ class DataProcessor:
             self.logger.log_error(e, "Error preprocessing DataFrame")
             raise
     
-    def _extract_text_content(self, row: pd.Series, text_columns: List[str]) -> str:
+    def iter_preprocessed_records(self, df: pd.DataFrame,
+                                  text_columns: Optional[List[str]] = None,
+                                  remove_na: bool = True,
+                                  batch_size: Optional[int] = None) -> Iterator[List[Dict[str, Any]]]:
         """
-        Extract and combine text content from specified columns.
+        Preprocess DataFrame in batches, so large CSVs never exist as one list of dicts.
         
         Args:
-            row: DataFrame row
-            text_columns: Columns to extract text from
+            df: Input DataFrame
+            text_columns: Columns to extract as text (default: all string columns of df)
+            remove_na: Whether to remove rows with NA values
+            batch_size: Rows per batch (default: PREPROCESS_BATCH_SIZE)
+            
+        Yields:
+            Lists of records in the same format as preprocess_dataframe()
+        """
+        batch_size = batch_size or self.PREPROCESS_BATCH_SIZE
+        self.logger.info(f"Preprocessing DataFrame with {len(df)} rows in batches of {batch_size}")
+        df, text_columns = self._prepare_dataframe(df, text_columns, remove_na)
+        
+        for start in range(0, len(df), batch_size):
+            yield self._build_records(df.iloc[start:start + batch_size], text_columns)
+    
+    def _prepare_dataframe(self, df: pd.DataFrame, text_columns: Optional[List[str]],
+                           remove_na: bool) -> Tuple[pd.DataFrame, List[str]]:
+        """Drop NA rows if requested and resolve the text columns."""
+        # Remove NA if requested
+        if remove_na:
+            initial_len = len(df)
+            df = df.dropna()
+            removed = initial_len - len(df)
+            if removed > 0:
+                self.logger.info(f"Removed {removed} rows with NA values")
+        
+        # Identify text columns
+        if text_columns is None:
+            text_columns = df.select_dtypes(include=['object']).columns.tolist()
+        return df, text_columns
+    
+    def _build_records(self, df: pd.DataFrame, text_columns: List[str]) -> List[Dict[str, Any]]:
+        """
+        Build records column-wise instead of row by row.
+        
+        Args:
+            df: DataFrame (or batch of rows)
+            text_columns: Columns to combine into text_content
+            
+        Returns:
+            List of {'id', 'text_content', 'metadata'} dictionaries
+        """
+        texts = self._extract_text_column(df, text_columns)
+        positions = [i for i, col in enumerate(df.columns) if col not in text_columns]
+        metadata_columns = df.columns[positions].tolist()
+        # str() of the row-interleaved values, as iterrows() gave: missing values become
+        # 'nan'/'None' strings (astype(str) keeps NaN on newer pandas), timestamps keep their time
+        values = np.frompyfunc(str, 1, 1)(df.to_numpy()[:, positions]).tolist()
+        metadata = [dict(zip(metadata_columns, row)) for row in values]
+        
+        return [
+            {'id': idx, 'text_content': text, 'metadata': meta}
+            for idx, text, meta in zip(df.index.tolist(), texts.tolist(), metadata)
+        ]
+    
+    def _extract_text_column(self, df: pd.DataFrame, text_columns: List[str]) -> pd.Series:
+        """
+        Space-join the non-NA values of text_columns for every row at once.
+        
+        Args:
+            df: DataFrame
+            text_columns: Columns to extract text from (missing columns are skipped)
             
         Returns:
-            Combined text content
+            Series of combined text content, aligned with df
         """
-        text_parts = []
+        text = pd.Series("", index=df.index, dtype=object)
+        started = np.zeros(len(df), dtype=bool)
         for col in text_columns:
-            if col in row and pd.notna(row[col]):
-                text_parts.append(str(row[col]))
-        return " ".join(text_parts)
+            if col not in df.columns:
+                continue
+            present = df[col].notna().to_numpy()
+            separator = np.where(started, " ", "")
+            text = text.where(~present, text + separator + df[col].astype(str))
+            started |= present
+        return text
     
     def chunk_text(self, text: str, chunk_size: int = 1000, 
-                   overlap: int = 200, use_langchain: bool = True) -> List[str]:
+                   overlap: int = 200, use_langchain: bool = False,
+                   token_model: Optional[str] = None) -> List[str]:
         """
-        Split text into chunks for processing using LangChain's RecursiveCharacterTextSplitter.
+        Split text into chunks at paragraph, line and word boundaries.
+        
+        Uses the single-pass TextChunker, or LangChain's RecursiveCharacterTextSplitter
+        when use_langchain is set and LangChain is installed.
         
         Args:
             text: Input text
-            chunk_size: Maximum chunk size in characters
-            overlap: Overlap between chunks in characters
-            use_langchain: Whether to use LangChain's text splitter (default: True)
+            chunk_size: Maximum chunk size in characters (tokens with token_model)
+            overlap: Overlap between chunks in the same unit
+            use_langchain: Whether to use LangChain's text splitter (default: False)
+            token_model: Embedding model whose tokenizer measures sizes (native chunker only)
             
         Returns:
             List of text chunks
+            
+        Raises:
+            ValueError: If overlap is not smaller than chunk_size
         """
         try:
             if len(text) <= chunk_size:
                 return [text]
             
-            if use_langchain and LANGCHAIN_AVAILABLE:
+            if use_langchain and LANGCHAIN_AVAILABLE and token_model is None:
                 # Use LangChain's RecursiveCharacterTextSplitter for better chunking
                 text_splitter = RecursiveCharacterTextSplitter(
                     chunk_size=chunk_size,
@@ -319,25 +685,23 @@ class DataProcessor:
                 self.logger.info(f"Split text into {len(chunks)} chunks using LangChain RecursiveCharacterTextSplitter")
                 return chunks
             else:
-                # Fallback to simple chunking if LangChain not available
-                if use_langchain:
-                    self.logger.warning("LangChain not available, using simple chunking")
-                
-                chunks = []
-                start = 0
-                while start < len(text):
-                    end = start + chunk_size
-                    chunk = text[start:end]
-                    chunks.append(chunk.strip())
-                    start = end - overlap  # Overlap for context preservation
+                if use_langchain and not LANGCHAIN_AVAILABLE:
+                    self.logger.warning("LangChain not available, using native chunking")
                 
-                self.logger.info(f"Split text into {len(chunks)} chunks using simple chunking")
+                chunks = self._chunker(chunk_size, overlap, token_model).split(text)
+                self.logger.info(f"Split text into {len(chunks)} chunks using native chunking")
                 return chunks
             
         except Exception as e:
             self.logger.log_error(e, "Error chunking text")
             raise
     
+    def _chunker(self, chunk_size: int, overlap: int, token_model: Optional[str]) -> TextChunker:
+        """TextChunker sized in characters, or in tokens of token_model."""
+        if token_model is not None:
+            return TextChunker.for_model(token_model, chunk_size, overlap)
+        return TextChunker(chunk_size, overlap)
+    
     def validate_data(self, data: Any) -> bool:
         """
         Validate data before processing.
@@ -371,7 +735,7 @@ class DataProcessor:
     
     def load_ist_concepts(self, file_path: str = "data/ist_concepts.csv") -> pd.DataFrame:
         """
-        Load IST concepts knowledge base.
+        Load IST concepts knowledge base and build its ConceptCatalog.
         
         Args:
             file_path: Path to IST concepts CSV file
@@ -380,11 +744,27 @@ class DataProcessor:
             DataFrame with IST concepts
         """
         try:
-            return self.load_csv(file_path)
+            df = self.load_csv(file_path)
+            self.concept_catalog = ConceptCatalog(df)
+            return df
         except Exception as e:
             self.logger.log_error(e, f"Error loading IST concepts from {file_path}")
             raise
     
+    def get_catalog(self, df: pd.DataFrame) -> ConceptCatalog:
+        """
+        ConceptCatalog for df, reusing the one built at load for the same DataFrame.
+        
+        Args:
+            df: IST concepts DataFrame
+            
+        Returns:
+            Catalog indexing df
+        """
+        if self.concept_catalog is None or self.concept_catalog.df is not df:
+            self.concept_catalog = ConceptCatalog(df)
+        return self.concept_catalog
+    
     def get_concepts_by_week(self, df: pd.DataFrame, week: str) -> pd.DataFrame:
         """
         Filter concepts by week.
@@ -396,7 +776,7 @@ class DataProcessor:
         Returns:
             Filtered DataFrame
         """
-        return df[df['week'].str.upper() == week.upper()]
+        return self.get_catalog(df).by_week(week)
     
     def get_concept_info(self, df: pd.DataFrame, concept_name: str) -> Optional[Dict[str, Any]]:
         """
@@ -409,34 +789,228 @@ class DataProcessor:
         Returns:
             Dictionary with concept information or None
         """
-        concept = df[df['concept_name'].str.lower() == concept_name.lower()]
-        if not concept.empty:
-            return concept.iloc[0].to_dict()
-        return None
+        return self.get_catalog(df).get(concept_name)
+    
+    def build_concept_chunks(self, df: pd.DataFrame) -> Tuple[List[str], List[Dict[str, Any]]]:
+        """
+        Build searchable text chunks and metadata from the IST concepts DataFrame.
+        
+        Args:
+            df: IST concepts DataFrame
+            
+        Returns:
+            Tuple of (chunks, metadata), one entry per concept
+        """
+        concept_chunks = []
+        concept_metadata = []
+        
+        for idx, row in df.iterrows():
+            # Combine concept information into searchable text
+            concept_text = f"""
+            Concept: {row.get('concept_name', '')}
+            Week: {row.get('week', '')}
+            Description: {row.get('description', '')}
+            Learning Objectives: {row.get('learning_objectives', '')}
+            Prerequisites: {row.get('prerequisites', 'None')}
+            Difficulty: {row.get('difficulty', '')}
+            Keywords: {row.get('keywords', '')}
+            """.strip()
+            
+            concept_chunks.append(concept_text)
+            concept_metadata.append({
+                'concept_name': row.get('concept_name', ''),
+                'week': row.get('week', ''),
+                'difficulty': row.get('difficulty', ''),
+                'chunk_id': idx
+            })
+        
+        return concept_chunks, concept_metadata
+    
+    @staticmethod
+    def content_key(file_path: str, model: str = "text-embedding-3-small") -> str:
+        """
+        Cache key for a vector store built from a file: hash of its bytes plus the embedding model.
+        
+        Args:
+            file_path: Source file the chunks were built from
+            model: OpenAI embedding model
+            
+        Returns:
+            16-character hex key
+        """
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        digest.update(model.encode('utf-8'))
+        return digest.hexdigest()[:16]
+    
+    def load_or_build_vector_store(self, chunks: List[str], metadata: Optional[List[Dict]],
+                                   cache_dir: str, key: str,
+                                   model: str = "text-embedding-3-small") -> bool:
+        """
+        Load a persisted vector store for key, building and persisting it only if missing.
+        
+        The index is memory-mapped, so every process and session reading the same
+        key shares the pages instead of re-embedding the chunks.
+        
+        Args:
+            chunks: Text chunks to embed if the store must be built
+            metadata: Optional metadata for each chunk
+            cache_dir: Directory holding persisted stores
+            key: Content key (see content_key())
+            model: OpenAI embedding model to use
+            
+        Returns:
+            True if an existing store was loaded, False if it was built
+        """
+        store_dir = Path(cache_dir) / key
+        if store_dir.exists():
+            try:
+                self._read_index_dir(store_dir)
+                self.logger.info(f"Loaded cached vector store {key} ({self.vector_store.ntotal} vectors)")
+                return True
+            except Exception as e:
+                self.logger.warning(f"Cached vector store {key} unreadable, rebuilding: {str(e)}")
+                shutil.rmtree(store_dir, ignore_errors=True)
+        
+        self.build_vector_store(chunks, metadata, model)
+        self._write_index_dir(store_dir)
+        # Re-open from disk so this process maps the same pages as later sessions
+        self._read_index_dir(store_dir)
+        return False
+    
+    def _write_index_dir(self, store_dir: Path, replace: bool = False):
+        """
+        Write the store to store_dir atomically (build in a temp dir, then rename).
+        
+        Args:
+            store_dir: Target directory
+            replace: Replace an existing store; otherwise an existing one is kept
+        """
+        store_dir.parent.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(dir=store_dir.parent, prefix=f".{store_dir.name}-"))
+        try:
+            faiss.write_index(self.vector_store, str(tmp_dir / self.INDEX_FILE))
+            
+            offsets = [0]
+            with open(tmp_dir / self.CHUNKS_FILE, 'wb') as f:
+                for chunk in self.text_chunks:
+                    data = chunk.encode('utf-8')
+                    f.write(data)
+                    offsets.append(offsets[-1] + len(data))
+            np.save(str(tmp_dir / self.OFFSETS_FILE), np.asarray(offsets, dtype=np.int64))
+            
+            with open(tmp_dir / self.METADATA_FILE, 'w', encoding='utf-8') as f:
+                json.dump(list(self.metadata), f, default=str)
+            
+            manifest = {
+                'format': self.STORE_FORMAT,
+                'version': self.STORE_VERSION,
+                'count': int(self.vector_store.ntotal),
+                'dimension': int(self.vector_store.d),
+                'index_file': self.INDEX_FILE,
+                'chunks_file': self.CHUNKS_FILE,
+                'offsets_file': self.OFFSETS_FILE,
+                'metadata_file': self.METADATA_FILE,
+                'created_at': datetime.now().isoformat()
+            }
+            with open(tmp_dir / self.MANIFEST_FILE, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=2)
+            
+            if replace and store_dir.exists():
+                old_dir = tmp_dir.with_name(f"{tmp_dir.name}-old")
+                os.rename(store_dir, old_dir)
+                os.rename(tmp_dir, store_dir)
+                shutil.rmtree(old_dir, ignore_errors=True)
+            else:
+                try:
+                    os.rename(tmp_dir, store_dir)
+                except OSError:
+                    # Another process persisted the same key first; its copy is identical
+                    shutil.rmtree(tmp_dir, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        self.logger.info(f"Vector store persisted to {store_dir}")
+    
+    def _read_index_dir(self, store_dir: Path, mmap: bool = True):
+        """
+        Load a store written by _write_index_dir(). The index is memory-mapped by
+        default and chunk text is only read when a chunk is accessed. A mapped
+        index is read-only: build a new store rather than adding vectors to it.
+        
+        Args:
+            store_dir: Store directory
+            mmap: Memory-map the index instead of reading it into RAM
+            
+        Raises:
+            ValueError: If the manifest is missing, unsupported, or the files disagree
+        """
+        manifest_path = store_dir / self.MANIFEST_FILE
+        if not manifest_path.exists():
+            raise ValueError(f"Not a vector store directory (no {self.MANIFEST_FILE}): {store_dir}")
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('format') != self.STORE_FORMAT or manifest.get('version', 0) > self.STORE_VERSION:
+            raise ValueError(f"Unsupported vector store format {manifest.get('format')} "
+                             f"v{manifest.get('version')} in {store_dir}")
+        
+        # IO_FLAG_MMAP still copies a flat index's vectors into RAM; IO_FLAG_MMAP_IFC
+        # (faiss >= 1.11) serves them from the mapped file, shared by every process
+        flags = faiss.IO_FLAG_MMAP_IFC if mmap else 0
+        index = faiss.read_index(str(store_dir / self.INDEX_FILE), flags)
+        chunks = MappedChunks(store_dir / self.CHUNKS_FILE, store_dir / self.OFFSETS_FILE)
+        with open(store_dir / self.METADATA_FILE, 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+        if index.ntotal != len(chunks):
+            raise ValueError(f"Vector store {store_dir} has {index.ntotal} vectors but {len(chunks)} chunks")
+        
+        self.vector_store = index
+        self.text_chunks = chunks
+        self.metadata = metadata
     
     def create_embeddings(self, texts: List[str], model: str = "text-embedding-3-small") -> List[List[float]]:
         """
         Create embeddings for a list of texts using OpenAI.
         
+        Vectors already in the embedding cache are returned without an API call;
+        only the distinct uncached texts are sent to OpenAI, then cached. Large
+        inputs are split into batches that run concurrently (see _embed_batched()).
+        Every vector is rounded to the cache's float16 precision, cached or not.
+        
         Args:
             texts: List of text strings to embed
             model: OpenAI embedding model to use (default: text-embedding-3-small)
             
         Returns:
-            List of embedding vectors
+            List of embedding vectors, in the order of texts
         """
-        if not self.embeddings_model:
-            raise ValueError("OpenAI client not initialized. Please set OPENAI_API_KEY.")
-        
         try:
-            self.logger.info(f"Creating embeddings for {len(texts)} texts using {model}")
-            # OpenAI embeddings API
-            response = self.embeddings_model.embeddings.create(
-                model=model,
-                input=texts
-            )
-            
-            embeddings = [item.embedding for item in response.data]
+            hashes = [EmbeddingCache.text_hash(text) for text in texts]
+            cached = self.embedding_cache.get_many(model, hashes) if self.embedding_cache is not None else {}
+        
+            # Embed each distinct missing text once
+            missing: Dict[str, str] = {}
+            for text, text_hash in zip(texts, hashes):
+                if text_hash not in cached and text_hash not in missing:
+                    missing[text_hash] = text
+            
+            if missing:
+                if not self.embeddings_model:
+                    raise ValueError("OpenAI client not initialized. Please set OPENAI_API_KEY.")
+                
+                self.logger.info(f"Creating embeddings for {len(missing)} texts using {model} "
+                                 f"({len(texts) - len(missing)} served from cache)")
+                created = {
+                    text_hash: EmbeddingCache.quantize(vector)
+                    for text_hash, vector in zip(missing.keys(), self._embed_batched(list(missing.values()), model))
+                }
+                if self.embedding_cache is not None:
+                    self.embedding_cache.put_many(model, created.items())
+                cached.update(created)
+            
+            embeddings = [list(map(float, cached[text_hash])) for text_hash in hashes]
             self.logger.info(f"Created {len(embeddings)} embeddings of dimension {len(embeddings[0]) if embeddings else 0}")
             return embeddings
             
@@ -444,13 +1018,99 @@ class DataProcessor:
             self.logger.log_error(e, "Error creating embeddings")
             raise
     
-    def build_vector_store(self, chunks: List[str], metadata: Optional[List[Dict]] = None, model: str = "text-embedding-3-small"):
+    def _count_tokens(self, text: str, model: str) -> int:
+        """Token count of text for model (a conservative estimate without tiktoken)."""
+        if not TIKTOKEN_AVAILABLE:
+            return len(text) // 3 + 1
+        encoding = self._encodings.get(model)
+        if encoding is None:
+            try:
+                encoding = tiktoken.encoding_for_model(model)
+            except KeyError:
+                encoding = tiktoken.get_encoding("cl100k_base")
+            self._encodings[model] = encoding
+        return len(encoding.encode(text, disallowed_special=()))
+    
+    def _plan_batches(self, texts: List[str], model: str) -> List[Tuple[int, int]]:
+        """
+        Split texts into consecutive (start, end) batches within the item and token limits.
+        
+        Args:
+            texts: Texts to embed
+            model: OpenAI embedding model
+            
+        Returns:
+            List of (start, end) index ranges covering texts in order
+        """
+        batches = []
+        start = 0
+        tokens = 0
+        for i, text in enumerate(texts):
+            count = self._count_tokens(text, model)
+            if i > start and (i - start >= self.EMBEDDING_BATCH_SIZE or tokens + count > self.EMBEDDING_BATCH_TOKENS):
+                batches.append((start, i))
+                start = i
+                tokens = 0
+            tokens += count
+        if start < len(texts):
+            batches.append((start, len(texts)))
+        return batches
+    
+    def _embed_batch(self, texts: List[str], model: str) -> List[List[float]]:
+        """
+        Embed one batch, retrying with exponential backoff on 429, 5xx and connection errors.
+        
+        Args:
+            texts: Texts within the per-request limits
+            model: OpenAI embedding model
+            
+        Returns:
+            Embedding vectors in the order of texts
+        """
+        for attempt in range(self.EMBEDDING_MAX_RETRIES + 1):
+            try:
+                with self._embedding_slots:
+                    response = self.embeddings_model.embeddings.create(model=model, input=texts)
+                # The API returns items with an index; don't rely on their order
+                return [item.embedding for item in sorted(response.data, key=lambda item: getattr(item, 'index', 0))]
+            except Exception as e:
+                delay = retry_delay(e, attempt, self.EMBEDDING_BACKOFF_S, self.EMBEDDING_MAX_BACKOFF_S)
+                if delay is None or attempt == self.EMBEDDING_MAX_RETRIES:
+                    raise
+                self.logger.warning(f"Embedding request failed ({str(e)}), retrying in {delay:.1f}s "
+                                    f"(attempt {attempt + 1}/{self.EMBEDDING_MAX_RETRIES})")
+                time.sleep(delay)
+    
+    def _embed_batched(self, texts: List[str], model: str) -> List[List[float]]:
+        """
+        Embed texts in batches within the request limits, running up to
+        EMBEDDING_CONCURRENCY requests at once.
+        
+        Args:
+            texts: Texts to embed
+            model: OpenAI embedding model
+            
+        Returns:
+            Embedding vectors in the order of texts
+        """
+        batches = self._plan_batches(texts, model)
+        if len(batches) == 1:
+            return self._embed_batch(texts, model)
+        
+        self.logger.info(f"Embedding {len(texts)} texts in {len(batches)} batches")
+        with ThreadPoolExecutor(max_workers=min(len(batches), self.EMBEDDING_CONCURRENCY)) as executor:
+            results = executor.map(lambda batch: self._embed_batch(texts[batch[0]:batch[1]], model), batches)
+            return [vector for result in results for vector in result]
+    
+    def build_vector_store(self, chunks: Iterable[str], metadata: Optional[Union[List[Dict], Dict]] = None, model: str = "text-embedding-3-small"):
         """
         Build a vector store from text chunks using OpenAI embeddings and FAISS.
         
         Args:
-            chunks: List of text chunks to embed and store
-            metadata: Optional metadata for each chunk
+            chunks: Text chunks to embed and store; a generator (e.g. iter_text_chunks())
+                is consumed and embedded in batches as it is read
+            metadata: Optional metadata for each chunk, or a dict of fields shared by
+                every chunk (useful when chunks is a generator of unknown length)
             model: OpenAI embedding model to use
         """
         if not FAISS_AVAILABLE:
@@ -460,25 +1120,34 @@ class DataProcessor:
             raise ValueError("OpenAI client not initialized. Please set OPENAI_API_KEY.")
         
         try:
-            self.logger.info(f"Building vector store from {len(chunks)} chunks")
-            
-            # Create embeddings
-            embeddings = self.create_embeddings(chunks, model)
+            self.logger.info("Building vector store from chunks")
             
-            # Convert to numpy array
-            embeddings_array = np.array(embeddings).astype('float32')
-            dimension = embeddings_array.shape[1]
+            # Embed enough chunks at a time to keep every concurrent request slot busy
+            group_size = self.EMBEDDING_BATCH_SIZE * self.EMBEDDING_CONCURRENCY
+            chunks = iter(chunks)
+            chunk_list = []
+            index = None
+            for group in iter(lambda: list(islice(chunks, group_size)), []):
+                embeddings_array = np.array(self.create_embeddings(group, model)).astype('float32')
+                
+                # Create FAISS index (L2 distance) once the dimension is known
+                if index is None:
+                    index = faiss.IndexFlatL2(embeddings_array.shape[1])
+                index.add(embeddings_array)
+                chunk_list.extend(group)
             
-            # Create FAISS index (L2 distance)
-            index = faiss.IndexFlatL2(dimension)
-            index.add(embeddings_array)
+            if index is None:
+                raise ValueError("No chunks to build a vector store from.")
             
             # Store index, chunks, and metadata
             self.vector_store = index
-            self.text_chunks = chunks
-            self.metadata = metadata if metadata else [{"chunk_id": i} for i in range(len(chunks))]
+            self.text_chunks = chunk_list
+            if isinstance(metadata, dict):
+                self.metadata = [{"chunk_id": i, **metadata} for i in range(len(chunk_list))]
+            else:
+                self.metadata = metadata if metadata else [{"chunk_id": i} for i in range(len(chunk_list))]
             
-            self.logger.info(f"Vector store created with {index.ntotal} vectors of dimension {dimension}")
+            self.logger.info(f"Vector store created with {index.ntotal} vectors of dimension {index.d}")
             
         except Exception as e:
             self.logger.log_error(e, "Error building vector store")
@@ -529,38 +1198,56 @@ class DataProcessor:
             self.logger.log_error(e, "Error searching vector store")
             raise
     
-    def save_vector_store(self, file_path: str):
-        """Save vector store to disk."""
+    def save_vector_store(self, path: str):
+        """
+        Save vector store to a directory.
+        
+        The directory holds the FAISS index (index.faiss), chunk text concatenated
+        in chunks.bin with byte offsets in chunk_offsets.npy, metadata.json, and a
+        versioned manifest.json. An existing store at path is replaced atomically.
+        
+        Args:
+            path: Directory to write
+        """
         if not self.vector_store:
             raise ValueError("No vector store to save.")
         
         try:
-            save_data = {
-                'vector_store': self.vector_store,
-                'text_chunks': self.text_chunks,
-                'metadata': self.metadata
-            }
-            
-            with open(file_path, 'wb') as f:
-                pickle.dump(save_data, f)
-            
-            self.logger.info(f"Vector store saved to {file_path}")
+            self._write_index_dir(Path(path), replace=True)
+            self.logger.info(f"Vector store saved to {path}")
             
         except Exception as e:
             self.logger.log_error(e, "Error saving vector store")
             raise
     
-    def load_vector_store(self, file_path: str):
-        """Load vector store from disk."""
-        try:
-            with open(file_path, 'rb') as f:
-                save_data = pickle.load(f)
+    def load_vector_store(self, path: str, mmap: bool = True, allow_pickle: bool = False):
+        """
+        Load vector store from a directory written by save_vector_store().
+        
+        Args:
+            path: Store directory (or a legacy .pkl file, see allow_pickle)
+            mmap: Memory-map the index instead of reading it into RAM
+            allow_pickle: Load a legacy pickled store. Unpickling can run arbitrary
+                code, so only enable this for files you created yourself
             
-            self.vector_store = save_data['vector_store']
-            self.text_chunks = save_data['text_chunks']
-            self.metadata = save_data.get('metadata', [])
+        Raises:
+            ValueError: If path is a pickle and allow_pickle is False, or not a valid store
+        """
+        try:
+            if Path(path).is_file():
+                if not allow_pickle:
+                    raise ValueError(f"{path} is a legacy pickled vector store; pass allow_pickle=True "
+                                     "only if you trust it, then save_vector_store() to convert it")
+                with open(path, 'rb') as f:
+                    save_data = pickle.load(f)
+                
+                self.vector_store = save_data['vector_store']
+                self.text_chunks = save_data['text_chunks']
+                self.metadata = save_data.get('metadata', [])
+            else:
+                self._read_index_dir(Path(path), mmap=mmap)
             
-            self.logger.info(f"Vector store loaded from {file_path}")
+            self.logger.info(f"Vector store loaded from {path}")
             
         except Exception as e:
             self.logger.log_error(e, "Error loading vector store")
@@ -0,0 +1,143 @@
+"""
+Embedding Cache Module
+Content-addressed local cache of embedding vectors, keyed by (model, sha256(text)).
+Vectors are stored as float16 blobs in SQLite, so repeated texts cost no API calls.
+"""
+
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+from core.logger import get_logger
+
+logger = get_logger()
+
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent / "data" / "embedding_cache.sqlite"
+
+
+class EmbeddingCache:
+    """
+    SQLite-backed embedding cache shared by every DataProcessor in the process.
+    Safe to use from Streamlit's session threads (one connection behind a lock).
+    """
+    
+    # SQLite limits the number of bound parameters per statement
+    LOOKUP_BATCH = 500
+    
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Initialize the cache, creating the database if needed.
+        
+        Args:
+            db_path: SQLite file path (default: data/embedding_cache.sqlite)
+        """
+        self.logger = logger
+        self.db_path = Path(db_path) if db_path else DEFAULT_CACHE_PATH
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS embeddings (
+                   model TEXT NOT NULL,
+                   text_hash TEXT NOT NULL,
+                   dim INTEGER NOT NULL,
+                   vector BLOB NOT NULL,
+                   PRIMARY KEY (model, text_hash)
+               ) WITHOUT ROWID"""
+        )
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def text_hash(text: str) -> str:
+        """SHA-256 hex digest of the text (UTF-8)."""
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def quantize(vector: List[float]) -> np.ndarray:
+        """
+        A vector as it comes back from the cache (float16-rounded float32).
+        Fresh vectors go through this too, so results don't depend on cache state.
+        """
+        return np.asarray(vector, dtype=np.float16).astype(np.float32)
+    
+    def get_many(self, model: str, hashes: Iterable[str]) -> Dict[str, np.ndarray]:
+        """
+        Look up cached vectors.
+        
+        Args:
+            model: Embedding model name
+            hashes: Text hashes to look up
+        
+        Returns:
+            Dictionary of text hash -> float32 vector for the hashes found
+        """
+        hashes = list(dict.fromkeys(hashes))
+        found: Dict[str, np.ndarray] = {}
+        with self._lock:
+            for start in range(0, len(hashes), self.LOOKUP_BATCH):
+                batch = hashes[start:start + self.LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN ({placeholders})",
+                    [model, *batch]
+                ).fetchall()
+                for text_hash, blob in rows:
+                    found[text_hash] = np.frombuffer(blob, dtype=np.float16).astype(np.float32)
+        self.hits += len(found)
+        self.misses += len(hashes) - len(found)
+        return found
+    
+    def put_many(self, model: str, items: Iterable[Tuple[str, List[float]]]):
+        """
+        Store vectors as float16.
+        
+        Args:
+            model: Embedding model name
+            items: (text hash, vector) pairs
+        """
+        rows = []
+        for text_hash, vector in items:
+            array = np.asarray(vector, dtype=np.float16)
+            rows.append((model, text_hash, int(array.shape[0]), array.tobytes()))
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?)", rows)
+            self._conn.commit()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+    
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+_shared_cache: Optional[EmbeddingCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_embedding_cache(db_path: Optional[str] = None) -> EmbeddingCache:
+    """
+    Get the process-wide embedding cache instance (created on first use).
+    
+    Args:
+        db_path: SQLite file path, only used when the cache is first created
+    
+    Returns:
+        Shared EmbeddingCache
+    """
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = EmbeddingCache(db_path)
+        return _shared_cache
@@ -0,0 +1,217 @@
+"""
+Response Cache Module
+Caches ContentGenerator results keyed by (model, temperature, max tokens,
+system message, prompt hash, endpoint). An in-memory LRU sits in front of an optional
+SQLite tier; entries expire after a TTL and are then deleted from both tiers.
+Tracks hit rates and the latency and tokens that cache hits saved.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from core.logger import get_logger
+
+logger = get_logger()
+
+
+class ResponseCache:
+    """
+    Two-tier (memory LRU + optional SQLite) cache of generation results.
+    One instance is shared by every session, so a response generated for one
+    student serves the same request from another.
+    """
+    
+    MAX_ENTRIES = 256
+    TTL_SECONDS = 24 * 60 * 60
+    
+    def __init__(self, max_entries: int = MAX_ENTRIES, ttl_seconds: float = TTL_SECONDS,
+                 db_path: Optional[str] = None):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_entries: Entries kept in memory (least recently used are evicted)
+            ttl_seconds: Age after which an entry is no longer served
+            db_path: Optional SQLite file for a persistent second tier
+        """
+        self.logger = logger
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._memory: 'OrderedDict[str, Tuple[float, Dict[str, Any]]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        
+        if db_path:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS responses (
+                       key TEXT PRIMARY KEY,
+                       created REAL NOT NULL,
+                       result TEXT NOT NULL
+                   )"""
+            )
+            # Rows expired since the last run would never be read again
+            self._conn.execute("DELETE FROM responses WHERE created < ?", (time.time() - self.ttl_seconds,))
+            self._conn.commit()
+        
+        self.stats = {
+            'hits': 0,
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'bypassed': 0,
+            'latency_saved_s': 0.0,
+            'tokens_saved': 0
+        }
+    
+    @staticmethod
+    def make_key(model: str, temperature: float, max_tokens: int,
+                 system_message: Optional[str], prompt: str,
+                 base_url: Optional[str] = None) -> str:
+        """
+        Cache key for a generation request.
+        
+        Args:
+            model: Model name
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens in response
+            system_message: System message (None and "" are distinct)
+            prompt: User prompt
+            base_url: OpenAI-compatible endpoint, if not the OpenAI API, so responses
+                from a stub or proxy are never served to calls to another endpoint
+        
+        Returns:
+            SHA-256 hex digest
+        """
+        fields = [model, float(temperature), max_tokens, system_message, prompt]
+        if base_url:
+            fields.append(base_url)
+        payload = json.dumps(fields)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a fresh result, counting the hit or miss.
+        
+        Args:
+            key: Key from make_key()
+        
+        Returns:
+            Copy of the cached result or None
+        """
+        now = time.time()
+        with self._lock:
+            tier = 'memory_hits'
+            item = self._memory.get(key)
+            if item is not None:
+                self._memory.move_to_end(key)
+            elif self._conn is not None:
+                row = self._conn.execute("SELECT created, result FROM responses WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    item = (row[0], json.loads(row[1]))
+                    self._remember(key, item)
+                    tier = 'disk_hits'
+            
+            if item is not None and now - item[0] > self.ttl_seconds:
+                self._memory.pop(key, None)
+                if self._conn is not None:
+                    try:
+                        self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                        self._conn.commit()
+                    except sqlite3.Error as e:
+                        self.logger.warning(f"Could not delete expired cached response: {str(e)}")
+                item = None
+            if item is None:
+                self.stats['misses'] += 1
+                return None
+            
+            created, result = item
+            self.stats['hits'] += 1
+            self.stats[tier] += 1
+            self.stats['latency_saved_s'] += result.get('latency_s') or 0.0
+            self.stats['tokens_saved'] += (result.get('token_usage') or {}).get('total_tokens') or 0
+        
+        cached = dict(result)
+        cached['cached'] = True
+        cached['cache_age_s'] = round(now - created, 1)
+        return cached
+    
+    def put(self, key: str, result: Dict[str, Any]):
+        """
+        Store a result (it must be JSON-serializable for the SQLite tier).
+        
+        Args:
+            key: Key from make_key()
+            result: Generation result
+        """
+        item = (time.time(), dict(result))
+        with self._lock:
+            self._remember(key, item)
+            if self._conn is not None:
+                try:
+                    self._conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?)",
+                                       (key, item[0], json.dumps(item[1], default=str)))
+                    self._conn.commit()
+                except sqlite3.Error as e:
+                    self.logger.warning(f"Could not persist cached response: {str(e)}")
+    
+    def record_bypass(self):
+        """Count a request that was not eligible for caching."""
+        with self._lock:
+            self.stats['bypassed'] += 1
+    
+    def _remember(self, key: str, item: Tuple[float, Dict[str, Any]]):
+        self._memory[key] = item
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+    
+    def hit_rate(self) -> float:
+        """Fraction of cache lookups that were hits."""
+        lookups = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / lookups if lookups else 0.0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters plus hit rate and the number of entries in memory."""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['entries'] = len(self._memory)
+        stats['hit_rate'] = self.hit_rate()
+        return stats
+    
+    def clear(self):
+        """Drop all entries from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM responses")
+                self._conn.commit()
+
+
+_shared_cache: Optional[ResponseCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_response_cache(db_path: Optional[str] = None) -> ResponseCache:
+    """
+    Get the process-wide response cache instance (created on first use).
+    
+    Args:
+        db_path: Optional SQLite file, only used when the cache is first created
+    
+    Returns:
+        Shared ResponseCache
+    """
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = ResponseCache(db_path=db_path)
+        return _shared_cache
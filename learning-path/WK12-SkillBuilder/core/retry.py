@@ -0,0 +1,57 @@
+"""
+Retry Module
+Backoff delays shared by the OpenAI callers (embeddings and content generation):
+rate limits (429), 5xx responses, timeouts and connection errors are retried with
+jittered exponential backoff, honouring the server's Retry-After header.
+"""
+
+import asyncio
+import random
+from typing import Optional
+
+# Try to import OpenAI's connection error (APITimeoutError is a subclass)
+try:
+    from openai import APIConnectionError
+    OPENAI_AVAILABLE = True
+except ImportError:
+    OPENAI_AVAILABLE = False
+
+
+def is_retryable(error: Exception) -> bool:
+    """Whether error is a rate limit, server error, timeout or connection error."""
+    status = getattr(error, 'status_code', None)
+    return (
+        isinstance(error, (asyncio.TimeoutError, TimeoutError, ConnectionError))
+        or (OPENAI_AVAILABLE and isinstance(error, APIConnectionError))
+        or status == 429
+        or (status is not None and status >= 500)
+    )
+
+
+def retry_delay(error: Exception, attempt: int, backoff_s: float = 1.0,
+                max_backoff_s: float = 30.0) -> Optional[float]:
+    """
+    Seconds to wait before retrying after error.
+
+    Args:
+        error: Exception raised by the failed attempt
+        attempt: Number of the failed attempt, starting at 0
+        backoff_s: Delay before the first retry (doubled on each attempt)
+        max_backoff_s: Upper bound on any delay, including Retry-After
+
+    Returns:
+        Delay in seconds, or None if error is not retryable
+    """
+    if not is_retryable(error):
+        return None
+
+    # Honour the server's Retry-After when it sends one
+    response = getattr(error, 'response', None)
+    retry_after = response.headers.get('retry-after') if response is not None else None
+    if retry_after is not None:
+        try:
+            return min(float(retry_after), max_backoff_s)
+        except ValueError:
+            pass
+    backoff = min(backoff_s * 2 ** attempt, max_backoff_s)
+    return backoff * random.uniform(0.5, 1.0)
@@ -0,0 +1,177 @@
+"""
+Text Chunker Module
+Single-pass text chunker that prefers paragraph, then line, then word boundaries.
+Sizes are measured in characters or in tokens (tiktoken or any tokenizer), and
+every chunk carries its character offsets in the source text for citations.
+"""
+
+from bisect import bisect_right
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from core.logger import get_logger
+
+logger = get_logger()
+
+# Try to import tiktoken for token-based chunk sizes
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+# Boundaries in order of preference: paragraph, line, word
+SEPARATORS = ("\n\n", "\n", " ")
+
+# A tokenizer maps text to the character offset where each token starts
+TokenOffsets = Callable[[str], Sequence[int]]
+
+
+def tiktoken_offsets(model: str = "text-embedding-3-small") -> TokenOffsets:
+    """
+    Build a tokenizer for TextChunker from tiktoken's encoding for a model.
+    
+    Args:
+        model: OpenAI model name (unknown models use cl100k_base)
+    
+    Returns:
+        Function returning the start offset of every token in a text
+    
+    Raises:
+        ImportError: If tiktoken is not installed
+    """
+    if not TIKTOKEN_AVAILABLE:
+        raise ImportError("tiktoken not installed. Install with: pip install tiktoken")
+    try:
+        encoding = tiktoken.encoding_for_model(model)
+    except KeyError:
+        encoding = tiktoken.get_encoding("cl100k_base")
+    
+    def offsets(text: str) -> List[int]:
+        _, starts = encoding.decode_with_offsets(encoding.encode(text, disallowed_special=()))
+        return starts
+    
+    return offsets
+
+
+class TextChunker:
+    """
+    Splits text into overlapping chunks in one left-to-right pass.
+    
+    Each chunk ends at the last paragraph break in its window, else the last
+    line break, else the last space, else at the size limit. Boundaries are only
+    taken in the second half of the window so chunks stay close to chunk_size.
+    """
+    
+    def __init__(self, chunk_size: int = 1000, overlap: int = 200,
+                 tokenizer: Optional[TokenOffsets] = None,
+                 separators: Sequence[str] = SEPARATORS):
+        """
+        Initialize the chunker.
+        
+        Args:
+            chunk_size: Maximum chunk size, in characters or tokens
+            overlap: Overlap between consecutive chunks, in the same unit
+            tokenizer: Function returning token start offsets; sizes are in
+                characters when omitted (see tiktoken_offsets())
+            separators: Boundaries to split on, most preferred first
+        
+        Raises:
+            ValueError: If chunk_size is not positive or overlap is not smaller than chunk_size
+        """
+        if chunk_size <= 0:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+        if not 0 <= overlap < chunk_size:
+            raise ValueError(f"overlap must be between 0 and chunk_size - 1, got {overlap} (chunk_size {chunk_size})")
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+        self.tokenizer = tokenizer
+        self.separators = tuple(separators)
+    
+    @classmethod
+    def for_model(cls, model: str = "text-embedding-3-small", chunk_size: int = 512,
+                  overlap: int = 64) -> 'TextChunker':
+        """Chunker sized in tokens of an OpenAI model (characters if tiktoken is missing)."""
+        if not TIKTOKEN_AVAILABLE:
+            logger.warning("tiktoken not installed, chunk sizes will be measured in characters")
+            return cls(chunk_size, overlap)
+        return cls(chunk_size, overlap, tokenizer=tiktoken_offsets(model))
+    
+    def iter_chunks(self, text: str, base_offset: int = 0) -> Iterator[Dict[str, Any]]:
+        """
+        Yield chunks of text with their character offsets.
+        
+        Args:
+            text: Input text
+            base_offset: Offset of text within its source, added to start/end
+        
+        Yields:
+            Dictionaries with 'text', 'start', 'end' (text == source[start:end]) and
+            'size' (characters or tokens)
+        """
+        n = len(text)
+        if self.tokenizer is not None:
+            starts = self.tokenizer(text)
+            unit_count = len(starts)
+            
+            def unit_at(char: int) -> int:
+                return max(bisect_right(starts, char) - 1, 0)
+            
+            def char_at(unit: int) -> int:
+                return starts[unit] if unit < unit_count else n
+        else:
+            def unit_at(char: int) -> int:
+                return char
+            
+            def char_at(unit: int) -> int:
+                return min(unit, n)
+        
+        pos = self._skip_space(text, 0)
+        while pos < n:
+            unit = unit_at(pos)
+            limit = char_at(unit + self.chunk_size)
+            if limit >= n:
+                end = n
+            else:
+                floor = char_at(unit + max(self.overlap, self.chunk_size // 2) + 1)
+                end = self._find_break(text, floor, limit)
+            
+            # Trim trailing whitespace; the leading side was skipped already
+            stop = end
+            while stop > pos and text[stop - 1].isspace():
+                stop -= 1
+            yield {
+                'text': text[pos:stop],
+                'start': base_offset + pos,
+                'end': base_offset + stop,
+                'size': unit_at(stop - 1) - unit + 1 if self.tokenizer is not None else stop - pos
+            }
+            if end >= n:
+                break
+            
+            # Step back by the overlap, starting the next chunk on a word if possible
+            next_pos = end
+            if self.overlap:
+                next_pos = max(char_at(unit_at(end) - self.overlap), pos + 1)
+                space = text.find(" ", next_pos, end)
+                if space != -1:
+                    next_pos = space + 1
+            pos = self._skip_space(text, max(next_pos, pos + 1))
+    
+    def split(self, text: str) -> List[str]:
+        """Chunk texts only (see iter_chunks())."""
+        return [chunk['text'] for chunk in self.iter_chunks(text)]
+    
+    def _find_break(self, text: str, floor: int, limit: int) -> int:
+        """End of the chunk: just after the most preferred separator in [floor, limit)."""
+        for separator in self.separators:
+            i = text.rfind(separator, floor, limit)
+            if i != -1:
+                return i + len(separator)
+        return limit
+    
+    @staticmethod
+    def _skip_space(text: str, pos: int) -> int:
+        n = len(text)
+        while pos < n and text[pos].isspace():
+            pos += 1
+        return pos
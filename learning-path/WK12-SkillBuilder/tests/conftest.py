@@ -0,0 +1,11 @@
+"""
+Shared setup for the SkillBuilder tests.
+The core package is imported from the project root, as app.py does; tests
+that need the OpenAI or LangChain packages skip themselves when they are missing.
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Tests for ContentGenerator's concurrent batch generation against a local
+OpenAI-compatible stub server.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from core.content_generator import ContentGenerator
+from core.response_cache import ResponseCache
+
+
+class StubChatHandler(BaseHTTPRequestHandler):
+    """
+    Minimal /v1/chat/completions endpoint. The prompt picks the behaviour:
+    'slow' answers after a second, 'fail500' and 'bad400' return those statuses,
+    anything else is echoed back after a short delay.
+    """
+
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+    attempts = {}
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        prompt = body["messages"][-1]["content"]
+        cls = StubChatHandler
+        with cls.lock:
+            cls.attempts[prompt] = cls.attempts.get(prompt, 0) + 1
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        try:
+            time.sleep(1.0 if prompt == "slow" else 0.05)
+            if prompt in ("fail500", "bad400"):
+                self.reply(int(prompt[-3:]), {"error": {"message": prompt, "type": "stub"}})
+            else:
+                self.reply(200, {
+                    "id": "stub", "object": "chat.completion", "created": 0, "model": body["model"],
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": f"Echo: {prompt}"}}],
+                })
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client gave up on a timed-out request
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+    def reply(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_url():
+    StubChatHandler.in_flight = StubChatHandler.max_in_flight = 0
+    StubChatHandler.attempts = {}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubChatHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/v1"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def generator(stub_url, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    generator = ContentGenerator(temperature=0.0, response_cache=ResponseCache(), base_url=stub_url)
+    generator.BACKOFF_S = 0.01
+    return generator
+
+
+def test_abatch_generate_keeps_order_and_caps_concurrency(generator):
+    prompts = [f"prompt {i}" for i in range(8)]
+    results = asyncio.run(generator.abatch_generate(prompts, max_concurrency=2))
+
+    assert [r['content'] for r in results] == [f"Echo: {prompt}" for prompt in prompts]
+    assert all(r['success'] for r in results)
+    assert StubChatHandler.max_in_flight == 2
+
+
+def test_abatch_generate_isolates_timeouts_and_errors(generator):
+    prompts = ["first", "slow", "fail500", "bad400", "last"]
+    results = asyncio.run(generator.abatch_generate(prompts, timeout=0.5, max_retries=1))
+
+    assert [r['success'] for r in results] == [True, False, False, False, True]
+    assert [results[0]['content'], results[-1]['content']] == ["Echo: first", "Echo: last"]
+    assert "TimeoutError" in results[1]['error']
+    # One retry each for the timeout and the 500 (no client-side retries on top), none for the 400
+    assert StubChatHandler.attempts["slow"] == 2
+    assert StubChatHandler.attempts["fail500"] == 2
+    assert StubChatHandler.attempts["bad400"] == 1
+
+
+def test_batch_generate_runs_again_on_a_new_event_loop(generator):
+    """Each blocking call starts a new event loop; the async client must not outlive its loop."""
+    first = generator.batch_generate(["alpha", "beta"])
+    second = generator.batch_generate(["gamma", "delta"])
+
+    assert [r['content'] for r in first + second] == ["Echo: alpha", "Echo: beta", "Echo: gamma", "Echo: delta"]
+    assert all(not r['cached'] for r in first + second)
+
+
+def test_responses_are_cached_per_endpoint(generator, stub_url):
+    generator.batch_generate(["alpha"])
+    again = generator.batch_generate(["alpha"])
+    assert again[0]['cached'] is True and StubChatHandler.attempts["alpha"] == 1
+
+    args = (generator.model_name, 0.0, 1000, None, "alpha")
+    assert generator.response_cache.get(ResponseCache.make_key(*args, base_url=stub_url)) is not None
+    assert generator.response_cache.get(ResponseCache.make_key(*args)) is None
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Tests for DataProcessor's DataFrame preprocessing and streaming text loaders.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.data_processor import DataProcessor
+
+
+def preprocess_with_iterrows(df, text_columns=None, remove_na=True):
+    """The original row-by-row implementation, kept as the reference output."""
+    if remove_na:
+        df = df.dropna()
+    if text_columns is None:
+        text_columns = df.select_dtypes(include=['object']).columns.tolist()
+    records = []
+    for idx, row in df.iterrows():
+        parts = [str(row[col]) for col in text_columns if col in row and pd.notna(row[col])]
+        records.append({
+            'id': idx,
+            'text_content': " ".join(parts),
+            'metadata': {col: str(row[col]) for col in df.columns if col not in text_columns}
+        })
+    return records
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        'concept_name': ["Prompting", None, "RAG", "Agents"],
+        'description': ["Write prompts", "Embeddings", np.nan, "Tool use"],
+        'week': pd.array(["W01", "W02", None, "W04"], dtype=object),
+        'hours': [1, 2, 3, 4],
+        'score': [0.5, np.nan, 1.5, 2.0],
+        'due': pd.to_datetime(["2024-01-01", None, "2024-01-03 12:30", "2024-01-04"], format="ISO8601"),
+    }, index=[10, 11, 12, 13])
+
+
+@pytest.mark.parametrize("remove_na", [True, False])
+@pytest.mark.parametrize("text_columns", [None, ['concept_name', 'description']])
+def test_vectorized_preprocessing_matches_iterrows(frame, text_columns, remove_na):
+    processor = DataProcessor(use_embedding_cache=False)
+    expected = preprocess_with_iterrows(frame, text_columns, remove_na)
+
+    assert processor.preprocess_dataframe(frame, text_columns, remove_na) == expected
+    batched = [r for batch in processor.iter_preprocessed_records(frame, text_columns, remove_na, batch_size=3)
+               for r in batch]
+    assert batched == expected
+
+
+def test_metadata_values_are_strings(frame):
+    records = DataProcessor(use_embedding_cache=False).preprocess_dataframe(frame, ['concept_name'], remove_na=False)
+    assert all(isinstance(v, str) for r in records for v in r['metadata'].values())
+    assert records[1]['metadata']['score'] == 'nan'
+
+
+def test_undecodable_bytes_past_the_sample_are_replaced_and_logged(tmp_path, monkeypatch):
+    path = tmp_path / "notes.txt"
+    path.write_bytes(b"a" * DataProcessor.ENCODING_SAMPLE_BYTES + b" \xff\xfe tail")
+    processor = DataProcessor(use_embedding_cache=False)
+    warnings = []
+    monkeypatch.setattr(processor.logger, "warning", warnings.append)
+
+    assert "".join(processor.iter_text_file(str(path))).endswith("�� tail")
+    assert processor.load_text_file(str(path)).endswith("�� tail")
+    assert len(warnings) == 2 and "2 replacement characters" in warnings[0]
+
+
+@pytest.fixture
+def malformed_csv(tmp_path):
+    lines = ["concept,description,week"] + [f"C{i},Description {i},{i % 12}" for i in range(120)]
+    lines.insert(70, "bad,row,with,extra")
+    lines.insert(100, "bad,row,with,two,extra")
+    path = tmp_path / "notes.csv"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def test_malformed_csv_lines_are_skipped_and_counted(malformed_csv, monkeypatch):
+    processor = DataProcessor(use_embedding_cache=False)
+    warnings = []
+    monkeypatch.setattr(processor.logger, "warning", warnings.append)
+
+    chunks = list(processor.iter_csv(str(malformed_csv), chunksize=25))
+    streamed = pd.concat(chunks)
+    assert streamed['concept'].tolist() == [f"C{i}" for i in range(120)]
+    assert streamed.index.tolist() == list(range(120))
+    assert any("Skipped 2 malformed lines" in w for w in warnings)
+
+    warnings.clear()
+    assert processor.load_csv(str(malformed_csv)).equals(streamed)
+    assert any("Skipped 2 malformed lines" in w for w in warnings)
+
+
+def test_well_formed_csv_logs_no_skipped_lines(tmp_path, monkeypatch):
+    path = tmp_path / "notes.csv"
+    path.write_text("concept,description\nRAG,Retrieval\nAgents,Tools\n", encoding="utf-8")
+    processor = DataProcessor(use_embedding_cache=False)
+    warnings = []
+    monkeypatch.setattr(processor.logger, "warning", warnings.append)
+
+    assert len(processor.load_csv(str(path))) == 2
+    assert len(pd.concat(processor.iter_csv(str(path)))) == 2
+    assert warnings == []
+
+
+def test_csv_to_text_file_matches_joined_columns(malformed_csv, tmp_path, monkeypatch):
+    monkeypatch.setattr(DataProcessor, "CSV_CHUNK_ROWS", 25)
+    processor = DataProcessor(use_embedding_cache=False)
+    df = processor.load_csv(str(malformed_csv))
+    text_path = tmp_path / "notes.txt"
+
+    columns = processor.csv_to_text_file(str(malformed_csv), str(text_path), ['concept', 'description'])
+
+    assert columns == ['concept', 'description']
+    expected = "\n\n".join(f"{col}: {df[col].astype(str).str.cat(sep=' ')}" for col in columns)
+    assert text_path.read_text(encoding="utf-8") == expected
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite embedding cache behind DataProcessor.create_embeddings().
+"""
+
+import numpy as np
+
+from core.data_processor import DataProcessor
+from core.embedding_cache import EmbeddingCache
+
+
+def make_processor(cache: EmbeddingCache, calls: list) -> DataProcessor:
+    processor = DataProcessor(embedding_cache=cache)
+    processor.embeddings_model = object()  # stands in for the OpenAI client
+
+    def embed(texts, model):
+        calls.extend(texts)
+        rng = np.random.default_rng(len(calls))
+        return [rng.standard_normal(8).tolist() for _ in texts]
+
+    processor._embed_batched = embed
+    return processor
+
+
+def test_cached_texts_are_not_embedded_again(tmp_path):
+    calls = []
+    processor = make_processor(EmbeddingCache(tmp_path / "cache.sqlite"), calls)
+
+    first = processor.create_embeddings(["a", "b", "a"])
+    second = processor.create_embeddings(["b", "c"])
+
+    assert calls == ["a", "b", "c"]
+    assert first[0] == first[2] and second[0] == first[1]
+
+
+def test_cold_and_warm_calls_return_identical_vectors(tmp_path):
+    """Fresh vectors are rounded like cached ones, so results don't depend on cache state."""
+    cache = EmbeddingCache(tmp_path / "cache.sqlite")
+    cold = make_processor(cache, []).create_embeddings(["python", "sql"])
+    warm = make_processor(cache, []).create_embeddings(["python", "sql"])
+
+    assert cold == warm
+    assert all(np.float16(value) == value for value in cold[0])
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Tests for ResponseCache expiry in the memory and SQLite tiers.
+"""
+
+import sqlite3
+import time
+
+from core.response_cache import ResponseCache
+
+
+def count_rows(db_path) -> int:
+    with sqlite3.connect(str(db_path)) as conn:
+        return conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+def test_expired_entries_are_deleted_from_sqlite_on_lookup(tmp_path, monkeypatch):
+    db_path = tmp_path / "responses.db"
+    cache = ResponseCache(ttl_seconds=60, db_path=str(db_path))
+    key = ResponseCache.make_key("gpt-4o-mini", 0.0, 100, None, "What is RAG?")
+    cache.put(key, {'content': "Retrieval-augmented generation", 'latency_s': 1.0})
+    assert cache.get(key)['cached'] is True
+
+    now = time.time()
+    monkeypatch.setattr("core.response_cache.time.time", lambda: now + 120)
+    assert cache.get(key) is None
+    assert count_rows(db_path) == 0
+
+
+def test_expired_rows_are_purged_when_the_cache_is_opened(tmp_path, monkeypatch):
+    db_path = tmp_path / "responses.db"
+    cache = ResponseCache(ttl_seconds=60, db_path=str(db_path))
+    cache.put("old", {'content': "stale"})
+    cache.put("new", {'content': "fresh"})
+    with sqlite3.connect(str(db_path)) as conn:
+        conn.execute("UPDATE responses SET created = created - 3600 WHERE key = 'old'")
+
+    reopened = ResponseCache(ttl_seconds=60, db_path=str(db_path))
+    assert count_rows(db_path) == 1
+    assert reopened.get("new")['content'] == "fresh"
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests for TextChunker and DataProcessor.iter_text_chunks() offsets.
+"""
+
+import re
+
+import pytest
+
+from core.data_processor import DataProcessor
+from core.text_chunker import TextChunker
+
+
+def make_notes(paragraphs: int = 40) -> str:
+    return "\n\n".join(
+        f"Paragraph {i}. " + " ".join(f"word{i}_{j}" for j in range(5 + i % 7)) + "\nsecond line here."
+        for i in range(paragraphs)
+    )
+
+
+def word_offsets(text: str):
+    """Toy tokenizer: every run of non-space characters is one token."""
+    return [m.start() for m in re.finditer(r"\S+", text)]
+
+
+@pytest.mark.parametrize("chunk_size,overlap", [(80, 0), (120, 30), (200, 99)])
+def test_offsets_match_the_source_text(chunk_size, overlap):
+    text = make_notes()
+    chunks = list(TextChunker(chunk_size, overlap).iter_chunks(text))
+
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert text[chunk['start']:chunk['end']] == chunk['text']
+        assert 0 < chunk['size'] <= chunk_size
+    assert [c['start'] for c in chunks] == sorted(c['start'] for c in chunks)
+    # Every non-space character is covered by some chunk
+    covered = set()
+    for chunk in chunks:
+        covered.update(range(chunk['start'], chunk['end']))
+    assert all(i in covered for i, ch in enumerate(text) if not ch.isspace())
+
+
+def test_base_offset_shifts_offsets():
+    text = make_notes(5)
+    plain = list(TextChunker(60, 10).iter_chunks(text))
+    shifted = list(TextChunker(60, 10).iter_chunks(text, base_offset=1000))
+    assert [(c['start'] + 1000, c['end'] + 1000) for c in plain] == [(c['start'], c['end']) for c in shifted]
+
+
+def test_token_mode_measures_sizes_in_tokens():
+    text = make_notes()
+    chunks = list(TextChunker(12, 3, tokenizer=word_offsets).iter_chunks(text))
+
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert text[chunk['start']:chunk['end']] == chunk['text']
+        assert chunk['size'] == len(chunk['text'].split()) <= 12
+
+
+@pytest.mark.parametrize("chunk_size,overlap", [(100, 100), (100, 150), (0, 0), (10, -1)])
+def test_invalid_sizes_raise(chunk_size, overlap):
+    with pytest.raises(ValueError):
+        TextChunker(chunk_size, overlap)
+
+
+def test_iter_text_chunks_offsets_span_read_blocks(tmp_path, monkeypatch):
+    """Offsets stay file-relative when the file is read and cut in many small blocks."""
+    text = make_notes(60) + "\n" + "unbroken " * 200
+    path = tmp_path / "notes.md"
+    path.write_text(text, encoding="utf-8")
+    monkeypatch.setattr(DataProcessor, "READ_BLOCK_CHARS", 97)
+
+    processor = DataProcessor(use_embedding_cache=False)
+    chunks = list(processor.iter_text_chunks(str(path), chunk_size=150, overlap=20, with_offsets=True))
+
+    assert len(chunks) > len(text) // 150
+    for chunk in chunks:
+        assert text[chunk['start']:chunk['end']] == chunk['text']
+    assert [c['text'] for c in chunks] == list(processor.iter_text_chunks(str(path), 150, 20))